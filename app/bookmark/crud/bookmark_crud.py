@@ -24,6 +24,14 @@ def get_bookmark(db: Session, user_id: int, restaurant_id: int):
 def create_bookmark(db: Session, user_id: int, restaurant_id: int):
     db_bookmark = models.Bookmark(user_id=user_id, restaurant_id=restaurant_id)
     db.add(db_bookmark)
+    # 인기 점수용 활동 기록 (같은 트랜잭션, 같은 now()라 찜한 시각과 같은 값)
+    db.add(
+        models.TrendingEvent(
+            restaurant_id=restaurant_id,
+            kind=models.TrendingEvent.BOOKMARK,
+            occurred_at=func.now(),
+        )
+    )
     db.commit()
     db.refresh(db_bookmark)
     return db_bookmark
@@ -32,6 +40,15 @@ def create_bookmark(db: Session, user_id: int, restaurant_id: int):
 # 북마크 취소 (DB에서 Delete) - 나중에 쓰일 것을 대비해 미리 만들어둡니다.
 def delete_bookmark(db: Session, db_bookmark: models.Bookmark):
     db.delete(db_bookmark)
+    # 찜할 때 더한 인기 점수를 그대로 빼도록 원래 찜한 시각으로 기록
+    db.add(
+        models.TrendingEvent(
+            restaurant_id=db_bookmark.restaurant_id,
+            kind=models.TrendingEvent.BOOKMARK,
+            sign=-1,
+            occurred_at=db_bookmark.created_at or func.now(),
+        )
+    )
     db.commit()
 
 
@@ -43,3 +60,18 @@ def get_bookmarks_by_user(db: Session, user_id: int, skip: int = 0, limit: int =
         .limit(limit)
         .all()
     )
+
+
+def get_bookmarked_restaurant_ids(
+    db: Session, user_id: int, restaurant_ids: list[int] = None
+) -> set[int]:
+    """
+    유저가 찜한 식당 ID를 Set으로 반환합니다.
+    restaurant_ids를 주면 그중 찜한 것만, 안 주면 전체를 조회합니다.
+    """
+    query = db.query(models.Bookmark.restaurant_id).filter(
+        models.Bookmark.user_id == user_id
+    )
+    if restaurant_ids is not None:
+        query = query.filter(models.Bookmark.restaurant_id.in_(restaurant_ids))
+    return {restaurant_id for (restaurant_id,) in query.all()}
@@ -41,6 +41,23 @@ def read_my_bookmarks(
     return bookmarks
 
 
+@router.get("/status", response_model=schemas.BookmarkStatusResponse)
+def read_bookmark_statuses(
+    restaurant_ids: List[int] = Query(
+        ..., max_length=100, description="찜 여부를 확인할 식당 ID (최대 100개)"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(security.get_current_user),
+):
+    """
+    여러 식당의 찜 여부를 한 번에 조회합니다. (?restaurant_ids=1&restaurant_ids=2)
+    """
+    statuses = service.get_bookmark_statuses(
+        db=db, user_id=current_user.id, restaurant_ids=restaurant_ids
+    )
+    return {"statuses": statuses}
+
+
 @router.delete("/{restaurant_id}")
 def delete_my_bookmark(
     restaurant_id: int,
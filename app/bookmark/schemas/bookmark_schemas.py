@@ -27,3 +27,9 @@ class Bookmark(BookmarkBase):
     class Config:
         from_attributes = True
         orm_mode = True
+
+
+# 여러 식당의 찜 여부를 한 번에 내려줄 때 쓰는 스키마
+class BookmarkStatusResponse(BaseModel):
+    # {식당 ID: 찜 여부}
+    statuses: dict[int, bool]
@@ -1,9 +1,111 @@
+import hashlib
+import threading
+
 import httpx
 from fastapi import HTTPException, status
 from app.config.config import settings  # .env에서 키 가져오기
 from sqlalchemy.orm import Session
 from app.bookmark.schemas import bookmark_schemas as schemas
 from app.bookmark.crud import bookmark_crud as crud
+from app.core.cache import TTLCache
+from app.core import metrics
+
+# 유저별 찜한 식당 ID 캐시: user_id -> frozenset(restaurant_id)
+# 목록 응답(/nearby, /latest 등)은 유저와 무관한 부분을 공유하고, 찜 여부만 여기서 덧씌웁니다.
+bookmark_set_cache = TTLCache(
+    maxsize=settings.BOOKMARK_CACHE_MAXSIZE, ttl=settings.BOOKMARK_CACHE_TTL_SECONDS
+)
+metrics.register("bookmark_set_cache", bookmark_set_cache.stats)
+# 찜 추가/취소가 동시에 들어와도 캐시 갱신(읽고-수정-저장)이 서로 덮어쓰지 않도록
+_bookmark_cache_lock = threading.Lock()
+# 캐시를 채우려고 DB를 조회 중인 유저: user_id -> [진행 중인 조회 수, 그 사이 찜 변경 여부]
+# 조회와 저장 사이에 찜이 바뀌면, 바뀌기 전 목록으로 캐시를 덮어쓰지 않도록 저장을 건너뜁니다.
+_loading_bookmark_sets: dict[int, list] = {}
+
+
+def _get_bookmark_set(db: Session, user_id: int) -> frozenset[int]:
+    """유저가 찜한 식당 ID 전체 (캐시에 없으면 쿼리 1번으로 채웁니다)"""
+    cached = bookmark_set_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    # DB 조회는 잠금 밖에서 하고, 조회 중인 유저만 표시해 둡니다.
+    with _bookmark_cache_lock:
+        loading = _loading_bookmark_sets.setdefault(user_id, [0, False])
+        loading[0] += 1
+    try:
+        bookmark_set = frozenset(crud.get_bookmarked_restaurant_ids(db, user_id))
+    except Exception:
+        with _bookmark_cache_lock:
+            _finish_loading(user_id, loading)
+        raise
+
+    with _bookmark_cache_lock:
+        _finish_loading(user_id, loading)
+        if not loading[1]:
+            bookmark_set_cache.set(user_id, bookmark_set)
+    return bookmark_set
+
+
+def _finish_loading(user_id: int, loading: list):
+    """(_bookmark_cache_lock 안에서 호출) 조회 1건이 끝났음을 기록합니다."""
+    loading[0] -= 1
+    if loading[0] == 0:
+        _loading_bookmark_sets.pop(user_id, None)
+
+
+def _update_bookmark_set(user_id: int, restaurant_id: int, bookmarked: bool):
+    """찜 추가/취소를 캐시에 바로 반영합니다. (캐시에 없는 유저는 다음 조회 때 채움)"""
+    with _bookmark_cache_lock:
+        # 지금 DB를 조회 중인 요청이 있으면, 그 결과는 이 변경 전일 수 있으므로 저장하지 않게 표시
+        loading = _loading_bookmark_sets.get(user_id)
+        if loading is not None:
+            loading[1] = True
+        cached = bookmark_set_cache.get(user_id)
+        if cached is None:
+            return
+        if bookmarked:
+            bookmark_set_cache.set(user_id, cached | {restaurant_id})
+        else:
+            bookmark_set_cache.set(user_id, cached - {restaurant_id})
+
+
+def get_bookmarked_ids(db: Session, user_id: int, restaurant_ids) -> set[int]:
+    """
+    주어진 식당 ID 중 유저가 찜한 것만 Set으로 반환합니다.
+    캐시가 채워져 있으면 DB 조회 없이 메모리에서 계산합니다.
+    """
+    restaurant_ids = list(restaurant_ids)
+    if not user_id or not restaurant_ids:
+        return set()
+    if not settings.BOOKMARK_CACHE_ENABLED:
+        return crud.get_bookmarked_restaurant_ids(db, user_id, restaurant_ids)
+    return _get_bookmark_set(db, user_id).intersection(restaurant_ids)
+
+
+def get_bookmark_fingerprint(db: Session, user_id: int) -> str:
+    """
+    유저의 찜 목록이 바뀌면 달라지는 짧은 값 (응답 ETag용)
+    목록의 찜 여부를 채우는 것과 같은 캐시된 집합으로 만들므로, 캐시가 채워져 있으면 DB를 조회하지 않고
+    ETag와 응답 본문이 항상 같은 찜 상태를 가리킵니다.
+    """
+    if settings.BOOKMARK_CACHE_ENABLED:
+        bookmark_set = _get_bookmark_set(db, user_id)
+    else:
+        bookmark_set = crud.get_bookmarked_restaurant_ids(db, user_id)
+    joined = ",".join(map(str, sorted(bookmark_set)))
+    return hashlib.sha1(joined.encode()).hexdigest()[:16]
+
+
+def get_bookmark_statuses(
+    db: Session, user_id: int, restaurant_ids: list[int]
+) -> dict[int, bool]:
+    """여러 식당의 찜 여부를 한 번에 조회합니다. ({식당 ID: 찜 여부})"""
+    bookmarked_ids = get_bookmarked_ids(db, user_id, restaurant_ids)
+    return {
+        restaurant_id: restaurant_id in bookmarked_ids
+        for restaurant_id in restaurant_ids
+    }
 
 
 def create_bookmark(db: Session, restaurant_id: int, user_id: int):
@@ -19,7 +121,11 @@ def create_bookmark(db: Session, restaurant_id: int, user_id: int):
         )
 
     # 2. 유효한 요청이면 DB에 저장
-    return crud.create_bookmark(db=db, user_id=user_id, restaurant_id=restaurant_id)
+    bookmark = crud.create_bookmark(db=db, user_id=user_id, restaurant_id=restaurant_id)
+
+    # 3. 찜 여부 캐시에도 바로 반영
+    _update_bookmark_set(user_id, restaurant_id, bookmarked=True)
+    return bookmark
 
 
 def get_my_bookmarks(db: Session, user_id: int, skip: int = 0, limit: int = 100):
@@ -42,3 +148,6 @@ def delete_bookmark(db: Session, user_id: int, restaurant_id: int):
 
     # 3. 존재한다면 CRUD를 호출해서 안전하게 삭제
     crud.delete_bookmark(db=db, db_bookmark=existing_bookmark)
+
+    # 4. 찜 여부 캐시에도 바로 반영
+    _update_bookmark_set(user_id, restaurant_id, bookmarked=False)
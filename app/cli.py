@@ -0,0 +1,70 @@
+"""
+운영용 관리 명령어
+
+사용 예시:
+    python -m app.cli reconcile-ratings
+    python -m app.cli rebuild-category-counts
+    python -m app.cli refresh-trending [--full]
+"""
+
+import argparse
+
+from app.core.database import SessionLocal
+from app.logging import logger
+from app.restaurants.crud import restaurants_crud
+from app.restaurants.service import restaurants_service
+
+
+def reconcile_ratings(args):
+    """리뷰 테이블 기준으로 식당 평점 집계 컬럼을 다시 계산합니다. (backfill / drift 보정)"""
+    db = SessionLocal()
+    try:
+        updated = restaurants_crud.reconcile_restaurant_rating_stats(db)
+    finally:
+        db.close()
+    logger.info(f"식당 평점 집계 보정 완료: {updated}개 식당 갱신")
+    print(f"updated restaurants: {updated}")
+
+
+def rebuild_category_counts(args):
+    """식당 테이블 기준으로 카테고리별 식당 수를 다시 계산합니다."""
+    db = SessionLocal()
+    try:
+        categories = restaurants_crud.rebuild_category_counts(db)
+    finally:
+        db.close()
+    logger.info(f"카테고리별 식당 수 재계산 완료: {categories}개 카테고리")
+    print(f"categories: {categories}")
+
+
+def refresh_trending(args):
+    """새 북마크/리뷰를 인기 점수에 반영합니다. (--full: 점수를 비우고 전체 다시 계산)"""
+    updated = restaurants_service.refresh_trending_scores(full=args.full)
+    logger.info(f"인기 점수 갱신 완료: {updated}개 식당 갱신")
+    print(f"updated restaurants: {updated}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dubai-server 관리 명령어")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser(
+        "reconcile-ratings", help="식당 평점/리뷰수 집계 컬럼 보정"
+    ).set_defaults(func=reconcile_ratings)
+    subparsers.add_parser(
+        "rebuild-category-counts", help="카테고리별 식당 수 재계산"
+    ).set_defaults(func=rebuild_category_counts)
+    trending_parser = subparsers.add_parser(
+        "refresh-trending", help="인기 식당 점수 갱신"
+    )
+    trending_parser.add_argument(
+        "--full", action="store_true", help="점수를 비우고 전체 활동으로 다시 계산"
+    )
+    trending_parser.set_defaults(func=refresh_trending)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
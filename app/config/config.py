@@ -12,7 +12,8 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     ENVIRONMENT: str = os.environ.get("ENV", "DEV")
     SITE_DOMAIN: str = "baebulook.site"
-    KAKAO_SEARCH_URL: str = "https://dapi.kakao.com/v2/local/search/keyword"
+    # 부하 테스트 시 benchmarks/fake_upstreams.py 주소로 바꿔서 실제 쿼터를 쓰지 않을 수 있습니다.
+    KAKAO_SEARCH_URL: str = "https://dapi.kakao.com/v2/local/search/keyword.json"
     KAKAO_REST_API_KEY: str = os.getenv("KAKAO_REST_API_KEY")
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 14
     DB_USER: str = os.getenv("DB_USER")
@@ -30,6 +31,113 @@ class Settings(BaseSettings):
     SUPABASE_BUCKET: str = os.getenv("SUPABASE_BUCKET", "reviews")
     NAVER_CLIENT_ID: str = os.getenv("NAVER_CLIENT_ID")
     NAVER_CLIENT_SECRET: str = os.getenv("NAVER_CLIENT_SECRET")
+    NAVER_IMAGE_SEARCH_URL: str = "https://openapi.naver.com/v1/search/image"
+
+    # 외부 API(카카오/네이버) 공유 HTTP 클라이언트 설정
+    HTTP2_ENABLED: bool = True
+    HTTP_CONNECT_TIMEOUT: float = 3.0  # 초
+    HTTP_READ_TIMEOUT: float = 5.0
+    HTTP_WRITE_TIMEOUT: float = 5.0
+    HTTP_POOL_TIMEOUT: float = 2.0  # 커넥션 풀에서 빈 연결을 기다리는 최대 시간
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 50
+    HTTP_MAX_KEEPALIVE_PER_HOST: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+
+    # /restaurants/search 결과 캐시 (TTL + LRU)
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_MAXSIZE: int = 1000
+    SEARCH_CACHE_TTL_SECONDS: float = 600.0
+    # 앱 시작 시 미리 캐시에 채워둘 인기 검색어 (환경변수는 JSON 배열: '["강남 맛집"]')
+    SEARCH_CACHE_PREWARM_QUERIES: list[str] = []
+    # 카카오 장애(서킷 OPEN) 시 만료된 캐시라도 내려줄 수 있는 최대 보관 시간
+    SEARCH_CACHE_STALE_TTL_SECONDS: float = 60 * 60 * 24
+
+    # 네이버 이미지 검색 결과 DB 캐시 유효기간
+    NAVER_IMAGE_CACHE_TTL_DAYS: int = 30  # 이미지를 찾은 경우
+    NAVER_IMAGE_CACHE_MISS_TTL_DAYS: int = 3  # "이미지 없음"인 경우
+
+    # 네이버 이미지 검색 fan-out 제한
+    NAVER_RATE_LIMIT_PER_SECOND: float = 10.0  # 전역 초당 호출 수 (0이면 제한 없음)
+    NAVER_RATE_LIMIT_BURST: int = 10
+    NAVER_FANOUT_CONCURRENCY: int = 5  # 검색 요청 1건당 동시 호출 수
+    NAVER_FANOUT_TIMEOUT_SECONDS: float = 2.0  # 호출 1건 제한 시간
+    NAVER_FANOUT_MAX_QUEUE_WAIT_SECONDS: float = 1.0  # 속도 제한 대기 허용치
+    NAVER_FANOUT_HEDGE_DELAY_SECONDS: float = 0.0  # 헤지 재시도 지연 (0이면 사용 안 함)
+
+    # 외부 API(카카오/네이버) 서킷 브레이커
+    CIRCUIT_FAILURE_RATE_THRESHOLD: float = 0.5  # 실패 비율이 이 이상이면 OPEN
+    CIRCUIT_MINIMUM_CALLS: int = 10  # 최소 이만큼 호출이 쌓여야 판단
+    CIRCUIT_WINDOW_SECONDS: float = 30.0  # 실패 비율 계산 구간
+    CIRCUIT_OPEN_SECONDS: float = 30.0  # OPEN 유지 시간 (이후 HALF_OPEN 시험 호출)
+    CIRCUIT_HALF_OPEN_MAX_CALLS: int = 2
+
+    # 카카오 검색 시 동시에 요청할 최대 페이지 수 (페이지당 15개)
+    KAKAO_SEARCH_MAX_PAGES: int = 5
+
+    # 로컬 DB 우선 검색: 로컬 결과가 이 개수(또는 display) 미만일 때만 카카오로 보충
+    LOCAL_SEARCH_ENABLED: bool = True
+    LOCAL_SEARCH_MIN_RESULTS: int = 3
+
+    # /restaurants/nearby 격자(타일) 캐시
+    # 프로세스마다 따로 있으므로 다른 워커에서 생긴 변경은 TTL이 지나야 반영됩니다.
+    NEARBY_CACHE_ENABLED: bool = True
+    NEARBY_CACHE_TILE_DEG: float = 0.005  # 타일 한 변 (위도 기준 약 550m)
+    NEARBY_CACHE_TTL_SECONDS: float = 120.0
+    NEARBY_CACHE_MAXSIZE: int = 2000
+    # 요청 반경은 이 값들 중 같거나 큰 값으로 올려서 캐시합니다. (최대값 초과 시 캐시 안 함)
+    NEARBY_CACHE_RADIUS_BUCKETS: list[int] = [500, 1000, 2000, 3000, 5000]
+    NEARBY_CACHE_MAX_CANDIDATES: int = 200  # 타일 하나에 저장할 최대 후보 식당 수
+    # 앱 시작 시 미리 채워둘 좌표 (환경변수는 JSON 배열: '[[37.4979, 127.0276]]')
+    NEARBY_CACHE_PREWARM_POINTS: list[tuple[float, float]] = []
+    NEARBY_CACHE_PREWARM_RADIUS: int = 1000
+
+    # /nearby 후보 선택용 메모리 공간 인덱스 (numpy 필요, 켜면 PostGIS 대신 사용)
+    NEARBY_INDEX_ENABLED: bool = False
+    NEARBY_INDEX_CELL_DEG: float = 0.01  # 격자 한 칸 (위도 기준 약 1.1km)
+    NEARBY_INDEX_REFRESH_SECONDS: float = 60.0  # 변경분 반영 주기
+    # 커밋이 늦게 보이는 행을 놓치지 않도록 이 시간만큼 겹쳐서 다시 읽습니다.
+    NEARBY_INDEX_REFRESH_OVERLAP_SECONDS: float = 120.0
+
+    # /restaurants/viewport 지도 화면 조회 (웹 메르카토르 타일 단위로 계산/캐시)
+    VIEWPORT_MAX_TILES: int = 64  # 한 번에 조회할 수 있는 최대 타일 수
+    VIEWPORT_PIN_THRESHOLD: int = 50  # 타일 내 식당이 이 이하면 핀, 넘으면 클러스터
+    VIEWPORT_CLUSTER_GRID: int = 8  # 클러스터링 시 타일을 N x N 칸으로 분할
+    VIEWPORT_CACHE_TTL_SECONDS: float = 300.0
+    VIEWPORT_CACHE_MAXSIZE: int = 5000
+
+    # /restaurants/tiles/{z}/{x}/{y}.mvt 벡터 타일
+    MVT_MIN_ZOOM: int = 10
+    MVT_MAX_ZOOM: int = 20
+    MVT_EXTENT: int = 4096
+    MVT_BUFFER: int = 64  # 타일 경계 근처 핀이 잘리지 않도록 포함할 여백
+    MVT_MAX_FEATURES: int = 2000  # 타일 하나에 담을 최대 식당 수 (평점 높은 순)
+    MVT_CACHE_TTL_SECONDS: float = 600.0
+    MVT_CACHE_MAXSIZE: int = 2000
+    # 비워두면 디스크 캐시를 쓰지 않습니다. (예: /var/cache/dubai/tiles)
+    MVT_DISK_CACHE_DIR: str = ""
+    MVT_DISK_CACHE_MAX_FILES: int = 50000
+
+    # 유저별 찜한 식당 ID 캐시 (목록 응답의 is_bookmarked 표시용)
+    # 찜 추가/취소 시 바로 갱신되지만, 다른 워커의 변경은 TTL이 지나야 반영됩니다.
+    BOOKMARK_CACHE_ENABLED: bool = True
+    BOOKMARK_CACHE_MAXSIZE: int = 10000  # 최대 유저 수
+    BOOKMARK_CACHE_TTL_SECONDS: float = 300.0
+
+    # /restaurants/trending 인기 점수 (북마크/리뷰에 시간 감쇠를 적용해 미리 계산)
+    TRENDING_REFRESH_ENABLED: bool = True  # 앱 안에서 주기적으로 갱신 (끄면 CLI로만)
+    TRENDING_REFRESH_SECONDS: float = 300.0
+    # 활동 하나의 점수가 반으로 줄어드는 시간 (바꾸면 refresh-trending --full 필요)
+    # 저장 값이 기준 시각부터 반감기마다 2배씩 커지므로 일 단위 이상으로 둡니다.
+    TRENDING_HALF_LIFE_HOURS: float = 24 * 7
+    TRENDING_BOOKMARK_WEIGHT: float = 1.0
+    TRENDING_REVIEW_WEIGHT: float = 2.0
+
+    # 조건부 GET(ETag / Last-Modified) 응답의 Cache-Control max-age (비로그인 응답만 공유 캐시 허용)
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 30
+
+    # 리뷰 이미지 업로드 (Supabase 클라이언트가 동기식이라 전용 스레드 풀에서 실행)
+    IMAGE_UPLOAD_CONCURRENCY: int = 3  # 요청 1건에서 동시에 올릴 최대 이미지 수
+    IMAGE_UPLOAD_THREADS: int = 8  # 워커 전체에서 공유하는 업로드 스레드 수
 
 
 settings = Settings()
@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    TTL(만료 시간) + LRU(가장 오래 안 쓴 항목부터 제거) 방식의 프로세스 내 캐시
+
+    - maxsize를 넘으면 가장 오래 사용되지 않은 항목을 제거합니다. (evictions)
+    - ttl이 지난 항목은 조회 시 miss로 처리합니다. (expirations)
+      단, 외부 API 장애 시 get_stale()로 꺼내 쓸 수 있도록 LRU로 밀려날 때까지 보관합니다.
+    - 동기 엔드포인트(스레드풀)에서도 쓰일 수 있으므로 Lock으로 보호합니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (만료 시각, 저장 시각, 값)
+        self._data: "OrderedDict[Hashable, tuple[float, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, _, value = entry
+            if expires_at <= time.monotonic():
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            # 최근 사용한 항목을 맨 뒤로 이동 (LRU)
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, key: Hashable, max_age: float) -> Optional[Any]:
+        """
+        만료 여부와 상관없이 저장된 지 max_age초 이내인 값을 반환합니다.
+        (외부 API 장애 시 오래된 결과라도 내려주기 위한 용도)
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            _, stored_at, value = entry
+            if stored_at + max_age <= time.monotonic():
+                return None
+            self.stale_hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        now = time.monotonic()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, now, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._data.keys())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """hit/miss/eviction 카운터와 현재 크기를 반환합니다. (/metrics 노출용)"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "stale_hits": self.stale_hits,
+        }
@@ -0,0 +1,151 @@
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from app.logging import logger
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 외부 API 호출을 바로 거절한 경우"""
+
+
+class CircuitBreaker:
+    """
+    외부 API(업스트림)별 서킷 브레이커
+
+    - CLOSED: 정상. 최근 window_seconds 동안의 호출 중 실패 비율이
+      failure_rate_threshold 이상이면(최소 minimum_calls건 이상일 때) OPEN으로 전환
+    - OPEN: open_seconds 동안 호출하지 않고 즉시 CircuitOpenError (워커를 붙잡지 않음)
+    - HALF_OPEN: 쿨다운 후 최대 half_open_max_calls건만 시험 호출.
+      모두 성공하면 CLOSED, 하나라도 실패하면 다시 OPEN
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float,
+        minimum_calls: int,
+        window_seconds: float,
+        open_seconds: float,
+        half_open_max_calls: int,
+        is_failure: Callable[[BaseException], bool] = lambda e: True,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure
+
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._outcomes: deque[tuple[float, bool]] = deque()  # (시각, 실패 여부)
+        self._half_open_inflight = 0
+        self._half_open_successes = 0
+
+        self.rejected = 0
+        self.transitions: dict[str, int] = {}
+
+    def is_open(self) -> bool:
+        """지금 호출하면 거절되는 상태인지 확인합니다. (상태는 바꾸지 않음)"""
+        if self.state == self.OPEN:
+            return time.monotonic() - self._opened_at < self.open_seconds
+        if self.state == self.HALF_OPEN:
+            return self._half_open_inflight >= self.half_open_max_calls
+        return False
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        self._before_call()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self._on_failure()
+            else:
+                # 장애가 아닌 예외(4xx, 우리 쪽 속도 제한 등)는 성공으로도 치지 않습니다.
+                # 성공으로 치면 실패율이 묽어지고, 업스트림에 닿지도 않은 시험 호출로
+                # HALF_OPEN이 닫힐 수 있기 때문입니다.
+                self._release_half_open()
+            raise
+        except BaseException:
+            # 요청 취소(CancelledError)도 성공/실패로 치지 않고 시험 호출 자리만 반납
+            self._release_half_open()
+            raise
+        self._on_success()
+        return result
+
+    def _before_call(self):
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} 서킷이 열려 있습니다.")
+            self._transition(self.HALF_OPEN)
+
+        if self.state == self.HALF_OPEN:
+            if self._half_open_inflight >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} 서킷 시험 호출 중입니다.")
+            self._half_open_inflight += 1
+
+    def _release_half_open(self):
+        if self.state == self.HALF_OPEN and self._half_open_inflight > 0:
+            self._half_open_inflight -= 1
+
+    def _on_success(self):
+        if self.state == self.HALF_OPEN:
+            self._release_half_open()
+            self._half_open_successes += 1
+            if self._half_open_successes >= self.half_open_max_calls:
+                self._transition(self.CLOSED)
+            return
+        self._record(failed=False)
+
+    def _on_failure(self):
+        if self.state == self.HALF_OPEN:
+            self._transition(self.OPEN)
+            return
+        self._record(failed=True)
+
+        calls = len(self._outcomes)
+        failures = sum(1 for _, failed in self._outcomes if failed)
+        if (
+            self.state == self.CLOSED
+            and calls >= self.minimum_calls
+            and failures / calls >= self.failure_rate_threshold
+        ):
+            self._transition(self.OPEN)
+
+    def _record(self, failed: bool):
+        now = time.monotonic()
+        self._outcomes.append((now, failed))
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+
+    def _transition(self, state: str):
+        logger.warning(f"서킷 브레이커 [{self.name}] {self.state} -> {state}")
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.state = state
+        self._half_open_inflight = 0
+        self._half_open_successes = 0
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+        if state == self.CLOSED:
+            self._outcomes.clear()
+
+    def stats(self) -> dict:
+        calls = len(self._outcomes)
+        failures = sum(1 for _, failed in self._outcomes if failed)
+        return {
+            "state": self.state,
+            "window_calls": calls,
+            "window_failures": failures,
+            "failure_rate": round(failures / calls, 4) if calls else 0.0,
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+        }
@@ -0,0 +1,135 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config.config import settings
+from app.logging import logger
+from app.models.models import DataVersion
+
+# 데이터 버전 이름 (바뀌면 해당 목록 응답의 ETag가 달라집니다)
+# - restaurants: 식당 등록, 리뷰 작성(평점/리뷰수/썸네일), 카테고리 집계
+# - trending: 인기 점수 갱신
+RESTAURANTS_VERSION = "restaurants"
+TRENDING_VERSION = "trending"
+
+
+def bump_data_version(db: Session, name: str):
+    """
+    데이터 버전을 1 올리고 바로 커밋합니다. 데이터를 바꾼 트랜잭션을 커밋한 "뒤에" 호출하세요.
+    DB에 저장하므로 여러 워커가 떠 있어도 모두 같은 버전을 봅니다.
+
+    - 쓰기 트랜잭션 안에서 올리면 모든 쓰기가 이 한 행의 잠금을 커밋 때까지 기다리며 줄을 섭니다.
+    - 커밋 뒤에 올리므로 버전은 데이터보다 늦게 바뀔 수는 있어도 먼저 바뀌지는 않습니다.
+      (새 본문이 이전 ETag로 나갈 수는 있지만, 옛 본문이 새 ETag로 고정되지는 않음)
+    """
+    try:
+        db.execute(
+            insert(DataVersion)
+            .values(name=name, version=1)
+            .on_conflict_do_update(
+                index_elements=[DataVersion.name],
+                set_={"version": DataVersion.version + 1, "updated_at": func.now()},
+            )
+        )
+        db.commit()
+    except Exception as e:
+        # 데이터는 이미 커밋됐으므로 요청을 실패시키지 않습니다. (다음 변경 때 버전이 올라감)
+        db.rollback()
+        logger.warning(f"데이터 버전 갱신 실패 ({name}): {e}")
+
+
+def get_data_versions(db: Session, names: Iterable[str]) -> dict:
+    """{이름: (버전, 마지막 변경 시각)} (한 번도 바뀐 적 없으면 (0, None))"""
+    names = list(names)
+    rows = (
+        db.query(DataVersion.name, DataVersion.version, DataVersion.updated_at)
+        .filter(DataVersion.name.in_(names))
+        .all()
+    )
+    versions = {name: (0, None) for name in names}
+    versions.update({name: (version, updated_at) for name, version, updated_at in rows})
+    return versions
+
+
+def make_etag(*parts) -> str:
+    """응답을 결정하는 값들로 약한(weak) ETag를 만듭니다."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # 약한 비교: W/ 접두사는 무시하고 값만 비교
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP 날짜는 초 단위이므로 밀리초 이하는 버리고 비교
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def evaluate(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    private: bool = False,
+) -> Optional[Response]:
+    """
+    조건부 요청(If-None-Match / If-Modified-Since)을 처리합니다.
+
+    - 응답 헤더(ETag, Last-Modified, Cache-Control, Vary)를 response에 채웁니다.
+    - 클라이언트가 가진 값이 최신이면 304 응답을 반환합니다. -> 본문 조립 없이 그대로 반환하세요.
+    - private=True(로그인 유저별 응답)면 프록시가 저장하지 않도록 private으로 내보냅니다.
+    """
+    headers = {
+        "ETag": etag,
+        "Vary": "Authorization",
+        "Cache-Control": (
+            "private, no-cache"
+            if private
+            else f"public, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}"
+        ),
+    }
+    if last_modified is not None:
+        last_modified = _as_utc(last_modified)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+
+    # If-None-Match가 있으면 If-Modified-Since는 보지 않습니다. (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif last_modified is not None and request.headers.get("if-modified-since"):
+        not_modified = _not_modified_since(
+            request.headers["if-modified-since"], last_modified
+        )
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return None
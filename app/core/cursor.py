@@ -0,0 +1,22 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+
+def encode_cursor(payload: dict) -> str:
+    """페이지 커서: JSON을 URL에 그대로 넣을 수 있는 base64url 문자열로 만듭니다."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """encode_cursor의 반대. 형식이 잘못되면 400 에러를 냅니다."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return payload
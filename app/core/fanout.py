@@ -0,0 +1,197 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+
+class ThrottledError(Exception):
+    """토큰 버킷 대기 시간이 허용치를 넘어 호출을 포기한 경우"""
+
+
+class TokenBucket:
+    """
+    전역 호출 속도 제한기 (초당 rate개, 최대 capacity개까지 몰아서 사용 가능)
+
+    - 토큰이 부족하면 다음 토큰이 생길 때까지 기다립니다.
+    - 예상 대기 시간이 max_wait를 넘으면 기다리지 않고 ThrottledError를 던집니다.
+    - rate가 0 이하이면 제한 없이 통과합니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, max_wait: Optional[float] = None) -> float:
+        """토큰 1개를 사용합니다. 반환값: 실제로 기다린 시간(초)"""
+        if self.rate <= 0:
+            return 0.0
+
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                raise ThrottledError(f"예상 대기 {wait:.2f}s > 허용 {max_wait:.2f}s")
+
+            # 기다릴 토큰을 미리 예약해두고(음수 허용) 락 밖에서 잠듭니다.
+            self._tokens -= 1
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class FanoutExecutor:
+    """
+    외부 API 병렬 호출(fan-out) 실행기
+
+    - rate_limiter: 모든 요청이 공유하는 전역 토큰 버킷
+    - concurrency: 요청 1건(run 1회) 안에서 동시에 실행할 최대 호출 수
+    - timeout: 호출 1건의 제한 시간 (넘으면 실패 처리)
+    - hedge_delay: 첫 시도가 이 시간 안에 끝나지 않으면 같은 호출을 한 번 더 보내고
+      먼저 끝난 쪽을 사용합니다. (0 이하이면 사용 안 함)
+
+    실패한 호출은 예외 객체로 돌려주므로(asyncio.gather의 return_exceptions=True와 동일),
+    호출하는 쪽에서 None 등으로 대체하면 전체 응답이 느린 호출 하나에 묶이지 않습니다.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: TokenBucket,
+        concurrency: int,
+        timeout: float,
+        max_queue_wait: Optional[float] = None,
+        hedge_delay: float = 0.0,
+    ):
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_queue_wait = max_queue_wait
+        self.hedge_delay = hedge_delay
+
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.throttled = 0  # 대기 시간 초과로 포기한 호출 수
+        self.rate_limited = 0  # 토큰을 기다려야 했던 호출 수
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def request_slots(self) -> asyncio.Semaphore:
+        """요청 1건에서 쓸 동시 실행 제한(세마포어)을 만듭니다."""
+        return asyncio.Semaphore(self.concurrency)
+
+    async def run(
+        self, calls: list[Callable[[], Awaitable[Any]]]
+    ) -> list[Any | BaseException]:
+        """
+        calls: 인자 없는 코루틴 함수 목록 (헤지 재시도를 위해 코루틴이 아닌 '함수'를 받습니다)
+        반환값: calls와 같은 순서의 결과 리스트 (실패한 자리에는 예외 객체)
+        """
+        slots = self.request_slots()
+        return await asyncio.gather(
+            *[self.submit(slots, call) for call in calls], return_exceptions=True
+        )
+
+    async def submit(
+        self, slots: asyncio.Semaphore, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        호출 1건을 실행합니다. (요청 단위 세마포어 -> 전역 토큰 버킷 -> 제한 시간/헤지)
+        여러 호출을 다른 방식(single-flight 등)으로 감싸야 할 때 run 대신 사용합니다.
+        """
+        enqueued_at = time.monotonic()
+        async with slots:
+            self._record_queue_wait(time.monotonic() - enqueued_at)
+            return await self._call_with_hedge(call)
+
+    async def _acquire(self, max_wait: Optional[float]):
+        try:
+            waited = await self.rate_limiter.acquire(max_wait)
+        except ThrottledError:
+            self.throttled += 1
+            raise
+        if waited > 0:
+            self.rate_limited += 1
+            self._record_queue_wait(waited)
+
+    async def _attempt(self, call):
+        self.calls += 1
+        try:
+            return await asyncio.wait_for(call(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    async def _call_with_hedge(self, call):
+        try:
+            await self._acquire(self.max_queue_wait)
+            if self.hedge_delay <= 0:
+                result = await self._attempt(call)
+            else:
+                result = await self._hedged(call)
+        except Exception:
+            self.failures += 1
+            raise
+        self.successes += 1
+        return result
+
+    async def _hedged(self, call):
+        primary = asyncio.ensure_future(self._attempt(call))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay)
+        if done:
+            return primary.result()
+
+        # 헤지 호출은 남는 토큰이 있을 때만 보냅니다. (속도 제한을 넘기면서까지 보내지 않음)
+        try:
+            await self._acquire(max_wait=0)
+        except ThrottledError:
+            return await primary
+
+        # 첫 시도가 느리면 같은 호출을 한 번 더 보내고, 먼저 성공한 결과를 사용
+        self.hedges += 1
+        hedge = asyncio.ensure_future(self._attempt(call))
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _record_queue_wait(self, waited: float):
+        self.queue_wait_total += waited
+        self.queue_wait_max = max(self.queue_wait_max, waited)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "throttled": self.throttled,
+            "rate_limited": self.rate_limited,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "queue_wait_total_ms": round(self.queue_wait_total * 1000, 1),
+            "queue_wait_max_ms": round(self.queue_wait_max * 1000, 1),
+        }
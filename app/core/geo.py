@@ -0,0 +1,51 @@
+import math
+
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 좌표 사이의 대원 거리(미터). PostGIS geography 거리와 0.5% 이내로 일치합니다."""
+    p1 = math.radians(lat1)
+    p2 = math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def tile_of(lat: float, lng: float, tile_deg: float) -> tuple[int, int]:
+    """위경도를 tile_deg 간격의 격자 칸 번호 (row, col)로 양자화합니다."""
+    return math.floor(lat / tile_deg), math.floor(lng / tile_deg)
+
+
+def tile_center(tile: tuple[int, int], tile_deg: float) -> tuple[float, float]:
+    row, col = tile
+    return (row + 0.5) * tile_deg, (col + 0.5) * tile_deg
+
+
+def tile_half_diagonal_m(tile: tuple[int, int], tile_deg: float) -> float:
+    """칸 중심에서 꼭짓점까지의 거리(미터). 칸 안의 어떤 점도 중심에서 이보다 멀지 않습니다."""
+    lat, lng = tile_center(tile, tile_deg)
+    # 적도 쪽(중심보다 위도가 낮은) 꼭짓점이 경도 방향으로 더 넓으므로 그쪽까지 잰다
+    return haversine_m(
+        lat, lng, lat - math.copysign(tile_deg / 2, lat), lng + tile_deg / 2
+    )
+
+
+def lnglat_to_tile(lng: float, lat: float, zoom: int) -> tuple[int, int]:
+    """위경도를 웹 메르카토르(슬리피 맵) 타일 번호 (x, y)로 바꿉니다."""
+    n = 2**zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = math.floor((lng + 180.0) / 360.0 * n)
+    y = math.floor((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """타일의 (서, 남, 동, 북) 경계 위경도"""
+    n = 2**zoom
+
+    def lat_of(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360.0 - 180.0, lat_of(y + 1), (x + 1) / n * 360.0 - 180.0, lat_of(y)
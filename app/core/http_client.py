@@ -0,0 +1,68 @@
+import importlib.util
+
+import httpx
+
+from app.config.config import settings
+from app.logging import logger
+
+
+# HTTP/2는 h2 패키지가 설치되어 있을 때만 켤 수 있습니다. (없으면 HTTP/1.1로 동작)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class OutboundClientManager:
+    """
+    외부 API(카카오, 네이버) 호출용 httpx.AsyncClient를 앱 전체에서 공유하는 관리자
+
+    - 요청마다 클라이언트를 새로 만들면 매번 TCP/TLS 핸드셰이크 비용이 발생합니다.
+    - 호스트(업스트림)별로 클라이언트를 하나씩 두어 커넥션 풀과 연결 수 제한을 분리합니다.
+    - FastAPI lifespan에서 start() / close()를 호출합니다.
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        timeout = httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=settings.HTTP_READ_TIMEOUT,
+            write=settings.HTTP_WRITE_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        )
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_PER_HOST,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        return httpx.AsyncClient(
+            http2=settings.HTTP2_ENABLED and HTTP2_AVAILABLE,
+            timeout=timeout,
+            limits=limits,
+        )
+
+    async def start(self):
+        """앱 시작 시 업스트림별 클라이언트를 미리 만들어 둡니다."""
+        for name in ("kakao", "naver"):
+            self.get(name)
+        if settings.HTTP2_ENABLED and not HTTP2_AVAILABLE:
+            logger.warning("h2 패키지가 없어 외부 API 호출은 HTTP/1.1로 동작합니다.")
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        업스트림 이름("kakao", "naver")에 해당하는 공유 클라이언트를 반환합니다.
+        lifespan 밖(스크립트 등)에서 호출되어도 동작하도록 없으면 즉시 생성합니다.
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            self._clients[name] = client
+        return client
+
+    async def close(self):
+        """앱 종료 시 열린 커넥션을 모두 정리합니다."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+http_clients = OutboundClientManager()
@@ -0,0 +1,13 @@
+from typing import Callable
+
+# 이름 -> 현재 수치(dict)를 돌려주는 함수
+# 캐시, 서킷 브레이커 등 각 모듈이 자기 카운터를 등록해두면 /metrics에서 한 번에 조회합니다.
+_collectors: dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, collector: Callable[[], dict]):
+    _collectors[name] = collector
+
+
+def snapshot() -> dict:
+    return {name: collector() for name, collector in _collectors.items()}
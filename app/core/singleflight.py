@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 작업을 1번만 실행하고 결과를 공유합니다.
+
+    - 처음 들어온 호출(leader)이 작업을 Task로 시작하고, 이후 같은 키의 호출은 그 Task를 기다립니다.
+    - 작업이 예외로 끝나면 기다리던 모든 호출에 같은 예외가 전달됩니다.
+    - 작업이 끝나면(성공/실패 무관) 키를 즉시 해제하므로, 다음 요청은 새로 실행합니다.
+    - leader 요청이 취소되어도 공유 Task는 shield로 보호되어 다른 대기자에게 결과가 전달됩니다.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self._inflight),
+            "leaders": self.leaders,
+            "shared": self.shared,
+        }
@@ -0,0 +1,294 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 인덱스를 쓰지 않고 PostGIS로만 조회합니다.
+    np = None
+
+from app.core.geo import EARTH_RADIUS_M
+
+NUMPY_AVAILABLE = np is not None
+
+# 위도 1도의 길이(미터). 격자 칸 범위를 잡을 때만 쓰는 근사값입니다.
+METERS_PER_DEG_LAT = 111_320.0
+
+
+@dataclass
+class _Snapshot:
+    """
+    한 번 만들면 구조(정렬 순서, 칸 구간)는 바꾸지 않는 배열 묶음 (조회 중에 교체돼도 안전하도록)
+    값은 update()가 같은 칸 안의 변경에 한해 원소 단위로만 고칩니다.
+    """
+
+    ids: "np.ndarray"
+    lat: "np.ndarray"
+    lng: "np.ndarray"
+    avg_rating: "np.ndarray"
+    review_count: "np.ndarray"
+    # (격자 행, 격자 열) -> 배열 구간 [start, end)  (배열은 칸 순서로 정렬되어 있음)
+    cells: dict[tuple[int, int], tuple[int, int]]
+    # id로 배열 위치를 찾기 위한 정렬된 id와 그 위치 (이분 탐색용)
+    sorted_ids: "np.ndarray"
+    sorted_positions: "np.ndarray"
+
+
+class SpatialIndex:
+    """
+    식당 좌표를 메모리에 올려두고 DB 없이 반경/최근접 후보를 찾는 인덱스
+
+    - id, 위도, 경도, 평점, 리뷰수를 연속된 NumPy 배열로 보관합니다.
+    - 배열은 cell_deg 간격 격자 칸 순서로 정렬해 두고, 칸마다 [start, end) 구간만 기억합니다.
+      -> 반경 조회 시 겹치는 칸의 구간만 잘라서 haversine을 벡터 연산으로 계산합니다.
+    - upsert()로 바뀐 식당만 반영하고 스냅샷을 통째로 교체합니다. (읽기는 잠금 없음)
+    - 요청 처리 중의 단건 변경은 update()로 받습니다. 배열을 다시 만들지 않고
+      평점/리뷰수만 제자리에서 고치거나, 새 식당/칸 이동은 모아뒀다가 다음 upsert()에서 반영합니다.
+    """
+
+    def __init__(self, cell_deg: float = 0.01):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError(
+                "numpy가 설치되어 있지 않아 공간 인덱스를 사용할 수 없습니다."
+            )
+        self.cell_deg = cell_deg
+        # id -> (위도, 경도, 평점, 리뷰수): 증분 갱신용 원본
+        self._rows: dict[int, tuple[float, float, float, int]] = {}
+        # 다음 재구성 때 반영할 단건 변경 (새 식당 또는 격자 칸이 바뀐 식당): id -> (위도, 경도)
+        self._pending: dict[int, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self.watermark = None  # 마지막으로 반영한 created_at/updated_at
+        self.refreshes = 0
+        self.last_refresh_at: Optional[float] = None
+        self.queries = 0
+        self.patched = 0  # 재구성 없이 제자리에서 고친 건수
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return 0 if snapshot is None else len(snapshot.ids)
+
+    def upsert(
+        self, rows: Iterable[tuple[int, float, float, float, int]], watermark=None
+    ) -> list[tuple[float, float]]:
+        """
+        (id, 위도, 경도, 평점, 리뷰수) 목록과 모아둔 단건 변경을 반영하고 배열을 다시 만듭니다.
+        좌표가 없는 식당은 건너뜁니다. (주기적 갱신 스레드에서 호출)
+        반환값: 이번에 처음 반영된 단건 변경의 좌표 목록 (응답 캐시 무효화용)
+        """
+        with self._lock:
+            changed = False
+            for restaurant_id, lat, lng, avg_rating, review_count in rows:
+                if lat is None or lng is None:
+                    continue
+                self._rows[restaurant_id] = (
+                    lat,
+                    lng,
+                    avg_rating or 0.0,
+                    review_count or 0,
+                )
+                changed = True
+            if watermark is not None and (
+                self.watermark is None or watermark > self.watermark
+            ):
+                self.watermark = watermark
+
+            flushed = list(self._pending.values())
+            self._pending.clear()
+            if changed or flushed or self._snapshot is None:
+                self._snapshot = self._build()
+            self.refreshes += 1
+            self.last_refresh_at = time.time()
+        return flushed
+
+    def update(
+        self,
+        restaurant_id: int,
+        lat: float,
+        lng: float,
+        avg_rating: float,
+        review_count: int,
+    ):
+        """
+        식당 1건의 변경을 반영합니다. 요청 처리 중에 호출되므로 배열을 다시 만들지 않습니다.
+        - 이미 있는 식당이 같은 격자 칸에 있으면 스냅샷 배열을 제자리에서 고칩니다.
+        - 새 식당이거나 칸이 바뀐 식당은 모아뒀다가 다음 upsert()에서 반영합니다.
+        """
+        if lat is None or lng is None:
+            return
+        avg_rating = avg_rating or 0.0
+        review_count = review_count or 0
+
+        with self._lock:
+            self._rows[restaurant_id] = (lat, lng, avg_rating, review_count)
+            snapshot = self._snapshot
+            position = (
+                None if snapshot is None else self._position(snapshot, restaurant_id)
+            )
+            if position is None or self._cell(lat, lng) != self._cell(
+                snapshot.lat[position], snapshot.lng[position]
+            ):
+                self._pending[restaurant_id] = (lat, lng)
+                return
+
+            # 원소 단위로만 바꾸므로, 잠금 없이 읽는 쪽은 바뀌기 전/후 값 중 하나를 봅니다.
+            snapshot.lat[position] = lat
+            snapshot.lng[position] = lng
+            snapshot.avg_rating[position] = avg_rating
+            snapshot.review_count[position] = review_count
+            self.patched += 1
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    @staticmethod
+    def _position(snapshot: _Snapshot, restaurant_id: int) -> Optional[int]:
+        i = int(np.searchsorted(snapshot.sorted_ids, restaurant_id))
+        if i < len(snapshot.sorted_ids) and snapshot.sorted_ids[i] == restaurant_id:
+            return int(snapshot.sorted_positions[i])
+        return None
+
+    def _build(self) -> _Snapshot:
+        count = len(self._rows)
+        ids = np.fromiter(self._rows.keys(), dtype=np.int64, count=count)
+        values = np.array(list(self._rows.values()), dtype=np.float64).reshape(count, 4)
+        lat, lng = values[:, 0], values[:, 1]
+
+        # 격자 칸 순서로 정렬해서 같은 칸의 식당이 연속되게 만듭니다.
+        rows = np.floor(lat / self.cell_deg).astype(np.int64)
+        cols = np.floor(lng / self.cell_deg).astype(np.int64)
+        order = np.lexsort((cols, rows))
+        rows, cols = rows[order], cols[order]
+
+        cells = {}
+        if count:
+            boundaries = np.flatnonzero((np.diff(rows) != 0) | (np.diff(cols) != 0)) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [count]))
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                cells[(int(rows[start]), int(cols[start]))] = (start, end)
+
+        ids = ids[order]
+        id_order = np.argsort(ids, kind="stable")
+        return _Snapshot(
+            ids=ids,
+            lat=np.ascontiguousarray(lat[order]),
+            lng=np.ascontiguousarray(lng[order]),
+            avg_rating=np.ascontiguousarray(values[order, 2]),
+            review_count=values[order, 3].astype(np.int64),
+            cells=cells,
+            sorted_ids=ids[id_order],
+            sorted_positions=id_order,
+        )
+
+    def _candidate_slice(self, snapshot: _Snapshot, lat: float, lng: float, radius):
+        """반경과 겹치는 격자 칸들의 배열 위치(index)를 모읍니다."""
+        dlat = radius / METERS_PER_DEG_LAT
+        cos_lat = max(math.cos(math.radians(min(abs(lat) + dlat, 89.9))), 1e-6)
+        dlng = radius / (METERS_PER_DEG_LAT * cos_lat)
+
+        row_min = math.floor((lat - dlat) / self.cell_deg)
+        row_max = math.floor((lat + dlat) / self.cell_deg)
+        col_min = math.floor((lng - dlng) / self.cell_deg)
+        col_max = math.floor((lng + dlng) / self.cell_deg)
+
+        # 칸이 너무 많으면(넓은 반경) 격자를 도는 것보다 전체를 계산하는 편이 빠릅니다.
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(snapshot.cells):
+            return np.arange(len(snapshot.ids))
+
+        ranges = []
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                span = snapshot.cells.get((row, col))
+                if span:
+                    ranges.append(np.arange(*span))
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(ranges)
+
+    @staticmethod
+    def _haversine(lat: float, lng: float, lats, lngs):
+        p1 = math.radians(lat)
+        p2 = np.radians(lats)
+        dp = p2 - p1
+        dl = np.radians(lngs - lng)
+        a = np.sin(dp / 2) ** 2 + math.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+        return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+    def query_radius(
+        self, lat: float, lng: float, radius: float, limit: Optional[int] = None
+    ) -> list[tuple[int, float, float, int]]:
+        """
+        반경(미터) 안의 식당을 가까운 순으로 반환합니다.
+        반환값: [(id, 거리, 평점, 리뷰수), ...]
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+        self.queries += 1
+
+        index = self._candidate_slice(snapshot, lat, lng, radius)
+        if index.size == 0:
+            return []
+        distance = self._haversine(lat, lng, snapshot.lat[index], snapshot.lng[index])
+        inside = distance <= radius
+        index, distance = index[inside], distance[inside]
+
+        # 전체 정렬 대신 상위 limit개만 골라서 정렬
+        if limit is not None and index.size > limit:
+            top = np.argpartition(distance, limit - 1)[:limit]
+            index, distance = index[top], distance[top]
+        order = np.lexsort((snapshot.ids[index], distance))
+        index, distance = index[order], distance[order]
+
+        return list(
+            zip(
+                snapshot.ids[index].tolist(),
+                distance.tolist(),
+                snapshot.avg_rating[index].tolist(),
+                snapshot.review_count[index].tolist(),
+            )
+        )
+
+    def query_knn(
+        self, lat: float, lng: float, k: int, max_radius: Optional[float] = None
+    ) -> list[tuple[int, float, float, int]]:
+        """
+        가장 가까운 k개를 반환합니다. 격자 한 칸 크기부터 반경을 두 배씩 넓혀가며 찾습니다.
+        반환값: [(id, 거리, 평점, 리뷰수), ...]
+        """
+        snapshot = self._snapshot
+        if snapshot is None or k <= 0:
+            return []
+
+        radius = self.cell_deg * METERS_PER_DEG_LAT
+        # 지구 반둘레보다 넓으면 모든 식당이 들어옵니다.
+        limit_radius = math.pi * EARTH_RADIUS_M
+        if max_radius is not None:
+            limit_radius = min(limit_radius, max_radius)
+        while True:
+            radius = min(radius, limit_radius)
+            found = self.query_radius(lat, lng, radius, limit=k)
+            # 반경 안에서 k개를 찾았다면 반경 밖의 식당은 이보다 멀 수밖에 없습니다.
+            if len(found) >= k or radius >= limit_radius:
+                return found
+            radius *= 2
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "size": len(self),
+            "cells": 0 if self._snapshot is None else len(self._snapshot.cells),
+            "refreshes": self.refreshes,
+            "pending": len(self._pending),
+            "patched": self.patched,
+            "last_refresh_at": self.last_refresh_at,
+            "watermark": None if self.watermark is None else str(self.watermark),
+            "queries": self.queries,
+        }
@@ -1,4 +1,7 @@
+import asyncio
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from fastapi import UploadFile, HTTPException
 from supabase import create_client, Client
 
@@ -9,6 +12,39 @@ from app.config.config import settings
 # (매번 생성하지 않도록 전역 변수나 싱글톤으로 관리하는 게 좋습니다)
 supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
 
+# 2. 스토리지 호출 전용 스레드 풀
+# Supabase storage 클라이언트는 동기식이라 이벤트 루프에서 직접 부르면 업로드하는 동안
+# 워커의 다른 요청이 모두 멈춥니다. 기본 스레드 풀(DB 조회 등)과 섞이지 않도록 따로 둡니다.
+# 처음 쓸 때 만들고 lifespan 종료 시 닫으므로, 앱이 다시 시작되어도 새로 만들어집니다.
+_storage_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_storage_executor() -> ThreadPoolExecutor:
+    global _storage_executor
+    if _storage_executor is None:
+        _storage_executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_UPLOAD_THREADS, thread_name_prefix="storage"
+        )
+    return _storage_executor
+
+
+async def close_storage_executor():
+    """
+    진행 중인 업로드를 끝까지 처리하고 스레드 풀을 닫습니다. (lifespan 종료 시 호출)
+    기다리는 동안 이벤트 루프를 막지 않도록 스레드에서 대기합니다.
+    """
+    global _storage_executor
+    executor, _storage_executor = _storage_executor, None
+    if executor is not None:
+        await asyncio.to_thread(executor.shutdown)
+
+
+async def _run_in_storage_thread(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_storage_executor(), lambda: func(*args, **kwargs)
+    )
+
 
 async def upload_image_to_supabase(
     file: UploadFile, bucket_name: str = "reviews", folder_name: str = "uploads"
@@ -31,17 +67,19 @@ async def upload_image_to_supabase(
         unique_filename = f"{uuid.uuid4()}.{file_ext}"
         file_path = f"{folder_name}/{unique_filename}"
 
-        # 3. Supabase 업로드 요청
+        # 3. Supabase 업로드 요청 (전용 스레드에서 실행해 이벤트 루프를 막지 않음)
         # content-type을 명시해야 브라우저에서 바로 이미지로 보입니다.
-        res = supabase.storage.from_(bucket_name).upload(
+        bucket = supabase.storage.from_(bucket_name)
+        await _run_in_storage_thread(
+            bucket.upload,
             path=file_path,
             file=file_content,
             file_options={"content-type": file.content_type},
         )
 
-        # 4. Public URL 생성
+        # 4. Public URL 생성 (네트워크 요청 없이 주소만 조립)
         # 주의: Supabase 대시보드에서 버킷이 'Public'으로 설정되어 있어야 합니다.
-        public_url = supabase.storage.from_(bucket_name).get_public_url(file_path)
+        public_url = bucket.get_public_url(file_path)
 
         return public_url
 
@@ -52,20 +90,90 @@ async def upload_image_to_supabase(
         )
 
 
-async def delete_image_from_supabase(image_url: str, bucket_name: str = "reviews"):
+async def upload_images_to_supabase(
+    files: List[UploadFile],
+    bucket_name: str = "reviews",
+    folder_name: str = "uploads",
+) -> List[str]:
     """
-    업로드된 이미지 URL을 받아 Supabase에서 삭제합니다. (롤백용)
+    여러 이미지를 동시에 업로드하고, files와 같은 순서의 Public URL 목록을 반환합니다.
+
+    - 요청 1건에서 동시에 올리는 수는 IMAGE_UPLOAD_CONCURRENCY로 제한합니다.
+    - 하나라도 실패하면 성공한 이미지를 한 번에 지우고(롤백) 첫 번째 예외를 던집니다.
+    - 요청이 취소되면(클라이언트 연결 끊김 등) 남은 업로드는 시작하지 않고, 진행 중인 업로드가
+      끝나길 기다렸다가 올라간 이미지를 지운 뒤 취소를 이어서 던집니다.
     """
+    if not files:
+        return []
+
+    slots = asyncio.Semaphore(max(1, settings.IMAGE_UPLOAD_CONCURRENCY))
+    cancelled = False
+
+    async def upload(file: UploadFile) -> str:
+        async with slots:
+            if cancelled:
+                raise asyncio.CancelledError()
+            return await upload_image_to_supabase(file, bucket_name, folder_name)
+
+    tasks = [asyncio.create_task(upload(file)) for file in files]
     try:
-        if bucket_name not in image_url:
-            return  # 다른 버킷이거나 잘못된 URL이면 무시
+        # wait는 자신이 취소돼도 업로드 작업을 취소하지 않습니다.
+        # (스레드에서 도는 업로드는 어차피 멈출 수 없어서, 취소하면 결과만 잃어버림)
+        await asyncio.wait(tasks)
+    except asyncio.CancelledError:
+        cancelled = True
+        await asyncio.shield(_rollback_uploads(tasks, bucket_name))
+        raise
+
+    errors = [task.exception() for task in tasks if task.exception()]
+    if errors:
+        await _rollback_uploads(tasks, bucket_name)
+        raise errors[0]
+    return [task.result() for task in tasks]
+
+
+async def _rollback_uploads(tasks: List[asyncio.Task], bucket_name: str):
+    """업로드 작업이 모두 끝나길 기다렸다가 성공한 이미지를 한 번에 지웁니다."""
+    await asyncio.wait(tasks)
+    uploaded_urls = [
+        task.result()
+        for task in tasks
+        if not task.cancelled() and task.exception() is None
+    ]
+    if uploaded_urls:
+        print(f"🔥 업로드 실패로 인한 이미지 롤백 시작 ({len(uploaded_urls)}개)")
+        await delete_images_from_supabase(uploaded_urls, bucket_name)
 
-        file_path = image_url.split(f"/{bucket_name}/")[-1]
+
+async def delete_images_from_supabase(
+    image_urls: List[str], bucket_name: str = "reviews"
+):
+    """
+    업로드된 이미지 URL 목록을 받아 Supabase에서 한 번의 요청으로 삭제합니다. (롤백용)
+    """
+    try:
+        # 1. URL에서 버킷 내부 경로 추출 (다른 버킷이거나 잘못된 URL이면 무시)
+        file_paths = [
+            image_url.split(f"/{bucket_name}/")[-1]
+            for image_url in image_urls
+            if bucket_name in image_url
+        ]
+        if not file_paths:
+            return
 
         # 2. Supabase 삭제 요청 (리스트로 경로 전달)
-        supabase.storage.from_(bucket_name).remove([file_path])
-        print(f"🗑️ 롤백: 이미지 삭제 완료 ({file_path})")
+        await _run_in_storage_thread(
+            supabase.storage.from_(bucket_name).remove, file_paths
+        )
+        print(f"🗑️ 롤백: 이미지 {len(file_paths)}개 삭제 완료")
 
     except Exception as e:
         # 삭제 실패는 로그만 남기고 넘어감 (메인 로직을 방해하면 안 됨)
         print(f"⚠️ 이미지 삭제 실패: {e}")
+
+
+async def delete_image_from_supabase(image_url: str, bucket_name: str = "reviews"):
+    """
+    업로드된 이미지 URL을 받아 Supabase에서 삭제합니다. (롤백용)
+    """
+    await delete_images_from_supabase([image_url], bucket_name)
@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class DiskTileCache:
+    """
+    지도 타일(바이너리)을 디스크에 저장하는 캐시 ({directory}/{z}/{x}/{y}.mvt)
+
+    - 같은 서버의 여러 워커가 파일을 공유하므로, 한 워커에서 지우면 모두에게 반영됩니다.
+    - max_files를 넘으면 가장 오래전에 저장된 파일부터 지웁니다.
+    - ttl이 지난 파일은 miss로 처리합니다.
+    """
+
+    def __init__(self, directory: str, max_files: int, ttl: float):
+        self.directory = directory
+        self.max_files = max_files
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # 경로 -> 저장 시각 (오래된 순)
+        self._files: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_existing()
+
+    def _load_existing(self):
+        """재시작 시 기존 파일을 저장 시각 순으로 다시 추적합니다."""
+        found = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".mvt"):
+                    path = os.path.join(root, name)
+                    try:
+                        found.append((os.path.getmtime(path), path))
+                    except OSError:
+                        continue
+        for mtime, path in sorted(found):
+            self._files[path] = mtime
+
+    def _path(self, key: tuple[int, int, int]) -> str:
+        z, x, y = key
+        return os.path.join(self.directory, str(z), str(x), f"{y}.mvt")
+
+    def get(self, key: tuple[int, int, int]) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            if os.path.getmtime(path) + self.ttl <= time.time():
+                self.misses += 1
+                return None
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def set(self, key: tuple[int, int, int], data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 다른 워커가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓰고 교체
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._files[path] = time.time()
+            self._files.move_to_end(path)
+            while len(self._files) > self.max_files:
+                old_path, _ = self._files.popitem(last=False)
+                self._remove(old_path)
+                self.evictions += 1
+
+    def delete(self, key: tuple[int, int, int]):
+        path = self._path(key)
+        with self._lock:
+            self._files.pop(path, None)
+        self._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "files": len(self._files),
+            "max_files": self.max_files,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+        }
@@ -83,6 +83,8 @@ def log_info(
         sanitized_res_body = "<PDF content>"
     elif "text/html" in res_content_type:
         sanitized_res_body = "<HTML content>"
+    elif "application/vnd.mapbox-vector-tile" in res_content_type:
+        sanitized_res_body = f"<Vector tile: {len(res_body or b'')} bytes>"
     elif (
         "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         in res_content_type
@@ -132,6 +134,11 @@ async def log_requests(request: Request, call_next):
         response = await call_next(request)
         return response
 
+    # 스트리밍 응답은 본문을 모아서 로깅하면 스트리밍 효과가 사라지므로 건너뜁니다.
+    if request.url.path.endswith("/search/stream"):
+        response = await call_next(request)
+        return response
+
     if request.url.path.endswith("/") or request.url.path.endswith("/openapi.json"):
         response = await call_next(request)
         return response
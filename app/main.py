@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -10,12 +12,52 @@ from app.users.router import auth_controller
 from app.reviews.router import reviews_controller
 from app.bookmark.router import bookmark_controller
 import app.logging_middleware as logging_middleware
+from app.core.http_client import http_clients
+from app.core import metrics
+from app.core.storage import close_storage_executor
+from app.config.config import settings
+from app.restaurants.service import restaurants_service
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 logger = logger
 
-app = FastAPI(title="맛집 API 서버", version="0.0.1")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 외부 API용 공유 HTTP 클라이언트 생성 (커넥션 재사용)
+    await http_clients.start()
+    # 인기 검색어 캐시 프리워밍 (서버 기동을 막지 않도록 백그라운드로 실행)
+    prewarm_task = asyncio.create_task(restaurants_service.prewarm_search_cache())
+    # 자주 조회되는 좌표의 주변 맛집 타일 캐시 프리워밍 (동기 DB 조회라 스레드로 실행)
+    nearby_prewarm_task = asyncio.create_task(
+        asyncio.to_thread(restaurants_service.prewarm_nearby_cache)
+    )
+    # 메모리 공간 인덱스 적재 + 주기적 증분 갱신 (NEARBY_INDEX_ENABLED일 때만)
+    index_task = None
+    if restaurants_service.spatial_index is not None:
+        index_task = asyncio.create_task(
+            restaurants_service.run_spatial_index_refresher()
+        )
+    # 인기 식당(/trending) 점수 주기적 갱신
+    trending_task = None
+    if settings.TRENDING_REFRESH_ENABLED:
+        trending_task = asyncio.create_task(
+            restaurants_service.run_trending_refresher()
+        )
+    yield
+    prewarm_task.cancel()
+    nearby_prewarm_task.cancel()
+    if index_task:
+        index_task.cancel()
+    if trending_task:
+        trending_task.cancel()
+    await http_clients.close()
+    # 진행 중인 업로드는 끝까지 처리하고 스레드 풀 종료 (이벤트 루프는 막지 않음)
+    await close_storage_executor()
+
+
+app = FastAPI(title="맛집 API 서버", version="0.0.1", lifespan=lifespan)
 app.middleware("http")(logging_middleware.log_requests)
 
 app.include_router(
@@ -41,3 +83,9 @@ app.add_middleware(
 @app.get("/")
 async def health_check():
     return JSONResponse({"status": "ok"})
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """캐시 hit/miss 등 프로세스 내부 지표를 조회합니다."""
+    return JSONResponse(metrics.snapshot())
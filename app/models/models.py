@@ -1,4 +1,5 @@
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -8,9 +9,11 @@ from sqlalchemy import (
     String,
     Text,
     Float,
+    Index,
     UniqueConstraint,
     func,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from geoalchemy2 import Geometry, Geography  # PostGIS 사용을 위한 임포트
@@ -44,7 +47,13 @@ class Restaurant(Base):
     # 예: "18577297" (카카오에서 주는 id는 숫자형 문자열입니다)
     kakao_place_id = Column(String(50), unique=True, index=True, nullable=False)
     name = Column(String(100), index=True)  # 식당 이름 (place_name)
-    category = Column(String(100))  # 카테고리 (category_name)
+    # 대표 카테고리 (카카오 category_name의 두 번째 단계, 예: "한식")
+    category = Column(String(100))
+    # 카카오 원본 category_name을 '>'로 나눈 단계별 이름 (예: ["한식", "육류,고기"]), GIN 인덱스로 필터링
+    # (원본을 저장하지 않던 기존 식당은 대표 카테고리 1개만 들어 있음)
+    categories = Column(
+        ARRAY(String(100)), nullable=False, default=list, server_default="{}"
+    )
     address = Column(String(255))  # 지번 주소 (address_name)
     road_address = Column(String(255))  # 도로명 주소 (road_address_name)
     # [추가] 상세 정보 및 링크
@@ -57,7 +66,13 @@ class Restaurant(Base):
     # PostGIS 거리 계산용 (기존 유지)
     location = Column(Geography(geometry_type="POINT", srid=4326))
     image_url = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())  # 작성일
+    # 리뷰 집계 (리뷰 작성 시 같은 트랜잭션에서 갱신, 어긋나면 `python -m app.cli reconcile-ratings`)
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    avg_rating = Column(Float, nullable=False, default=0.0, server_default="0")
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )  # 작성일
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())  # 수정일
     # [추가] 식당이 삭제되면 북마크도 연쇄 삭제되도록 설정
     bookmarks = relationship(
@@ -67,6 +82,32 @@ class Restaurant(Base):
         "Review", back_populates="restaurant", cascade="all, delete-orphan"
     )
 
+    # 로컬 검색용 trigram(pg_trgm) 인덱스: 이름/주소 부분 일치·유사도 검색
+    __table_args__ = (
+        Index(
+            "ix_restaurants_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_restaurants_address_trgm",
+            "address",
+            postgresql_using="gin",
+            postgresql_ops={"address": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_restaurants_road_address_trgm",
+            "road_address",
+            postgresql_using="gin",
+            postgresql_ops={"road_address": "gin_trgm_ops"},
+        ),
+        # 카테고리 필터 (categories @> ARRAY['한식'])
+        Index("ix_restaurants_categories", "categories", postgresql_using="gin"),
+        # /latest 최신 등록순 목록 + 커서 페이징용
+        Index("ix_restaurants_created_at_id", created_at.desc(), id.desc()),
+    )
+
 
 class Review(Base):
     __tablename__ = "reviews"
@@ -76,7 +117,7 @@ class Review(Base):
     restaurant_id = Column(Integer, ForeignKey("restaurants.id"))  # 식당 ID
     rating = Column(Integer)  # 별점
     content = Column(Text)  # 리뷰 내용
-    images = Column(JSON)  # 이미지 URL 목록
+    images = Column(JSON)  # 이미지 URL 목록 (조회는 review_images 테이블 사용)
     created_at = Column(DateTime, default=func.now())  # 작성일
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())  # 수정일
 
@@ -84,6 +125,52 @@ class Review(Base):
     user = relationship("User", back_populates="reviews")
     restaurant = relationship("Restaurant", back_populates="reviews")
 
+    # 식당별 리뷰 목록 (최신순 + 커서 페이징)
+    __table_args__ = (
+        Index(
+            "ix_reviews_restaurant_created_id",
+            restaurant_id,
+            created_at.desc(),
+            id,
+        ),
+    )
+
+
+class ReviewImage(Base):
+    """
+    리뷰 사진 한 장 = 한 행 (Review.images를 펼쳐 둔 테이블)
+    식당 갤러리/썸네일을 (restaurant_id, created_at desc) 인덱스 범위 조회로 바로 읽습니다.
+    """
+
+    __tablename__ = "review_images"
+
+    id = Column(Integer, primary_key=True)
+    review_id = Column(
+        Integer,
+        ForeignKey("reviews.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    restaurant_id = Column(
+        Integer, ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False
+    )
+    url = Column(Text, nullable=False)
+    position = Column(Integer, nullable=False, default=0)  # 리뷰 안에서의 순서 (0부터)
+    # 업로드 시 크기를 알 때만 채웁니다. (앱에서 레이아웃을 미리 잡는 용도)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=func.now())  # 리뷰 작성일과 같은 값
+
+    __table_args__ = (
+        Index(
+            "ix_review_images_restaurant_created",
+            restaurant_id,
+            created_at.desc(),
+            review_id.desc(),
+            position,
+        ),
+    )
+
 
 class Bookmark(Base):
     __tablename__ = "bookmarks"
@@ -113,3 +200,95 @@ class Bookmark(Base):
     # 연결 설정
     user = relationship("User", back_populates="bookmarks")
     restaurant = relationship("Restaurant", back_populates="bookmarks")
+
+
+class NaverImageCache(Base):
+    """
+    카카오 장소 ID별 네이버 이미지 검색 결과 캐시
+    - image_url이 NULL이면 "이미지 없음"으로 확인된 결과(negative)입니다.
+    - refreshed_at 기준으로 만료되면 검색 시 네이버를 다시 호출합니다.
+    """
+
+    __tablename__ = "naver_image_cache"
+
+    kakao_place_id = Column(String(50), primary_key=True)
+    image_url = Column(Text, nullable=True)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class CategoryCount(Base):
+    """
+    카테고리별 식당 수 (/categories 응답용으로 미리 집계)
+    - 식당 저장 시 같은 트랜잭션에서 +1 합니다.
+    - 어긋나면 `python -m app.cli rebuild-category-counts`로 다시 계산합니다.
+    """
+
+    __tablename__ = "category_counts"
+
+    name = Column(String(100), primary_key=True)
+    restaurant_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class RestaurantTrendingScore(Base):
+    """
+    식당별 인기 점수 (북마크/리뷰 활동에 시간 감쇠 적용)
+
+    - 활동마다 weight * 2^((활동 시각 - 기준 시각) / 반감기)를 더해 둡니다. (forward decay)
+      모든 식당이 같은 비율로 줄어들므로 값을 다시 계산하지 않아도 순위가 그대로 맞습니다.
+    - 현재 시점 점수는 score * 2^(-(지금 - 기준 시각) / 반감기) 입니다.
+    """
+
+    __tablename__ = "restaurant_trending_scores"
+
+    restaurant_id = Column(
+        Integer, ForeignKey("restaurants.id", ondelete="CASCADE"), primary_key=True
+    )
+    score = Column(Float, nullable=False, default=0.0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # 상위 K개 조회용
+        Index("ix_restaurant_trending_scores_score", score.desc()),
+    )
+
+    restaurant = relationship("Restaurant")
+
+
+class TrendingEvent(Base):
+    """
+    인기 점수에 아직 반영하지 않은 활동 (북마크 추가/취소, 리뷰 작성)
+
+    - 활동과 같은 트랜잭션에서 쌓으므로, 커밋된 활동만 보이고 늦게 커밋돼도 빠지지 않습니다.
+    - 갱신 작업은 행을 지우면서(DELETE ... RETURNING) 점수에 더하므로 같은 활동을 두 번 더하지 않습니다.
+    - 북마크 취소는 원래 찜한 시각으로 sign=-1 행을 남겨, 더했던 만큼 정확히 뺍니다.
+    """
+
+    __tablename__ = "trending_events"
+
+    BOOKMARK = "bookmark"
+    REVIEW = "review"
+
+    id = Column(BigInteger, primary_key=True)
+    restaurant_id = Column(
+        Integer, ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False
+    )
+    kind = Column(String(20), nullable=False)  # bookmark / review
+    sign = Column(Integer, nullable=False, default=1, server_default="1")  # +1 / -1
+    # 활동 시각 (북마크 취소는 원래 찜한 시각)
+    occurred_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class DataVersion(Base):
+    """
+    목록 응답의 ETag용 데이터 버전 카운터 (app/core/conditional.py)
+    데이터를 바꾼 트랜잭션을 커밋한 뒤 +1 하며, DB에 두므로 모든 워커가 같은 값을 봅니다.
+    """
+
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
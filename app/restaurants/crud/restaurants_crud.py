@@ -1,10 +1,21 @@
 from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.models.models import Restaurant, Review, Bookmark
+from app.models.models import (
+    Restaurant,
+    Review,
+    Bookmark,
+    NaverImageCache,
+    CategoryCount,
+    RestaurantTrendingScore,
+    ReviewImage,
+)
 from geoalchemy2.elements import WKTElement
-from sqlalchemy import func, cast  # cast 추가
+from sqlalchemy import Float, func, cast, and_, or_, literal  # cast 추가
 from geoalchemy2 import Geography  # Geography 추가
 from sqlalchemy import desc
+from sqlalchemy import text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from app.core import conditional
 
 
 def get_restaurant_by_kakao_id(db: Session, kakao_place_id: str):
@@ -13,6 +24,44 @@ def get_restaurant_by_kakao_id(db: Session, kakao_place_id: str):
     )
 
 
+# 카테고리 목록에서 뺄 일반적인 단어
+GENERIC_CATEGORY_PARTS = ("음식점", "식당")
+
+
+def split_category(category: str) -> list[str]:
+    """
+    카카오 원본 카테고리(category_name)를 단계별 이름 목록으로 나눕니다. (중복/일반 단어 제외)
+    예: "음식점 > 한식 > 육류,고기" -> ["한식", "육류,고기"]
+    이미 단순화된 값("한식")을 넣으면 그 한 단계만 나옵니다.
+    """
+    if not category:
+        return []
+    parts = [part.strip() for part in category.split(">")]
+    return list(
+        dict.fromkeys(
+            part for part in parts if part and part not in GENERIC_CATEGORY_PARTS
+        )
+    )
+
+
+def _increment_category_counts(db: Session, categories: list[str]):
+    """식당 하나가 추가될 때 카테고리별 식당 수를 +1 합니다. (커밋은 호출한 쪽에서)"""
+    if not categories:
+        return
+    stmt = insert(CategoryCount).values(
+        [{"name": name, "restaurant_count": 1} for name in categories]
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CategoryCount.name],
+            set_={
+                "restaurant_count": CategoryCount.restaurant_count + 1,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
 def create_restaurant(
     db: Session,
     kakao_place_id: str,
@@ -26,7 +75,15 @@ def create_restaurant(
     lng: float,
     location_wkt: str,
     image_url: str = None,
+    categories: list[str] = None,
 ):
+    """
+    식당을 저장합니다.
+    category는 목록에 보여줄 대표 카테고리, categories는 필터/집계용 단계별 카테고리입니다.
+    (categories를 주지 않으면 category를 나눠서 사용)
+    """
+    if categories is None:
+        categories = split_category(category)
     db_item = Restaurant(
         kakao_place_id=kakao_place_id,
         name=name,
@@ -39,9 +96,13 @@ def create_restaurant(
         longitude=lng,
         location=WKTElement(location_wkt, srid=4326),
         image_url=image_url,
+        categories=categories,
     )
     db.add(db_item)
+    # 카테고리별 식당 수도 같은 트랜잭션에서 갱신
+    _increment_category_counts(db, db_item.categories)
     db.commit()
+    conditional.bump_data_version(db, conditional.RESTAURANTS_VERSION)
     db.refresh(db_item)
     return db_item
 
@@ -50,7 +111,7 @@ def get_nearby_restaurants_query(
     db: Session, lat: float, lng: float, radius: int = 1000, limit: int = 20
 ):
     """
-    DB에서 반경 내 식당과 평점 정보를 조회합니다.
+    DB에서 반경 내 식당과 평점 정보를 조회합니다. (평점/리뷰수는 식당 테이블의 집계 컬럼 사용)
     반환값: (Restaurant객체, 거리, 평점, 리뷰수) 튜플의 리스트
     """
     # 1. 내 위치 포인트 생성
@@ -66,108 +127,434 @@ def get_nearby_restaurants_query(
             Restaurant,
             # Geography 타입끼리 비교하면 자동으로 미터 단위 거리가 나옵니다.
             func.ST_Distance(Restaurant.location, user_geography).label("distance"),
-            func.coalesce(func.avg(Review.rating), 0.0).label("avg_rating"),
-            func.count(Review.id).label("review_count"),
+            Restaurant.avg_rating,
+            Restaurant.review_count,
         )
-        .outerjoin(Review, Restaurant.id == Review.restaurant_id)
         .filter(
             # "내 위치에서 radius 미터 안에 있는가?"를 인덱스를 타서 검색합니다.
             func.ST_DWithin(Restaurant.location, user_geography, radius)
         )
-        .group_by(Restaurant.id)
         .order_by("distance")
         .limit(limit)
         .all()
     )
 
 
-def get_restaurant_with_stats(db: Session, restaurant_id: int):
-    return (
-        db.query(
-            Restaurant,
-            # 1. 평균 별점: 리뷰가 없으면 NULL이 나오므로 0.0으로 변환
-            func.coalesce(func.avg(Review.rating), 0.0).label("avg_rating"),
-            # 2. 리뷰 개수: Review.id를 카운트
-            func.count(Review.id).label("review_count"),
-        )
-        .outerjoin(
-            # 식당에 리뷰가 하나도 없어도 식당 정보는 나와야 하므로 outerjoin 사용
-            Review,
-            Restaurant.id == Review.restaurant_id,
+NEARBY_WITH_PREVIEWS_SQL = text("""
+    SELECT r.id, r.name, r.category, r.latitude, r.longitude,
+           r.road_address, r.address, r.phone, r.place_url, r.image_url,
+           r.distance, r.avg_rating, r.review_count,
+           COALESCE(imgs.images, '[]'::json) AS images,
+           preview.preview_text AS review_preview,
+           (bm.id IS NOT NULL) AS is_bookmarked
+    FROM (
+        -- 1. 가까운 순 limit개를 먼저 자른 뒤에만 리뷰를 붙입니다.
+        SELECT restaurants.*, ST_Distance(restaurants.location, me.g) AS distance
+        FROM restaurants,
+             (SELECT ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography AS g) AS me
+        WHERE ST_DWithin(restaurants.location, me.g, :radius)
+        ORDER BY distance
+        LIMIT :limit
+    ) AS r
+    -- 2. 사진이 있는 최신 리뷰 2개 (이미지 목록, 내용)
+    LEFT JOIN LATERAL (
+        SELECT array_agg(rv.images ORDER BY rv.created_at DESC) AS images_list,
+               array_agg(rv.content ORDER BY rv.created_at DESC) AS contents
+        FROM (
+            SELECT images, content, created_at
+            FROM reviews
+            WHERE reviews.restaurant_id = r.id AND reviews.images IS NOT NULL
+            ORDER BY created_at DESC
+            LIMIT 2
+        ) AS rv
+    ) AS recent ON true
+    -- 3. 그 리뷰들의 사진을 순서대로 펼쳐 앞의 2장만
+    LEFT JOIN LATERAL (
+        SELECT json_agg(e.img ORDER BY e.ord, e.n) AS images
+        FROM (
+            SELECT list.ord, elem.n, elem.img
+            FROM unnest(recent.images_list) WITH ORDINALITY AS list(images, ord),
+                 json_array_elements(
+                     CASE WHEN json_typeof(list.images) = 'array'
+                          THEN list.images ELSE '[]'::json END
+                 ) WITH ORDINALITY AS elem(img, n)
+            ORDER BY list.ord, elem.n
+            LIMIT 2
+        ) AS e
+    ) AS imgs ON true
+    -- 4. 가장 최신 리뷰 내용을 50자로 잘라서
+    LEFT JOIN LATERAL (
+        SELECT CASE WHEN char_length(c.content) > 50
+                    THEN left(c.content, 50) || '...'
+                    ELSE c.content END AS preview_text
+        FROM unnest(recent.contents) WITH ORDINALITY AS c(content, ord)
+        WHERE c.content <> ''
+        ORDER BY c.ord
+        LIMIT 1
+    ) AS preview ON true
+    -- 5. 북마크 여부 (user_id가 NULL이면 항상 false)
+    LEFT JOIN bookmarks AS bm
+        ON bm.restaurant_id = r.id AND bm.user_id = :user_id
+    ORDER BY r.distance
+    """)
+
+
+def get_nearby_restaurants_with_previews(
+    db: Session,
+    lat: float,
+    lng: float,
+    radius: float,
+    limit: int = 20,
+    user_id: int = None,
+):
+    """
+    [성능 최적화] 주변 식당 + 리뷰 사진 2장 + 50자 미리보기 + 북마크 여부를 쿼리 1번으로 조회합니다.
+    (원격 DB에서는 왕복 횟수가 곧 지연 시간이므로 3번 -> 1번)
+    반환값: 컬럼 이름으로 접근 가능한 Row 리스트 (distance는 반올림 전 값)
+    """
+    return db.execute(
+        NEARBY_WITH_PREVIEWS_SQL,
+        {
+            "lat": lat,
+            "lng": lng,
+            "radius": radius,
+            "limit": limit,
+            "user_id": user_id,
+        },
+    ).all()
+
+
+def get_restaurants_by_ids(db: Session, restaurant_ids: list[int]) -> dict:
+    """식당 ID 목록을 한 번에 조회합니다. 반환값: {restaurant_id: Restaurant}"""
+    if not restaurant_ids:
+        return {}
+    rows = db.query(Restaurant).filter(Restaurant.id.in_(restaurant_ids)).all()
+    return {row.id: row for row in rows}
+
+
+def get_restaurant_points_changed_since(db: Session, since=None):
+    """
+    메모리 공간 인덱스 적재용: 좌표와 평점만 가볍게 조회합니다.
+    since가 있으면 그 이후 등록/수정된 식당만 반환합니다. (증분 갱신)
+    반환값: (id, 위도, 경도, 평점, 리뷰수, 변경 시각) 튜플의 리스트
+    """
+    changed_at = func.coalesce(Restaurant.updated_at, Restaurant.created_at)
+    query = db.query(
+        Restaurant.id,
+        Restaurant.latitude,
+        Restaurant.longitude,
+        Restaurant.avg_rating,
+        Restaurant.review_count,
+        changed_at.label("changed_at"),
+    )
+    if since is not None:
+        query = query.filter(changed_at >= since)
+    return query.all()
+
+
+def get_nearby_restaurants_knn(
+    db: Session,
+    lat: float,
+    lng: float,
+    limit: int,
+    after_distance: float = None,
+    after_id: int = None,
+    radius: int = None,
+):
+    """
+    가까운 순(KNN) 조회: location <-> 내 위치 정렬은 GiST 인덱스를 타므로
+    반경 안 전체를 정렬하지 않고 가까운 것부터 limit개만 읽습니다.
+    after_distance/after_id를 주면 그 다음(더 먼) 식당부터 이어서 조회합니다. (커서 페이징)
+    반환값: (Restaurant객체, 거리, 평점, 리뷰수) 튜플의 리스트
+    """
+    user_location_shape = WKTElement(f"POINT({lng} {lat})", srid=4326)
+    user_geography = cast(user_location_shape, Geography(srid=4326))
+    # geography <-> geography: 구(sphere) 기준 미터 거리
+    knn_distance = Restaurant.location.op("<->", return_type=Float)(user_geography)
+
+    query = db.query(
+        Restaurant,
+        knn_distance.label("distance"),
+        Restaurant.avg_rating,
+        Restaurant.review_count,
+    )
+    if radius is not None:
+        query = query.filter(
+            func.ST_DWithin(Restaurant.location, user_geography, radius)
         )
-        .filter(Restaurant.id == restaurant_id)
-        .group_by(
-            # 집계 함수(avg, count)를 제외한 나머지 컬럼으로 그룹화
-            Restaurant.id
+    if after_distance is not None:
+        # 거리가 같으면 id로 순서를 정해 중복/누락 없이 이어갑니다.
+        query = query.filter(
+            or_(
+                knn_distance > after_distance,
+                and_(knn_distance == after_distance, Restaurant.id > after_id),
+            )
         )
-        .first()
+
+    return query.order_by(knn_distance, Restaurant.id).limit(limit).all()
+
+
+# 이보다 넓은 상자는 geography 인덱스 조건을 쓰지 않습니다. (줌 2 이하 타일)
+# geography의 변은 대원호라서, 줌 0 타일(-180~180)은 서/동 변이 같은 날짜변경선 위에 놓여
+# 넓이가 0이 되고, 줌 1 타일(폭 180도)은 변의 양 끝이 대척점이라 방향이 정해지지 않습니다.
+GEOGRAPHY_BBOX_MAX_DEGREES = 45.0
+
+
+def _bbox_filter(west: float, south: float, east: float, north: float):
+    """
+    경계 상자 안(서/남 포함, 동/북 미포함)의 식당 조건
+    - location && 상자: GiST 인덱스로 후보를 좁히고 (넓은 상자는 생략)
+    - 위도/경도 비교: 이웃 타일과 겹치지 않게 정확히 자릅니다.
+    """
+    conditions = [
+        Restaurant.latitude >= south,
+        Restaurant.latitude < north,
+        Restaurant.longitude >= west,
+        Restaurant.longitude < east,
+    ]
+    if max(east - west, north - south) > GEOGRAPHY_BBOX_MAX_DEGREES:
+        return and_(*conditions)
+
+    envelope = cast(
+        func.ST_MakeEnvelope(west, south, east, north, 4326), Geography(srid=4326)
     )
+    return and_(Restaurant.location.op("&&")(envelope), *conditions)
 
 
-def get_restaurant_images(db: Session, restaurant_id: int, limit: int) -> list[str]:
+def get_restaurant_grid_clusters(
+    db: Session, west: float, south: float, east: float, north: float, grid: int
+):
     """
-    특정 식당의 리뷰들 중에서 이미지가 있는 것들만 최신순으로 가져와서
-    URL 리스트로 평탄화(Flatten)하여 반환합니다.
+    경계 상자를 grid x grid 칸으로 나누어 칸별 식당 수, 평균 좌표, 평점 합계를 집계합니다.
+    반환값: (칸 x, 칸 y, 식당 수, 평균 위도, 평균 경도, 별점 합계, 리뷰 수) 튜플의 리스트
     """
-    # 1. 이미지가 포함된 리뷰만 최신순으로 조회
-    # (사진 1장에 리뷰 1개가 아니라, 리뷰 1개에 사진이 여러 장일 수 있으므로 넉넉하게 limit * 2만큼 조회)
-    reviews = (
-        db.query(Review)
-        .filter(
-            Review.restaurant_id == restaurant_id,
-            Review.images.isnot(None),  # NULL 제외
+    cell_x = func.least(
+        func.floor((Restaurant.longitude - west) / ((east - west) / grid)), grid - 1
+    )
+    cell_y = func.least(
+        func.floor((Restaurant.latitude - south) / ((north - south) / grid)), grid - 1
+    )
+    return (
+        db.query(
+            cell_x.label("cell_x"),
+            cell_y.label("cell_y"),
+            func.count(Restaurant.id),
+            func.avg(Restaurant.latitude),
+            func.avg(Restaurant.longitude),
+            func.sum(Restaurant.rating_sum),
+            func.sum(Restaurant.review_count),
         )
-        .order_by(desc(Review.created_at))
-        .limit(limit * 2)
+        .filter(_bbox_filter(west, south, east, north))
+        .group_by("cell_x", "cell_y")
         .all()
     )
 
-    collected_images = []
 
-    for review in reviews:
-        # review.images는 ["url1", "url2"] 형태의 리스트라고 가정
-        if review.images:
-            # 리스트를 풀어서 하나씩 추가 (extend)
-            collected_images.extend(review.images)
+def get_restaurants_in_bbox(
+    db: Session, west: float, south: float, east: float, north: float, limit: int
+):
+    """경계 상자 안의 식당을 평점 높은 순으로 최대 limit개 조회합니다."""
+    return (
+        db.query(Restaurant)
+        .filter(_bbox_filter(west, south, east, north))
+        .order_by(desc(Restaurant.avg_rating), Restaurant.id)
+        .limit(limit)
+        .all()
+    )
 
-        # 목표 개수(limit)를 채우면 즉시 중단 (성능 최적화)
-        if len(collected_images) >= limit:
-            break
 
-    # 정확히 limit 개수만큼만 잘라서 반환
-    return collected_images[:limit]
+# PostGIS 3.1 이상 필요 (ST_TileEnvelope의 margin 인자)
+MVT_TILE_SQL = text("""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS tile,
+               ST_TileEnvelope(:z, :x, :y, margin => :margin) AS area
+    ),
+    features AS (
+        SELECT ST_AsMVTGeom(
+                   ST_Transform(r.location::geometry, 3857),
+                   bounds.tile, :extent, :buffer, true
+               ) AS geom,
+               r.id,
+               r.name,
+               r.category,
+               round(r.avg_rating::numeric, 1)::float8 AS rating
+        FROM restaurants AS r, bounds
+        WHERE r.location && ST_Transform(bounds.area, 4326)::geography
+        ORDER BY r.avg_rating DESC, r.id
+        LIMIT :limit
+    )
+    SELECT ST_AsMVT(features, 'restaurants', :extent, 'geom') FROM features
+    """)
 
 
-def get_latest_images_for_restaurants(
-    db: Session, restaurant_ids: list[int], limit_per_restaurant: int = 2
+def get_restaurant_mvt_tile(
+    db: Session, z: int, x: int, y: int, extent: int, buffer: int, limit: int
+) -> bytes:
+    """
+    식당 위치를 Mapbox 벡터 타일(MVT) 바이너리로 만듭니다.
+    레이어 이름은 "restaurants", 속성은 id / name / category / rating만 담습니다.
+    """
+    tile = db.execute(
+        MVT_TILE_SQL,
+        {
+            "z": z,
+            "x": x,
+            "y": y,
+            "extent": extent,
+            "buffer": buffer,
+            "margin": buffer / extent,
+            "limit": limit,
+        },
+    ).scalar()
+    return bytes(tile) if tile else b""
+
+
+def search_restaurants_local(
+    db: Session, keywords: list[str], category_keywords: list[str], limit: int
 ):
     """
-    [성능 최적화] 각 식당별로 이미지가 있는 최신 리뷰를 딱 N개씩만 가져옵니다.
+    DB에 저장된 식당을 이름/주소 trigram 유사도로 검색합니다. (pg_trgm GIN 인덱스 사용)
+    - keywords: 모든 단어가 이름/지번 주소/도로명 주소 중 하나와 비슷해야 함 (AND)
+    - category_keywords: 카테고리(또는 이름)에 포함되어야 함 (예: "카페", "한식")
+    반환값: (Restaurant객체, 검색 점수, 평점, 리뷰수) 튜플의 리스트
     """
-    if not restaurant_ids:
+    if not keywords:
         return []
 
-    # 1. Subquery: 각 식당별로(partition_by) 최신순 번호(rn)를 매김
-    subquery = (
+    conditions = []
+    score = literal(0.0)
+    for keyword in keywords:
+        # keyword <% column : 단어 단위 유사도(word_similarity)가 임계값 이상 (인덱스 사용)
+        conditions.append(
+            or_(
+                literal(keyword).op("<%")(Restaurant.name),
+                literal(keyword).op("<%")(Restaurant.address),
+                literal(keyword).op("<%")(Restaurant.road_address),
+            )
+        )
+        # 이름이 맞는 경우를 주소가 맞는 경우보다 높게 평가
+        score = score + func.greatest(
+            func.word_similarity(keyword, Restaurant.name),
+            func.word_similarity(keyword, Restaurant.address) * 0.8,
+            func.word_similarity(keyword, Restaurant.road_address) * 0.8,
+        )
+
+    for keyword in category_keywords:
+        conditions.append(
+            or_(
+                Restaurant.category.ilike(f"%{keyword}%"),
+                Restaurant.name.ilike(f"%{keyword}%"),
+            )
+        )
+
+    return (
         db.query(
-            Review.restaurant_id,
-            Review.images,
-            func.row_number()
-            .over(partition_by=Review.restaurant_id, order_by=desc(Review.created_at))
-            .label("rn"),
+            Restaurant,
+            score.label("score"),
+            Restaurant.avg_rating,
+            Restaurant.review_count,
         )
-        .filter(Review.restaurant_id.in_(restaurant_ids), Review.images.isnot(None))
-        .subquery()
+        .filter(and_(*conditions))
+        # 검색 점수가 같으면 평점 -> 리뷰 많은 순
+        .order_by(
+            desc("score"), desc(Restaurant.avg_rating), desc(Restaurant.review_count)
+        )
+        .limit(limit)
+        .all()
+    )
+
+
+def get_restaurant_stats_by_kakao_ids(db: Session, kakao_place_ids: list[str]):
+    """
+    카카오 장소 ID 목록 중 DB에 저장된 식당의 (ID, 평점, 리뷰수)를 조회합니다.
+    반환값: {kakao_place_id: (restaurant_id, avg_rating, review_count)}
+    """
+    if not kakao_place_ids:
+        return {}
+
+    rows = (
+        db.query(
+            Restaurant.kakao_place_id,
+            Restaurant.id,
+            Restaurant.avg_rating,
+            Restaurant.review_count,
+        )
+        .filter(Restaurant.kakao_place_id.in_(kakao_place_ids))
+        .all()
     )
+    return {kakao_id: (r_id, avg, count) for kakao_id, r_id, avg, count in rows}
 
-    # 2. Main Query: 번호(rn)가 limit_per_restaurant 이하인 것만 필터링
-    results = (
-        db.query(subquery.c.restaurant_id, subquery.c.images)
-        .filter(subquery.c.rn <= limit_per_restaurant)
+
+def get_restaurant_validators(db: Session, restaurant_id: int):
+    """상세 응답의 ETag/Last-Modified용 값만 조회합니다. (updated_at, created_at, 리뷰수)"""
+    return (
+        db.query(Restaurant.updated_at, Restaurant.created_at, Restaurant.review_count)
+        .filter(Restaurant.id == restaurant_id)
+        .first()
+    )
+
+
+def get_restaurant_with_stats(db: Session, restaurant_id: int):
+    return (
+        # 평균 별점/리뷰 개수는 리뷰 작성 시 갱신되는 집계 컬럼을 그대로 읽습니다.
+        db.query(Restaurant, Restaurant.avg_rating, Restaurant.review_count)
+        .filter(Restaurant.id == restaurant_id)
+        .first()
+    )
+
+
+# 식당 사진 최신순 (ix_review_images_restaurant_created 인덱스와 같은 순서)
+REVIEW_IMAGE_ORDER = (
+    ReviewImage.created_at.desc(),
+    ReviewImage.review_id.desc(),
+    ReviewImage.position,
+)
+
+
+def get_restaurant_images(db: Session, restaurant_id: int, limit: int) -> list[str]:
+    """
+    특정 식당의 리뷰 사진 URL을 최신순으로 limit개 반환합니다.
+    (review_images 인덱스 범위 조회, URL만 읽음)
+    """
+    rows = (
+        db.query(ReviewImage.url)
+        .filter(ReviewImage.restaurant_id == restaurant_id)
+        .order_by(*REVIEW_IMAGE_ORDER)
+        .limit(limit)
         .all()
     )
+    return [url for (url,) in rows]
+
+
+# 식당마다 인덱스에서 가장 최근 사진 1장만 읽습니다. (LATERAL + LIMIT 1)
+THUMBNAILS_SQL = text("""
+    SELECT r.id AS restaurant_id, t.url
+    FROM unnest(CAST(:restaurant_ids AS integer[])) AS r(id)
+    CROSS JOIN LATERAL (
+        SELECT url
+        FROM review_images
+        WHERE review_images.restaurant_id = r.id
+        ORDER BY created_at DESC, review_id DESC, position
+        LIMIT 1
+    ) AS t
+    """)
+
+
+def get_thumbnails_for_restaurants(
+    db: Session, restaurant_ids: list[int]
+) -> dict[int, str]:
+    """
+    [성능 최적화] 식당별 가장 최근 리뷰 사진 1장 ({식당 ID: URL}, 사진 없는 식당은 빠짐)
+    """
+    if not restaurant_ids:
+        return {}
+    rows = db.execute(THUMBNAILS_SQL, {"restaurant_ids": list(restaurant_ids)})
+    return {restaurant_id: url for restaurant_id, url in rows}
+
 
-    return results
+# 최신 등록순 정렬 (ix_restaurants_created_at_id 인덱스와 같은 순서)
+# 등록일이 같으면 id로 순서를 고정해야 커서 페이징에서 빠지거나 겹치는 식당이 없습니다.
+LATEST_ORDER = (Restaurant.created_at.desc(), Restaurant.id.desc())
 
 
 def get_restaurants_by_latest(
@@ -178,112 +565,332 @@ def get_restaurants_by_latest(
     평점과 리뷰 수도 함께 반환합니다.
     카테고리 필터링 옵션 추가.
     """
-    query = db.query(
-        Restaurant,
-        func.coalesce(func.avg(Review.rating), 0.0).label("avg_rating"),
-        func.count(Review.id).label("review_count"),
-    ).outerjoin(Review, Restaurant.id == Review.restaurant_id)
+    query = db.query(Restaurant, Restaurant.avg_rating, Restaurant.review_count)
 
     # 카테고리 필터링 (카카오맵 카테고리 기준)
     if category:
-        # 카테고리가 포함된 식당 필터링 (부분 일치)
-        query = query.filter(Restaurant.category.ilike(f"%{category}%"))
+        # 카테고리 단계 중 하나와 일치하는 식당 (GIN 인덱스 사용)
+        query = query.filter(Restaurant.categories.contains([category.strip()]))
 
     return (
-        query.group_by(Restaurant.id)
-        .order_by(desc(Restaurant.created_at))  # 최신 등록순
+        query.order_by(*LATEST_ORDER)  # 최신 등록순
         .offset(skip)
         .limit(limit)
         .all()
     )
 
 
-def get_restaurant_thumbnail(db: Session, restaurant_id: int) -> str:
+def get_restaurants_by_latest_after(
+    db: Session,
+    limit: int = 20,
+    category: str = None,
+    after_created_at=None,
+    after_id: int = None,
+):
     """
-    특정 식당의 첫 번째 이미지를 썸네일로 반환합니다.
+    최신 등록순 목록에서 (after_created_at, after_id) 다음 식당부터 limit개를 조회합니다.
+    OFFSET 없이 인덱스에서 바로 이어 읽으므로 깊은 페이지도 첫 페이지와 속도가 같습니다.
     """
-    review = (
-        db.query(Review)
-        .filter(
-            Review.restaurant_id == restaurant_id,
-            Review.images.isnot(None),
+    query = db.query(Restaurant, Restaurant.avg_rating, Restaurant.review_count)
+
+    if category:
+        query = query.filter(Restaurant.categories.contains([category.strip()]))
+
+    if after_id is not None:
+        # created_at은 NOT NULL이므로 행 비교 하나가 그대로 인덱스 범위 조건이 됩니다.
+        query = query.filter(
+            tuple_(Restaurant.created_at, Restaurant.id)
+            < tuple_(after_created_at, after_id)
         )
-        .order_by(desc(Review.created_at))
-        .first()
-    )
 
-    if review and review.images and len(review.images) > 0:
-        return review.images[0]
-    return None
+    return query.order_by(*LATEST_ORDER).limit(limit).all()
+
+
+def get_restaurant_thumbnail(db: Session, restaurant_id: int) -> str:
+    """
+    특정 식당의 첫 번째 이미지를 썸네일로 반환합니다.
+    """
+    images = get_restaurant_images(db, restaurant_id, limit=1)
+    return images[0] if images else None
 
 
 def get_available_categories(db: Session):
     """
-    DB에 등록된 식당들의 카테고리 목록을 조회합니다.
-    카카오맵 기준 카테고리들을 중복 제거하여 반환합니다.
+    DB에 등록된 식당들의 카테고리 목록을 식당 수와 함께 조회합니다.
+    식당 저장 시 미리 집계해둔 category_counts 테이블만 읽습니다.
+    반환값: [(카테고리, 식당 수), ...] (이름순)
     """
-    categories = (
-        db.query(Restaurant.category)
-        .filter(Restaurant.category.isnot(None))
-        .distinct()
+    return (
+        db.query(CategoryCount.name, CategoryCount.restaurant_count)
+        .filter(CategoryCount.restaurant_count > 0)
+        .order_by(CategoryCount.name)
         .all()
     )
 
-    # 카테고리를 파싱하여 주요 카테고리만 추출
-    category_set = set()
-    for (category,) in categories:
-        if category:
-            # "음식점 > 한식 > 육류,고기" -> ["음식점", "한식", "육류,고기"]
-            parts = [part.strip() for part in category.split(">")]
-            for part in parts:
-                if part and part not in ["음식점", "식당"]:  # 일반적인 단어 제외
-                    category_set.add(part)
 
-    return sorted(list(category_set))
+def rebuild_category_counts(db: Session) -> int:
+    """
+    식당 테이블의 categories 기준으로 category_counts를 처음부터 다시 계산합니다.
+    저장된 카테고리 수를 반환합니다.
+    """
+    db.execute(text("DELETE FROM category_counts"))
+    result = db.execute(
+        text(
+            """
+            INSERT INTO category_counts (name, restaurant_count)
+            SELECT c.name, COUNT(*)
+            FROM restaurants AS r, unnest(r.categories) AS c(name)
+            GROUP BY c.name
+            """
+        )
+    )
+    db.commit()
+    conditional.bump_data_version(db, conditional.RESTAURANTS_VERSION)
+    return result.rowcount
+
+
+# 인기 점수 forward decay 기준 시각 (2026-01-01 00:00 UTC, 바꾸면 전체 재계산 필요)
+TRENDING_EPOCH = 1767225600
+
+# 쌓인 활동 기록을 지우면서(커밋된 것만, 다른 워커가 잡은 행은 건너뜀) 식당별 점수에 더합니다.
+# 반환: (반영한 활동 수, 점수가 바뀐 식당 수)
+TRENDING_REFRESH_SQL = text("""
+    WITH consumed AS (
+        DELETE FROM trending_events
+        WHERE id IN (
+            SELECT id FROM trending_events
+            ORDER BY id
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING restaurant_id, kind, sign, occurred_at
+    ),
+    applied AS (
+        INSERT INTO restaurant_trending_scores (restaurant_id, score, updated_at)
+        SELECT c.restaurant_id,
+               SUM(
+                   c.sign
+                   * CASE c.kind
+                         WHEN 'bookmark' THEN CAST(:bookmark_weight AS float8)
+                         ELSE CAST(:review_weight AS float8)
+                     END
+                   * power(
+                         2.0,
+                         (extract(epoch FROM c.occurred_at) - :epoch) / :half_life_seconds
+                     )
+               ),
+               now()
+        FROM consumed AS c
+        GROUP BY c.restaurant_id
+        ON CONFLICT (restaurant_id) DO UPDATE
+        SET score = restaurant_trending_scores.score + EXCLUDED.score,
+            updated_at = now()
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM consumed), (SELECT COUNT(*) FROM applied)
+    """)
+
+# 현재 남아 있는 북마크/리뷰 전체로 점수를 다시 계산합니다.
+# 같은 문장(같은 스냅샷)에서 활동 기록을 비우므로, 이미 센 활동이 나중에 또 더해지지 않습니다.
+TRENDING_REBUILD_SQL = text("""
+    WITH cleared AS (
+        DELETE FROM trending_events
+    )
+    INSERT INTO restaurant_trending_scores (restaurant_id, score, updated_at)
+    SELECT e.restaurant_id,
+           SUM(
+               e.weight * power(
+                   2.0,
+                   (extract(epoch FROM e.created_at) - :epoch) / :half_life_seconds
+               )
+           ),
+           now()
+    FROM (
+        SELECT restaurant_id,
+               COALESCE(created_at, LOCALTIMESTAMP) AS created_at,
+               CAST(:bookmark_weight AS float8) AS weight
+        FROM bookmarks
+        UNION ALL
+        SELECT restaurant_id,
+               COALESCE(created_at, LOCALTIMESTAMP),
+               CAST(:review_weight AS float8)
+        FROM reviews
+        WHERE restaurant_id IS NOT NULL
+    ) AS e
+    GROUP BY e.restaurant_id
+    """)
+
+
+def refresh_trending_scores(
+    db: Session,
+    half_life_seconds: float,
+    bookmark_weight: float,
+    review_weight: float,
+    batch_size: int = 10000,
+) -> int:
+    """
+    쌓인 활동 기록(trending_events)을 인기 점수에 반영하고, 점수가 바뀐 식당 수를 반환합니다.
+    - 기록은 활동과 같은 트랜잭션에서 쌓이므로 늦게 커밋된 활동도 다음 갱신에서 빠짐없이 반영됩니다.
+    - 반영한 기록은 지우고, 다른 워커가 잡은 기록은 건너뛰므로 같은 활동을 두 번 더하지 않습니다.
+    - 점수가 하나도 없으면(처음 실행) 전체 북마크/리뷰로 다시 계산합니다.
+    """
+    if db.query(RestaurantTrendingScore.restaurant_id).first() is None:
+        return rebuild_trending_scores(
+            db, half_life_seconds, bookmark_weight, review_weight
+        )
+
+    params = {
+        "epoch": TRENDING_EPOCH,
+        "half_life_seconds": half_life_seconds,
+        "bookmark_weight": bookmark_weight,
+        "review_weight": review_weight,
+        "batch_size": batch_size,
+    }
+    updated = 0
+    while True:
+        events, restaurants = db.execute(TRENDING_REFRESH_SQL, params).one()
+        db.commit()
+        if restaurants:
+            conditional.bump_data_version(db, conditional.TRENDING_VERSION)
+        updated += restaurants
+        if events < batch_size:
+            return updated
+
+
+def rebuild_trending_scores(
+    db: Session,
+    half_life_seconds: float,
+    bookmark_weight: float,
+    review_weight: float,
+) -> int:
+    """
+    인기 점수를 현재 북마크/리뷰 전체로 처음부터 다시 계산합니다. (반감기/가중치 변경 시)
+    점수가 있는 식당 수를 반환합니다.
+    """
+    # 증분 갱신과 섞이지 않도록 점수 테이블 쓰기를 막습니다. (조회는 계속 가능)
+    db.execute(
+        text("LOCK TABLE restaurant_trending_scores IN SHARE ROW EXCLUSIVE MODE")
+    )
+    db.query(RestaurantTrendingScore).delete(synchronize_session=False)
+    result = db.execute(
+        TRENDING_REBUILD_SQL,
+        {
+            "epoch": TRENDING_EPOCH,
+            "half_life_seconds": half_life_seconds,
+            "bookmark_weight": bookmark_weight,
+            "review_weight": review_weight,
+        },
+    )
+    db.commit()
+    conditional.bump_data_version(db, conditional.TRENDING_VERSION)
+    return result.rowcount
 
 
 def get_trending_restaurants(db: Session, limit: int = 10):
     """
-    북마크(찜) 개수가 가장 많은 순서대로 식당을 가져옵니다.
+    인기 점수가 높은 순서대로 식당을 가져옵니다. (점수 인덱스에서 상위 limit개만 읽음)
+    반환값: (Restaurant객체, 누적 점수) 튜플의 리스트
     """
-    # Query: 식당 정보(Restaurant)와 북마크 갯수(Count)를 같이 조회
-    results = (
-        db.query(Restaurant, func.count(Bookmark.id).label("bookmark_count"))
-        .outerjoin(Bookmark, Restaurant.id == Bookmark.restaurant_id)
-        .group_by(Restaurant.id)
-        .order_by(func.count(Bookmark.id).desc())  # 내림차순 정렬
+    return (
+        db.query(Restaurant, RestaurantTrendingScore.score)
+        .join(
+            RestaurantTrendingScore,
+            Restaurant.id == RestaurantTrendingScore.restaurant_id,
+        )
+        .order_by(RestaurantTrendingScore.score.desc())
         .limit(limit)
         .all()
     )
 
-    # 응답 스키마(RestaurantTrendingResponse)에 맞게 데이터 조립
-    trending_list = []
-    for restaurant, b_count in results:
-        # SQLAlchemy 모델 객체에 동적으로 속성을 추가해서 넘겨줍니다.
-        restaurant.bookmark_count = b_count
-        trending_list.append(restaurant)
 
-    return trending_list
+def get_bookmark_counts(db: Session, restaurant_ids: list[int]) -> dict[int, int]:
+    """주어진 식당들의 북마크 개수 ({식당 ID: 개수}, 북마크가 없으면 빠짐)"""
+    if not restaurant_ids:
+        return {}
+    rows = (
+        db.query(Bookmark.restaurant_id, func.count(Bookmark.id))
+        .filter(Bookmark.restaurant_id.in_(restaurant_ids))
+        .group_by(Bookmark.restaurant_id)
+        .all()
+    )
+    return {restaurant_id: count for restaurant_id, count in rows}
 
 
-def get_bookmarked_restaurant_ids(
-    db: Session, user_id: int, restaurant_ids: list[int]
-) -> set[int]:
+def get_naver_image_cache_entries(
+    db: Session, kakao_place_ids: list[str]
+) -> dict[str, NaverImageCache]:
     """
-    주어진 식당 ID 리스트 중, 특정 유저가 북마크한 식당 ID만 추출하여 Set으로 반환합니다.
+    카카오 장소 ID 목록에 해당하는 네이버 이미지 캐시를 한 번에 조회합니다.
+    반환값: {kakao_place_id: NaverImageCache}
     """
-    if not restaurant_ids or not user_id:
-        return set()
+    if not kakao_place_ids:
+        return {}
 
-    # SELECT restaurant_id FROM bookmarks WHERE user_id = ? AND restaurant_id IN (?, ?, ...)
-    bookmarks = (
-        db.query(Bookmark.restaurant_id)
-        .filter(
-            Bookmark.user_id == user_id,
-            Bookmark.restaurant_id.in_(restaurant_ids),
-        )
+    rows = (
+        db.query(NaverImageCache)
+        .filter(NaverImageCache.kakao_place_id.in_(kakao_place_ids))
         .all()
     )
+    return {row.kakao_place_id: row for row in rows}
+
+
+def upsert_naver_image_cache(db: Session, images: dict[str, str | None]):
+    """
+    네이버 이미지 검색 결과를 저장합니다. (이미 있으면 이미지/갱신 시각을 덮어씀)
+    images: {kakao_place_id: image_url 또는 None(이미지 없음)}
+    """
+    if not images:
+        return
+
+    stmt = insert(NaverImageCache).values(
+        [
+            {"kakao_place_id": place_id, "image_url": image_url}
+            for place_id, image_url in images.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[NaverImageCache.kakao_place_id],
+        set_={"image_url": stmt.excluded.image_url, "refreshed_at": func.now()},
+    )
+    db.execute(stmt)
+    db.commit()
+
+
+def reconcile_restaurant_rating_stats(db: Session) -> int:
+    """
+    리뷰 테이블을 다시 집계해서 식당의 rating_sum / review_count / avg_rating을 바로잡습니다.
+    값이 실제와 다른 식당만 갱신하고, 갱신된 식당 수를 반환합니다.
+    """
+    stats = (
+        db.query(
+            Restaurant.id.label("restaurant_id"),
+            func.coalesce(func.sum(Review.rating), 0).label("rating_sum"),
+            func.count(Review.id).label("review_count"),
+            func.coalesce(func.avg(Review.rating), 0.0).label("avg_rating"),
+        )
+        .outerjoin(Review, Restaurant.id == Review.restaurant_id)
+        .group_by(Restaurant.id)
+        .subquery()
+    )
 
-    # 빠르게 검색할 수 있도록 list 대신 set 형태로 반환 (예: {1, 4})
-    return {b[0] for b in bookmarks}
+    result = db.execute(
+        update(Restaurant)
+        .where(Restaurant.id == stats.c.restaurant_id)
+        .where(
+            or_(
+                Restaurant.rating_sum != stats.c.rating_sum,
+                Restaurant.review_count != stats.c.review_count,
+                func.abs(Restaurant.avg_rating - stats.c.avg_rating) > 1e-9,
+            )
+        )
+        .values(
+            rating_sum=stats.c.rating_sum,
+            review_count=stats.c.review_count,
+            avg_rating=stats.c.avg_rating,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if result.rowcount:
+        conditional.bump_data_version(db, conditional.RESTAURANTS_VERSION)
+    return result.rowcount
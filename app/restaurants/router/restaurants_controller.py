@@ -1,6 +1,10 @@
+import json
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.core import conditional
 from app.core.database import get_db
 from app.core.security import get_current_user_optional
 from app.models.models import User
@@ -11,23 +15,55 @@ router = APIRouter()
 
 
 @router.get("/search")
-async def search_restaurants(query: str):
+async def search_restaurants(
+    query: str,
+    display: int = Query(5, ge=1, le=30, description="가져올 개수 (최대 30개)"),
+):
     # 프론트엔드는 이 주소(GET /api/v1/restaurants/search?query=강남)를 호출
-    result = await service.search_restaurants_kakao(query)
+    result = await service.search_restaurants_kakao(query, display)
     return result
 
 
+@router.get("/search/stream")
+async def search_restaurants_stream(
+    query: str,
+    display: int = Query(5, ge=1, le=30, description="가져올 개수 (최대 30개)"),
+):
+    """
+    검색 결과를 NDJSON(한 줄에 JSON 1개)으로 스트리밍합니다.
+
+    - 첫 줄: {"type": "items", "total": N, "items": [...]} (이미지 없이 바로 전달)
+    - 이후: {"type": "image", "kakao_place_id": "...", "image_url": "..."} (썸네일이 준비되는 대로)
+    - 마지막: {"type": "done"}
+    """
+    events = await service.stream_search_restaurants(query, display)
+
+    async def ndjson():
+        async for event in events:
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @router.get("/categories")
-def get_categories(db: Session = Depends(get_db)):
+def get_categories(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     DB에 등록된 식당들의 카테고리 목록을 조회합니다.
-    카카오맵 기준 카테고리들을 반환합니다.
+    카카오맵 기준 카테고리들과 카테고리별 식당 수(counts)를 반환합니다.
     """
-    return {"categories": service.get_available_categories(db)}
+    etag, last_modified = service.get_list_validators(
+        db, "categories", (conditional.RESTAURANTS_VERSION,)
+    )
+    not_modified = conditional.evaluate(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    return service.get_available_categories(db)
 
 
 @router.get("/latest", response_model=List[schemas.RestaurantListResponse])
 def get_latest_restaurants(
+    request: Request,
+    response: Response,
     skip: int = Query(0, description="건너뛸 개수 (페이징)"),
     limit: int = Query(20, description="가져올 개수 (최대 50개)"),
     category: str = Query(
@@ -54,11 +90,54 @@ def get_latest_restaurants(
     if limit > 50:
         limit = 50
     user_id = current_user.id if current_user else None
+
+    # 바뀐 게 없으면 목록을 조립하지 않고 304
+    etag, last_modified = service.get_list_validators(
+        db, "latest", (conditional.RESTAURANTS_VERSION,), user_id=user_id
+    )
+    not_modified = conditional.evaluate(
+        request, response, etag, last_modified, private=bool(user_id)
+    )
+    if not_modified:
+        return not_modified
     return service.get_restaurants_latest(
         db, skip=skip, limit=limit, category=category, user_id=user_id
     )
 
 
+@router.get("/latest/page", response_model=schemas.RestaurantLatestPageResponse)
+def get_latest_restaurants_page(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=50, description="페이지 크기 (최대 50개)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    category: str = Query(
+        None,
+        description="카테고리 필터 (예: 한식, 중식, 일식, 양식, 카페, 치킨, 피자 등)",
+    ),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """
+    최근 등록된 순으로 식당 목록을 페이지 단위 조회 (무한 스크롤용)
+    - 첫 요청은 cursor 없이, 이후에는 응답의 next_cursor를 그대로 넘겨주세요.
+    - 다음 페이지도 같은 category로 요청해야 합니다.
+    """
+    user_id = current_user.id if current_user else None
+
+    etag, last_modified = service.get_list_validators(
+        db, "latest", (conditional.RESTAURANTS_VERSION,), user_id=user_id
+    )
+    not_modified = conditional.evaluate(
+        request, response, etag, last_modified, private=bool(user_id)
+    )
+    if not_modified:
+        return not_modified
+    return service.get_restaurants_latest_page(
+        db, limit=limit, cursor=cursor, category=category, user_id=user_id
+    )
+
+
 @router.get("/nearby", response_model=List[schemas.RestaurantNearbyResponse])
 def get_nearby_restaurants(
     lat: float = Query(..., description="사용자 현재 위도"),
@@ -76,24 +155,122 @@ def get_nearby_restaurants(
     )
 
 
+@router.get("/nearby/page", response_model=schemas.RestaurantNearbyPageResponse)
+def get_nearby_restaurants_page(
+    lat: float = Query(..., description="사용자 현재 위도"),
+    lng: float = Query(..., description="사용자 현재 경도"),
+    limit: int = Query(20, ge=1, le=50, description="페이지 크기 (최대 50개)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    radius: Optional[int] = Query(None, ge=1, description="검색 반경 (미터, 선택)"),
+    max_results: Optional[int] = Query(
+        None, ge=1, description="총 조회 개수 상한 (반경 대신 사용 가능)"
+    ),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """
+    내 주변 맛집을 가까운 순으로 페이지 단위 조회 (무한 스크롤용)
+    - 첫 요청은 cursor 없이, 이후에는 응답의 next_cursor를 그대로 넘겨주세요.
+    """
+    user_id = current_user.id if current_user else None
+    return service.get_nearby_restaurants_page(
+        db,
+        lat=lat,
+        lng=lng,
+        limit=limit,
+        cursor=cursor,
+        radius=radius,
+        max_results=max_results,
+        user_id=user_id,
+    )
+
+
+@router.get("/viewport", response_model=schemas.RestaurantViewportResponse)
+def get_restaurants_in_viewport(
+    min_lat: float = Query(..., ge=-90, le=90, description="화면 남쪽 위도"),
+    min_lng: float = Query(..., ge=-180, le=180, description="화면 서쪽 경도"),
+    max_lat: float = Query(..., ge=-90, le=90, description="화면 북쪽 위도"),
+    max_lng: float = Query(..., ge=-180, le=180, description="화면 동쪽 경도"),
+    zoom: int = Query(..., ge=0, le=22, description="지도 줌 레벨"),
+    db: Session = Depends(get_db),
+):
+    """
+    지도 화면 안의 맛집을 핀 또는 클러스터로 조회합니다.
+    - 식당이 적은 곳은 개별 핀(pins), 많은 곳은 묶음(clusters: 개수/중심 좌표/평균 별점)
+    - 클러스터를 누르면 중심 좌표로 확대해서 다시 호출하면 됩니다.
+    """
+    if min_lat >= max_lat or min_lng >= max_lng:
+        raise HTTPException(status_code=400, detail="화면 영역이 올바르지 않습니다.")
+    return service.get_restaurants_in_viewport(
+        db, min_lat, min_lng, max_lat, max_lng, zoom
+    )
+
+
+@router.get("/tiles/{z}/{x}/{y}.mvt")
+def get_restaurant_tile(
+    z: int,
+    x: int,
+    y: int,
+    db: Session = Depends(get_db),
+):
+    """
+    지도 렌더링용 식당 핀 벡터 타일 (Mapbox Vector Tile)
+    - 레이어: "restaurants" / 속성: id, name, category, rating
+    - 지원 줌 레벨: MVT_MIN_ZOOM ~ MVT_MAX_ZOOM
+    """
+    if not settings.MVT_MIN_ZOOM <= z <= settings.MVT_MAX_ZOOM:
+        raise HTTPException(status_code=404, detail="지원하지 않는 줌 레벨입니다.")
+    if not (0 <= x < 2**z and 0 <= y < 2**z):
+        raise HTTPException(status_code=404, detail="존재하지 않는 타일입니다.")
+
+    tile = service.get_restaurant_tile(db, z, x, y)
+    return Response(
+        content=tile,
+        media_type="application/vnd.mapbox-vector-tile",
+        headers={
+            "Cache-Control": f"public, max-age={int(settings.MVT_CACHE_TTL_SECONDS)}"
+        },
+    )
+
+
 @router.get("/trending", response_model=List[schemas.RestaurantTrendingResponse])
 def get_trending_restaurants(
+    request: Request,
+    response: Response,
     limit: int = Query(10, description="가져올 인기 식당 개수"),
     db: Session = Depends(get_db),
 ):
     """
-    요즘 뜨는 식당 리스트 (북마크가 가장 많은 순서)
+    요즘 뜨는 식당 리스트 (최근 북마크/리뷰가 많은 순서, 오래된 활동일수록 점수가 줄어듦)
     - 홈 화면 캐러셀(슬라이드) 용도로 사용하기 좋습니다.
     """
-    return service.get_trending_restaurants(db=db, limit=limit)
+    # 점수가 시간에 따라 줄어들므로 감쇠 기준 시각(구간)도 ETag에 넣습니다.
+    as_of = service.get_trending_as_of()
+    etag, last_modified = service.get_list_validators(
+        db,
+        "trending",
+        (conditional.TRENDING_VERSION, conditional.RESTAURANTS_VERSION),
+        as_of=as_of,
+    )
+    not_modified = conditional.evaluate(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    return service.get_trending_restaurants(db=db, limit=limit, as_of=as_of)
 
 
 @router.get("/{restaurant_id}", response_model=schemas.RestaurantDetailResponse)
 def get_restaurant_detail(
     restaurant_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     """
     식당 정보 + 최신 이미지 5장 + 맛보기 리뷰 3개를 한 번에 내려줍니다.
     """
+    etag, last_modified = service.get_restaurant_detail_validators(db, restaurant_id)
+    if etag:
+        not_modified = conditional.evaluate(request, response, etag, last_modified)
+        if not_modified:
+            return not_modified
     return service.get_restaurant_detail(db, restaurant_id)
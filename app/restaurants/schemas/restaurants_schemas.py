@@ -116,6 +116,40 @@ class RestaurantNearbyResponse(BaseModel):
         from_attributes = True
 
 
+# [지도 조회] 가까운 순 페이지 (커서 페이징)
+class RestaurantNearbyPageResponse(BaseModel):
+    items: List[RestaurantNearbyResponse] = []
+    next_cursor: Optional[str] = None  # 없으면 마지막 페이지
+
+
+# [지도 화면 조회] 개별 핀
+class RestaurantViewportPin(BaseModel):
+    id: int
+    name: str
+    category: Optional[str] = None
+    latitude: float
+    longitude: float
+    rating: float = 0.0
+    review_count: int = 0
+    image_url: Optional[str] = None
+
+
+# [지도 화면 조회] 여러 식당을 묶은 클러스터 (무게중심 좌표에 표시)
+class RestaurantViewportCluster(BaseModel):
+    id: str  # "zoom/x/y/칸x/칸y"
+    count: int
+    latitude: float
+    longitude: float
+    rating: float = 0.0  # 리뷰 수 가중 평균 별점
+
+
+class RestaurantViewportResponse(BaseModel):
+    zoom: int
+    total: int  # 화면(타일) 안 식당 수
+    pins: List[RestaurantViewportPin] = []
+    clusters: List[RestaurantViewportCluster] = []
+
+
 # [최신 등록순 조회] 최근 등록된 맛집 목록용
 class RestaurantListResponse(BaseModel):
     id: int
@@ -154,6 +188,7 @@ class RestaurantListResponse(BaseModel):
 # 기존 RestaurantBase를 상속받고 북마크 개수만 추가합니다.
 class RestaurantTrendingResponse(RestaurantBase):
     bookmark_count: int = 0
+    trending_score: float = 0.0  # 시간 감쇠가 적용된 인기 점수
     image_url: Optional[str] = None  # 👈 대표 이미지 1장 추가 (없으면 null)
     # (선택) 만약 별점과 리뷰 수도 필요하면 아래 주석을 해제하세요.
     # rating: float = 0.0
@@ -161,3 +196,9 @@ class RestaurantTrendingResponse(RestaurantBase):
 
     class Config:
         from_attributes = True
+
+
+# [최신 등록순] 커서 페이지
+class RestaurantLatestPageResponse(BaseModel):
+    items: List[RestaurantListResponse] = []
+    next_cursor: Optional[str] = None  # 없으면 마지막 페이지
@@ -1,4 +1,8 @@
 import asyncio
+import functools
+import math
+import unicodedata
+from datetime import datetime, timedelta, timezone
 
 import httpx
 from fastapi import HTTPException
@@ -6,14 +10,147 @@ from app.config.config import settings  # .env에서 키 가져오기
 from sqlalchemy.orm import Session
 from app.restaurants.schemas import restaurants_schemas as schemas
 from app.restaurants.crud import restaurants_crud as crud
+from app.core.http_client import http_clients
+from app.core.cache import TTLCache
+from app.core.tile_cache import DiskTileCache
+from app.core import conditional, geo
+from app.core.cursor import decode_cursor, encode_cursor
+from app.core.spatial_index import NUMPY_AVAILABLE, SpatialIndex
+from app.core import metrics
+from app.core.fanout import FanoutExecutor, ThrottledError, TokenBucket
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.singleflight import SingleFlight
+from app.core.database import SessionLocal
+from app.logging import logger
 
 from app.reviews.crud import reviews_crud
+from app.bookmark.service import bookmark_service
 
 
 KAKAO_SEARCH_URL = settings.KAKAO_SEARCH_URL
+NAVER_IMAGE_SEARCH_URL = settings.NAVER_IMAGE_SEARCH_URL
 NAVER_CLIENT_ID = settings.NAVER_CLIENT_ID
 NAVER_CLIENT_SECRET = settings.NAVER_CLIENT_SECRET
 
+# 검색 결과 캐시: (정규화된 검색어, display) -> 최종 조립된 검색 결과
+search_cache = TTLCache(
+    maxsize=settings.SEARCH_CACHE_MAXSIZE, ttl=settings.SEARCH_CACHE_TTL_SECONDS
+)
+metrics.register("search_cache", search_cache.stats)
+
+# /nearby 타일 캐시: (타일, 반경 버킷) -> (후보 식당 목록, 후보가 빠짐없는 반경)
+nearby_cache = TTLCache(
+    maxsize=settings.NEARBY_CACHE_MAXSIZE, ttl=settings.NEARBY_CACHE_TTL_SECONDS
+)
+nearby_cache_counters = {"invalidations": 0, "fallbacks": 0}
+metrics.register(
+    "nearby_cache", lambda: {**nearby_cache.stats(), **nearby_cache_counters}
+)
+
+# /viewport 타일 캐시: (zoom, x, y) -> 타일별 핀 또는 클러스터 목록
+viewport_cache = TTLCache(
+    maxsize=settings.VIEWPORT_CACHE_MAXSIZE, ttl=settings.VIEWPORT_CACHE_TTL_SECONDS
+)
+metrics.register("viewport_cache", viewport_cache.stats)
+
+# 벡터 타일 캐시: 메모리(TTL + LRU) -> 디스크(선택) -> PostGIS 순으로 조회
+mvt_cache = TTLCache(
+    maxsize=settings.MVT_CACHE_MAXSIZE, ttl=settings.MVT_CACHE_TTL_SECONDS
+)
+metrics.register("mvt_cache", mvt_cache.stats)
+mvt_disk_cache = None
+if settings.MVT_DISK_CACHE_DIR:
+    mvt_disk_cache = DiskTileCache(
+        settings.MVT_DISK_CACHE_DIR,
+        max_files=settings.MVT_DISK_CACHE_MAX_FILES,
+        ttl=settings.MVT_CACHE_TTL_SECONDS,
+    )
+    metrics.register("mvt_disk_cache", mvt_disk_cache.stats)
+
+# /nearby 후보 선택용 메모리 공간 인덱스 (옵션, 적재 전에는 PostGIS로 조회)
+spatial_index = None
+if settings.NEARBY_INDEX_ENABLED:
+    if NUMPY_AVAILABLE:
+        spatial_index = SpatialIndex(cell_deg=settings.NEARBY_INDEX_CELL_DEG)
+        metrics.register("nearby_index", spatial_index.stats)
+    else:
+        logger.warning("numpy가 없어 메모리 공간 인덱스를 끄고 PostGIS로 조회합니다.")
+
+# 네이버 이미지 검색 fan-out: 전역 속도 제한 + 요청당 동시 실행 수 + 호출별 제한 시간
+naver_fanout = FanoutExecutor(
+    rate_limiter=TokenBucket(
+        rate=settings.NAVER_RATE_LIMIT_PER_SECOND,
+        capacity=settings.NAVER_RATE_LIMIT_BURST,
+    ),
+    concurrency=settings.NAVER_FANOUT_CONCURRENCY,
+    timeout=settings.NAVER_FANOUT_TIMEOUT_SECONDS,
+    max_queue_wait=settings.NAVER_FANOUT_MAX_QUEUE_WAIT_SECONDS,
+    hedge_delay=settings.NAVER_FANOUT_HEDGE_DELAY_SECONDS,
+)
+metrics.register("naver_fanout", naver_fanout.stats)
+
+# 동시에 들어온 같은 검색어/같은 장소 조회는 1번만 실행하고 결과를 공유
+search_flight = SingleFlight()
+naver_image_flight = SingleFlight()
+metrics.register("search_singleflight", search_flight.stats)
+metrics.register("naver_image_singleflight", naver_image_flight.stats)
+
+
+def _is_upstream_failure(error: BaseException) -> bool:
+    """
+    서킷 브레이커가 '업스트림 장애'로 칠 예외인지 판단합니다.
+    - 5xx / 429 응답, 네트워크 오류, 시간 초과 -> 장애
+    - 잘못된 요청(4xx)이나 우리 쪽 속도 제한(ThrottledError) -> 장애 아님
+    """
+    if isinstance(error, ThrottledError):
+        return False
+    if isinstance(error, HTTPException):
+        return error.status_code >= 500 or error.status_code == 429
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code >= 500 or status_code == 429
+    return True
+
+
+def _new_breaker(name: str) -> CircuitBreaker:
+    breaker = CircuitBreaker(
+        name,
+        failure_rate_threshold=settings.CIRCUIT_FAILURE_RATE_THRESHOLD,
+        minimum_calls=settings.CIRCUIT_MINIMUM_CALLS,
+        window_seconds=settings.CIRCUIT_WINDOW_SECONDS,
+        open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+        half_open_max_calls=settings.CIRCUIT_HALF_OPEN_MAX_CALLS,
+        is_failure=_is_upstream_failure,
+    )
+    metrics.register(f"{name}_circuit", breaker.stats)
+    return breaker
+
+
+# 업스트림별 서킷 브레이커: 장애 중에는 기다리지 않고 바로 실패(캐시된 결과로 대체)
+kakao_breaker = _new_breaker("kakao")
+naver_breaker = _new_breaker("naver")
+
+
+def _with_session(func, *args):
+    """호출한 스레드가 직접 열고 닫는 세션으로 DB 작업을 실행합니다. (요청 세션과 공유하지 않음)"""
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+
+async def _run_db(func, *args):
+    """동기 DB 작업 func(db, *args)를 스레드에서 실행합니다. (이벤트 루프를 막지 않도록)"""
+    return await asyncio.to_thread(_with_session, func, *args)
+
+
+def _save_naver_image_cache(images: dict[str, str | None]):
+    try:
+        _with_session(crud.upsert_naver_image_cache, images)
+    except Exception as e:
+        logger.warning(f"네이버 이미지 캐시 저장 실패 ({len(images)}건): {e}")
+
 
 # 1. 허용할 카테고리 키워드 정의 (화이트리스트)
 FOOD_KEYWORDS = [
@@ -41,15 +178,14 @@ FOOD_KEYWORDS = [
 
 
 # 1. 단일 식당의 이미지를 네이버에서 비동기로 가져오는 함수
-async def fetch_naver_image_async(
+async def request_naver_image(
     client: httpx.AsyncClient, name: str, address: str
 ) -> str | None:
-    client_id = NAVER_CLIENT_ID
-    client_secret = NAVER_CLIENT_SECRET
-
-    if not client_id or not client_secret:
-        return None
-
+    """
+    네이버 이미지 검색을 1회 호출합니다.
+    - 검색 결과가 없으면 None ("이미지 없음"으로 확정된 결과)
+    - 네트워크 오류나 200이 아닌 응답은 예외를 그대로 올립니다. (캐시에 저장하면 안 되므로)
+    """
     # 🌟 [수정된 부분 시작] 🌟
     # 카카오 지번 주소("서울 강남구 역삼동 123")에서 '역삼동'만 추출
     dong = ""
@@ -62,104 +198,460 @@ async def fetch_naver_image_async(
     query = f"{dong} {name} 맛집".strip()
     # 🌟 [수정된 부분 끝] 🌟
 
-    headers = {"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret}
+    headers = {
+        "X-Naver-Client-Id": NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
+    }
     params = {"query": query, "display": 1, "sort": "sim"}
 
-    try:
-        # 비동기로 네이버에 요청 (await)
-        response = await client.get(
-            "https://openapi.naver.com/v1/search/image", headers=headers, params=params
-        )
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("items"):
-                return data["items"][0]["link"]
-    except Exception as e:
-        print(f"네이버 이미지 검색 실패 ({name}): {e}")
+    # 비동기로 네이버에 요청 (await)
+    response = await client.get(NAVER_IMAGE_SEARCH_URL, headers=headers, params=params)
+    response.raise_for_status()
 
+    data = response.json()
+    if data.get("items"):
+        return data["items"][0]["link"]
     return None
 
 
+def _is_image_cache_fresh(entry, now: datetime) -> bool:
+    """
+    네이버 이미지 캐시 항목이 아직 유효한지 확인합니다.
+    "이미지 없음" 결과는 새 사진이 올라올 수 있으므로 더 짧게 유지합니다.
+    """
+    if entry.refreshed_at is None:
+        return False
+    ttl_days = (
+        settings.NAVER_IMAGE_CACHE_TTL_DAYS
+        if entry.image_url
+        else settings.NAVER_IMAGE_CACHE_MISS_TTL_DAYS
+    )
+    return entry.refreshed_at + timedelta(days=ttl_days) > now
+
+
+async def iter_naver_images(items: list[dict]):
+    """
+    검색 결과 items에 네이버 썸네일(image_url)을 채우면서, 이미지가 정해진 항목부터 하나씩 돌려줍니다.
+    - DB 캐시(naver_image_cache)에 유효한 결과가 있으면 그대로 사용 (즉시 반환)
+    - 처음 보는 장소이거나 만료된 장소만 네이버를 호출하고, 끝나는 순서대로 반환
+    - 새로 조회한 결과는 마지막에 한 번에 캐시에 저장
+    """
+    if not items or not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        return
+
+    # 1. 캐시 일괄 조회 (쿼리 1번, 이벤트 루프를 막지 않도록 스레드에서)
+    now = datetime.now(timezone.utc)
+    entries = await _run_db(
+        crud.get_naver_image_cache_entries, [item["kakao_place_id"] for item in items]
+    )
+
+    targets = []
+    for item in items:
+        entry = entries.get(item["kakao_place_id"])
+        if entry is not None and _is_image_cache_fresh(entry, now):
+            item["image_url"] = entry.image_url
+            yield item
+        else:
+            targets.append(item)
+
+    # 네이버 서킷이 열려 있으면 호출하지 않고 이미지 없이 응답합니다.
+    if not targets or naver_breaker.is_open():
+        return
+
+    # 2. 캐시에 없는 장소만 네이버로 검색 (속도 제한 + 동시 실행 수 제한 + 제한 시간)
+    #    다른 검색 요청이 같은 장소를 이미 조회 중이면 새로 호출하지 않고 그 결과를 기다립니다.
+    client = http_clients.get("naver")
+    slots = naver_fanout.request_slots()
+
+    async def lookup(item):
+        try:
+            result = await naver_image_flight.do(
+                item["kakao_place_id"],
+                functools.partial(
+                    naver_breaker.call,
+                    naver_fanout.submit,
+                    slots,
+                    functools.partial(
+                        request_naver_image, client, item["name"], item["address"]
+                    ),
+                ),
+            )
+        except Exception as e:
+            return item, e
+        return item, result
+
+    tasks = [asyncio.ensure_future(lookup(item)) for item in targets]
+
+    # 3. 끝나는 순서대로 items에 꽂고, 실패(예외/시간 초과)가 아닌 것만 캐시에 저장
+    #    실패한 장소는 image_url=None 그대로 응답합니다.
+    fetched = {}
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            item, result = await next_result
+            if isinstance(result, Exception):
+                print(f"네이버 이미지 검색 실패 ({item['name']}): {result}")
+            else:
+                item["image_url"] = result
+                fetched[item["kakao_place_id"]] = result
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        # 연결이 끊기거나 제너레이터가 정리될 때도 여기를 지나므로,
+        # 저장은 스레드에 맡기고 기다리지 않습니다. (저장 실패는 로그만 남김)
+        if fetched:
+            asyncio.get_running_loop().run_in_executor(
+                None, _save_naver_image_cache, fetched
+            )
+
+
+async def attach_naver_images(items: list[dict]):
+    """검색 결과 items 전체에 네이버 썸네일을 채웁니다. (모두 끝날 때까지 대기)"""
+    async for _ in iter_naver_images(items):
+        pass
+
+
+def normalize_search_query(query: str) -> str:
+    """
+    캐시 키용 검색어 정규화
+    예: "  강남   맛집 " -> "강남 맛집" (유니코드 NFC, 공백 정리, 소문자)
+    """
+    return " ".join(unicodedata.normalize("NFC", query).split()).lower()
+
+
 async def search_restaurants_kakao(query: str, display: int = 5):
     """
-    [카카오 API] 키워드로 음식점(FD6)과 카페(CE7)를 검색합니다.
-    [네이버 API] 검색된 결과의 썸네일 이미지를 비동기로 병렬 수집하여 합칩니다.
+    검색 결과를 캐시에서 먼저 찾고, 없을 때만 카카오/네이버 API를 호출합니다.
+    같은 검색어로 동시에 들어온 요청은 업스트림 호출 1번의 결과를 함께 사용합니다.
+    공유 작업은 어느 요청의 세션도 쓰지 않습니다. (DB 조회는 스레드마다 새 세션으로)
     """
-    KAKAO_SEARCH_URL = "https://dapi.kakao.com/v2/local/search/keyword.json"
-    headers = {"Authorization": f"KakaoAK {settings.KAKAO_REST_API_KEY}"}
+    cache_key = (normalize_search_query(query), display)
 
-    buffer_size = display * 3
-    if buffer_size > 45:
-        buffer_size = 45
+    if settings.SEARCH_CACHE_ENABLED:
+        cached = search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    async def load():
+        result = await _search_restaurants(query, display)
+        # 카카오 장애로 로컬 결과만 담긴 응답은 캐시하지 않습니다. (복구되면 바로 보충되도록)
+        if settings.SEARCH_CACHE_ENABLED and not result.get("partial"):
+            search_cache.set(cache_key, result)
+        return result
+
+    try:
+        return await search_flight.do(cache_key, load)
+    except CircuitOpenError:
+        return {**_get_stale_search_result(cache_key), "stale": True}
+
+
+def _get_stale_search_result(cache_key) -> dict:
+    """
+    카카오 서킷이 열려 있을 때 만료된 캐시 결과라도 찾아 반환합니다.
+    없으면 바로 503으로 응답합니다. (장애 중인 카카오를 기다리지 않음)
+    """
+    stale = search_cache.get_stale(cache_key, settings.SEARCH_CACHE_STALE_TTL_SECONDS)
+    if stale is None:
+        raise HTTPException(
+            status_code=503,
+            detail="카카오 검색이 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요.",
+        )
+    return stale
+
+
+async def prewarm_search_cache():
+    """
+    앱 시작 시 인기 검색어(SEARCH_CACHE_PREWARM_QUERIES)를 미리 검색해 캐시에 채워둡니다.
+    하나가 실패해도 나머지는 계속 진행합니다.
+    """
+    for query in settings.SEARCH_CACHE_PREWARM_QUERIES:
+        try:
+            await search_restaurants_kakao(query)
+        except Exception as e:
+            logger.warning(f"검색 캐시 프리워밍 실패 ({query}): {e}")
+
+
+# 로컬 검색 시 의미 없는 단어 (식당 이름/주소에 없는 일반 표현)
+SEARCH_STOPWORDS = {"맛집", "음식점", "식당", "근처", "주변", "추천"}
+
+
+def search_restaurants_local(db: Session, query: str, display: int) -> list[dict]:
+    """
+    [로컬 DB] 우리 restaurants 테이블에서 이름/주소 유사도로 검색합니다.
+    - "홍대 카페" -> 지역/이름 단어("홍대")는 trigram 검색, 업종 단어("카페")는 카테고리 필터
+    - 결과는 검색 점수 -> 평점 -> 리뷰수 순으로 정렬되고, 저장된 평점이 함께 붙습니다.
+    """
+    words = [
+        word
+        for word in normalize_search_query(query).split()
+        if word not in SEARCH_STOPWORDS
+    ]
+    keywords = [word for word in words if word not in FOOD_KEYWORDS]
+    category_keywords = [word for word in words if word in FOOD_KEYWORDS]
+
+    rows = crud.search_restaurants_local(db, keywords, category_keywords, display)
+
+    items = []
+    for restaurant, score, avg_rating, review_count in rows:
+        items.append(
+            {
+                "kakao_place_id": restaurant.kakao_place_id,
+                "name": restaurant.name,
+                "category": restaurant.category,
+                "phone": restaurant.phone,
+                "place_url": restaurant.place_url,
+                "road_address": restaurant.road_address,
+                "address": restaurant.address,
+                "latitude": restaurant.latitude,
+                "longitude": restaurant.longitude,
+                "image_url": restaurant.image_url,
+                "id": restaurant.id,
+                "rating": round(avg_rating, 1) if avg_rating else 0.0,
+                "review_count": review_count or 0,
+                "source": "local",
+            }
+        )
+    return items
+
+
+async def _search_restaurants(query: str, display: int = 5):
+    """
+    [1~2단계] 로컬 DB + 카카오 검색 결과 목록 (_collect_search_items)
+    [3단계] 이미지가 없는 항목만 네이버 썸네일을 채웁니다. (DB 캐시 우선)
+    카카오 서킷이 열려 로컬 결과만 담긴 경우 "partial": true가 붙습니다.
+    """
+    items, partial = await _collect_search_items(query, display)
+
+    await attach_naver_images([item for item in items if not item["image_url"]])
+
+    # 최종 결과 반환
+    result = {"total": len(items), "items": items}
+    if partial:
+        result["partial"] = True
+    return result
+
+
+async def _collect_search_items(query: str, display: int) -> tuple[list[dict], bool]:
+    """
+    [1단계] 로컬 DB를 먼저 검색하고, 결과가 충분하면 외부 API를 호출하지 않습니다.
+    [2단계] 부족할 때만 카카오 결과로 보충합니다. (이미 로컬에 있는 장소는 중복 제거)
+    반환값: (결과 목록, 카카오 보충 없이 로컬 결과만 담겼는지)
+
+    카카오 서킷이 열려 있어도 로컬 결과가 있으면 그것만 돌려줍니다.
+    로컬 결과도 없을 때만 CircuitOpenError를 그대로 던집니다. (오래된 캐시 / 503)
+    """
+    local_items = []
+    if settings.LOCAL_SEARCH_ENABLED:
+        local_items = await _run_db(search_restaurants_local, query, display)
+
+    if len(local_items) >= min(display, settings.LOCAL_SEARCH_MIN_RESULTS):
+        return local_items, False
+
+    try:
+        kakao_items = await fetch_kakao_places(query, display)
+    except CircuitOpenError:
+        if not local_items:
+            raise
+        return local_items, True
+
+    # 카카오 결과 중 DB에 저장된 식당은 우리 평점/리뷰수를 붙여줍니다.
+    stats = await _run_db(
+        crud.get_restaurant_stats_by_kakao_ids,
+        [item["kakao_place_id"] for item in kakao_items],
+    )
+    for item in kakao_items:
+        if item["kakao_place_id"] in stats:
+            r_id, avg_rating, review_count = stats[item["kakao_place_id"]]
+            item["id"] = r_id
+            item["rating"] = round(avg_rating, 1) if avg_rating else 0.0
+            item["review_count"] = review_count or 0
+
+    local_ids = {item["kakao_place_id"] for item in local_items}
+    items = local_items + [
+        item for item in kakao_items if item["kakao_place_id"] not in local_ids
+    ]
+    return items[:display], False
+
+
+async def stream_search_restaurants(query: str, display: int = 5):
+    """
+    검색 결과를 단계별 이벤트로 흘려보내는 스트리밍 버전
+    - {"type": "items"}: 로컬/카카오 결과 목록 (이미지는 아직 없을 수 있음)
+      카카오 장애로 오래된 캐시를 쓴 경우 "stale": true,
+      로컬 결과만 담긴 경우 "partial": true가 붙습니다.
+    - {"type": "image"}: 항목별 네이버 썸네일이 정해질 때마다 1건씩
+    - {"type": "done"}: 끝
+
+    목록 단계(카카오 호출 포함)는 여기서 먼저 실행하므로, 카카오 오류는
+    스트리밍 시작 전에 일반 HTTP 에러로 응답됩니다. 반환값은 이벤트 async generator입니다.
+    """
+    cache_key = (normalize_search_query(query), display)
+    cached = search_cache.get(cache_key) if settings.SEARCH_CACHE_ENABLED else None
+
+    stale = partial = False
+    if cached is not None:
+        items = cached["items"]
+    else:
+        try:
+            items, partial = await _collect_search_items(query, display)
+        except CircuitOpenError:
+            cached = _get_stale_search_result(cache_key)
+            items = cached["items"]
+            stale = True
+
+    async def events():
+        event = {"type": "items", "total": len(items), "items": items}
+        if stale:
+            event["stale"] = True
+        if partial:
+            event["partial"] = True
+        yield event
+
+        if cached is None:
+            pending = [item for item in items if not item["image_url"]]
+            async for item in iter_naver_images(pending):
+                yield {
+                    "type": "image",
+                    "kakao_place_id": item["kakao_place_id"],
+                    "image_url": item["image_url"],
+                }
+            # 끝까지 받은 결과는 일반 검색에서도 쓸 수 있도록 캐시에 저장 (로컬만 담긴 결과 제외)
+            if settings.SEARCH_CACHE_ENABLED and not partial:
+                search_cache.set(cache_key, {"total": len(items), "items": items})
+
+        yield {"type": "done"}
+
+    return events()
+
+
+# 카카오 키워드 검색 API는 한 페이지에 최대 15개까지만 돌려줍니다.
+KAKAO_PAGE_SIZE = 15
+
+
+async def fetch_kakao_page(query: str, page: int) -> tuple[int, dict]:
+    """
+    [카카오 API] 키워드 검색 결과 1페이지를 가져옵니다.
+    반환값: (페이지 번호, 응답 JSON)
+    """
+    headers = {"Authorization": f"KakaoAK {settings.KAKAO_REST_API_KEY}"}
 
     params = {
         "query": query,
-        "size": buffer_size,
+        "size": KAKAO_PAGE_SIZE,
+        "page": page,
         "sort": "accuracy",
     }
 
-    # --- [1단계: 카카오 API 검색] ---
-    async with httpx.AsyncClient() as client:
-        response = await client.get(KAKAO_SEARCH_URL, headers=headers, params=params)
+    # 앱 전체에서 공유하는 클라이언트를 사용해 커넥션(TCP/TLS)을 재사용합니다.
+    client = http_clients.get("kakao")
+    response = await client.get(KAKAO_SEARCH_URL, headers=headers, params=params)
 
-        if response.status_code != 200:
-            error_detail = "카카오 검색 API 호출 실패"
-            try:
-                error_json = response.json()
-                kakao_msg = error_json.get("message")
-                error_type = error_json.get("errorType")
-                if kakao_msg:
-                    error_detail = f"카카오 API 오류: {kakao_msg} ({error_type})"
-            except Exception:
-                error_detail = f"카카오 API 오류(Raw): {response.text}"
+    if response.status_code != 200:
+        error_detail = "카카오 검색 API 호출 실패"
+        try:
+            error_json = response.json()
+            kakao_msg = error_json.get("message")
+            error_type = error_json.get("errorType")
+            if kakao_msg:
+                error_detail = f"카카오 API 오류: {kakao_msg} ({error_type})"
+        except Exception:
+            error_detail = f"카카오 API 오류(Raw): {response.text}"
 
-            print(f"❌ {error_detail}")
-            raise HTTPException(status_code=response.status_code, detail=error_detail)
+        print(f"❌ {error_detail}")
+        raise HTTPException(status_code=response.status_code, detail=error_detail)
 
-        data = response.json()
-        documents = data.get("documents", [])
+    return page, response.json()
 
-    # --- [2단계: 카카오 결과 파싱 및 필터링] ---
-    filtered_items = []
-    target_groups = ["FD6", "CE7"]
 
-    for doc in documents:
-        if doc.get("category_group_code") in target_groups:
-            item = {
-                "kakao_place_id": doc["id"],
-                "name": doc["place_name"],
-                "category": doc["category_name"],
-                "phone": doc["phone"],
-                "place_url": doc["place_url"],
-                "road_address": doc["road_address_name"],
-                "address": doc["address_name"],
-                "latitude": float(doc["y"]),
-                "longitude": float(doc["x"]),
-                "image_url": None,  # 👈 일단 빈칸으로 만들어 둡니다.
-            }
-            filtered_items.append(item)
+def _parse_kakao_document(doc: dict) -> dict:
+    return {
+        "kakao_place_id": doc["id"],
+        "name": doc["place_name"],
+        "category": doc["category_name"],
+        "phone": doc["phone"],
+        "place_url": doc["place_url"],
+        "road_address": doc["road_address_name"],
+        "address": doc["address_name"],
+        "latitude": float(doc["y"]),
+        "longitude": float(doc["x"]),
+        "image_url": None,  # 👈 일단 빈칸으로 만들어 둡니다.
+        # DB에 저장된 식당이면 아래 값이 채워집니다.
+        "id": None,
+        "rating": 0.0,
+        "review_count": 0,
+        "source": "kakao",
+    }
 
-        if len(filtered_items) >= display:
-            break
 
-    # --- [3단계: 네이버 이미지 비동기 병렬 검색 (핵심!)] ---
-    if filtered_items:
-        async with httpx.AsyncClient() as client:
-            # 1. 해야 할 작업(Task) 리스트 만들기
-            tasks = [
-                fetch_naver_image_async(client, item["name"], item["address"])
-                for item in filtered_items
-            ]
+async def fetch_kakao_places(query: str, display: int = 5) -> list[dict]:
+    """
+    [카카오 API] 키워드로 음식점(FD6)과 카페(CE7)를 검색합니다.
 
-            # 2. 동시에 네이버로 검색
-            images = await asyncio.gather(*tasks)
+    - 필터링으로 버려지는 결과를 감안해 display의 3배만큼 후보를 모읍니다.
+    - 필요한 페이지를 동시에 요청하고, 도착하는 대로 앞 페이지부터 순서대로 필터링합니다.
+    - display개를 채우거나 마지막 페이지(is_end)에 도달하면 남은 요청은 취소합니다.
+    """
+    buffer_size = display * 3
+    pages_needed = min(
+        -(-buffer_size // KAKAO_PAGE_SIZE), settings.KAKAO_SEARCH_MAX_PAGES
+    )
 
-            # 3. 받아온 이미지를 filtered_items에 순서대로 꽂아주기
-            for i, item in enumerate(filtered_items):
-                item["image_url"] = images[i]
+    # --- [1단계: 카카오 API 페이지 병렬 요청] ---
+    # 실패도 (페이지 번호, 예외)로 돌려받아 몇 페이지가 실패했는지 알 수 있게 합니다.
+    async def fetch(page: int):
+        try:
+            _, data = await kakao_breaker.call(fetch_kakao_page, query, page)
+        except (HTTPException, CircuitOpenError, httpx.HTTPError) as e:
+            return page, e
+        return page, data
 
-    # 최종 결과 반환
-    return {"total": len(filtered_items), "items": filtered_items}
+    tasks = [asyncio.ensure_future(fetch(page)) for page in range(1, pages_needed + 1)]
+
+    # --- [2단계: 도착한 페이지부터 파싱 및 필터링 (정확도 순서 유지)] ---
+    filtered_items = []
+    target_groups = ["FD6", "CE7"]
+    arrived: dict[int, dict] = {}
+    failed_page = None  # 실패한 페이지 중 가장 앞 번호
+    next_page = 1
+    done = False
+
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            page, data = await next_result
+            if isinstance(data, Exception):
+                # 첫 페이지 실패는 그대로 에러
+                # 뒤 페이지 실패는 기록만 하고, 그 앞 페이지들이 도착할 때까지 계속 기다림
+                if page == 1:
+                    raise data
+                print(f"⚠️ 카카오 검색 {page}페이지 실패: {data}")
+                failed_page = page if failed_page is None else min(failed_page, page)
+            else:
+                arrived[page] = data
+
+            # 앞 페이지가 모두 도착한 구간까지만 순서대로 처리
+            while next_page in arrived and not done:
+                data = arrived.pop(next_page)
+                for doc in data.get("documents", []):
+                    if doc.get("category_group_code") in target_groups:
+                        filtered_items.append(_parse_kakao_document(doc))
+                    if len(filtered_items) >= display:
+                        done = True
+                        break
+                if data.get("meta", {}).get("is_end"):
+                    done = True
+                next_page += 1
+
+            # 실패한 페이지 바로 앞까지 처리했으면 모은 결과까지만 반환
+            if failed_page is not None and next_page >= failed_page:
+                done = True
+
+            if done:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return filtered_items
 
 
 def create_restaurant(db: Session, item: schemas.RestaurantCreate):
@@ -188,13 +680,17 @@ def create_restaurant(db: Session, item: schemas.RestaurantCreate):
             simple_category = parts[1]
         # "음식점" 처럼 1개만 있을 때는 기본값인 "기타"가 그대로 유지됨
 
+    # 필터/집계용 단계별 카테고리는 카카오 원본 문자열에서 나눕니다.
+    # 예: "음식점 > 한식 > 육류,고기" -> ["한식", "육류,고기"] (없으면 대표 카테고리 1개)
+    categories = crud.split_category(item.category) or [simple_category]
+
     # 3. 좌표 변환 (문자열 -> WGS84 Point)
     # 카카오 API는 이미 WGS84 좌표를 제공하므로 10,000,000으로 나눌 필요가 없습니다!
     # 다만 PostGIS 저장을 위해 WKT 포맷 문자열 생성은 필요합니다.
     point_wkt = f"POINT({item.longitude} {item.latitude})"
 
     # 4. 최종 저장 (CRUD 호출)
-    return crud.create_restaurant(
+    restaurant = crud.create_restaurant(
         db=db,
         kakao_place_id=item.kakao_place_id,
         name=item.name,  # 태그 없는 깔끔한 이름
@@ -207,8 +703,13 @@ def create_restaurant(db: Session, item: schemas.RestaurantCreate):
         lng=item.longitude,  # 계산 없이 그대로 사용
         location_wkt=point_wkt,  # PostGIS용 WKT
         image_url=item.image_url,
+        categories=categories,
     )
 
+    # 5. 이 식당이 보여야 할 주변 맛집 캐시 무효화
+    on_restaurant_changed(restaurant)
+    return restaurant
+
 
 def get_nearby_restaurants(
     db: Session,
@@ -217,26 +718,223 @@ def get_nearby_restaurants(
     radius: int,
     user_id: int = None,
 ):
-    # 1. 주변 식당 조회 (쿼리 1번)
-    rows = crud.get_nearby_restaurants_query(db, lat, lng, radius)
+    # 1. 주변 식당 + 리뷰 미리보기 (유저와 무관한 부분, 가능하면 타일 캐시에서)
+    items = None
+    if settings.NEARBY_CACHE_ENABLED:
+        items = _get_nearby_items_from_tile_cache(db, lat, lng, radius)
+
+    if items is None:
+        # 2. 메모리 인덱스를 안 쓰면 식당 + 리뷰 미리보기를 DB 왕복 1번으로 조회
+        if spatial_index is None or not spatial_index.ready:
+            # 북마크 캐시를 끄면 찜 여부까지 같은 쿼리에서 가져옵니다.
+            if not settings.BOOKMARK_CACHE_ENABLED:
+                rows = crud.get_nearby_restaurants_with_previews(
+                    db, lat, lng, radius, user_id=user_id
+                )
+                return [_nearby_item_from_row(row) for row in rows]
+            rows = crud.get_nearby_restaurants_with_previews(db, lat, lng, radius)
+            items = [_nearby_item_from_row(row) for row in rows]
+        else:
+            rows = _query_nearby_rows(db, lat, lng, radius)
+            items = _build_nearby_items(db, rows)
+
+    if not items:
+        return []
+
+    # 🌟 [추가] 3. 북마크 여부 포함 (True / False)
+    return _with_bookmark_flags(db, items, user_id)
+
+
+def _nearby_item_from_row(row) -> dict:
+    """get_nearby_restaurants_with_previews 결과 한 줄을 응답 형태로 바꿉니다."""
+    return {
+        "id": row.id,
+        "name": row.name,
+        "category": row.category,
+        # [좌표]
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        # [주소 및 상세]
+        "road_address": row.road_address,
+        "address": row.address,
+        "phone": row.phone,
+        "place_url": row.place_url,
+        "image_url": row.image_url,
+        # [통계]
+        "distance": round(row.distance, 1),
+        "rating": round(row.avg_rating, 1) if row.avg_rating else 0.0,
+        "review_count": row.review_count or 0,
+        # [UX 데이터]
+        "images": row.images or [],
+        "review_preview": row.review_preview,
+        "is_bookmarked": row.is_bookmarked,
+    }
+
+
+def _with_bookmark_flags(db: Session, items: list[dict], user_id: int = None):
+    """유저가 찜한 식당인지(is_bookmarked)를 붙입니다. (북마크 캐시가 있으면 쿼리 없음)"""
+    bookmarked_ids = bookmark_service.get_bookmarked_ids(
+        db, user_id, [item["id"] for item in items]
+    )
+    return [{**item, "is_bookmarked": item["id"] in bookmarked_ids} for item in items]
+
+
+def _encode_nearby_cursor(
+    lat: float, lng: float, distance: float, restaurant_id: int, served: int
+) -> str:
+    return encode_cursor(
+        {"lat": lat, "lng": lng, "d": distance, "id": restaurant_id, "n": served}
+    )
+
+
+def _decode_nearby_cursor(
+    cursor: str, lat: float, lng: float
+) -> tuple[float, int, int]:
+    """커서를 (마지막 거리, 마지막 식당 id, 지금까지 내려준 개수)로 풉니다."""
+    payload = decode_cursor(cursor)
+    try:
+        distance = float(payload["d"])
+        restaurant_id = int(payload["id"])
+        served = int(payload["n"])
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    if not math.isfinite(distance) or served < 0:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+    # 다른 위치에서 발급된 커서로 이어 받으면 순서가 맞지 않으므로 거절
+    if payload.get("lat") != lat or payload.get("lng") != lng:
+        raise HTTPException(
+            status_code=400, detail="커서를 발급받은 위치와 요청 위치가 다릅니다."
+        )
+    return distance, restaurant_id, served
+
 
+def get_nearby_restaurants_page(
+    db: Session,
+    lat: float,
+    lng: float,
+    limit: int = 20,
+    cursor: str = None,
+    radius: int = None,
+    max_results: int = None,
+    user_id: int = None,
+) -> dict:
+    """
+    가까운 순(KNN)으로 한 페이지씩 조회합니다.
+    - next_cursor(마지막 식당의 거리 + id)를 그대로 다시 보내면 다음 페이지를 받습니다.
+    - radius 대신 max_results(총 개수 상한)로 범위를 제한할 수 있습니다.
+    """
+    after_distance = after_id = None
+    served = 0
+    if cursor:
+        after_distance, after_id, served = _decode_nearby_cursor(cursor, lat, lng)
+
+    if max_results is not None:
+        limit = min(limit, max_results - served)
+        if limit <= 0:
+            return {"items": [], "next_cursor": None}
+
+    # 다음 페이지가 있는지 알기 위해 1개 더 조회
+    rows = crud.get_nearby_restaurants_knn(
+        db,
+        lat,
+        lng,
+        limit + 1,
+        after_distance=after_distance,
+        after_id=after_id,
+        radius=radius,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    served += len(rows)
+
+    next_cursor = None
+    if has_more and (max_results is None or served < max_results):
+        last_restaurant, last_distance = rows[-1][0], rows[-1][1]
+        next_cursor = _encode_nearby_cursor(
+            lat, lng, last_distance, last_restaurant.id, served
+        )
+
+    items = _build_nearby_items(db, rows)
+    return {
+        "items": _with_bookmark_flags(db, items, user_id),
+        "next_cursor": next_cursor,
+    }
+
+
+def _query_nearby_rows(
+    db: Session, lat: float, lng: float, radius: float, limit: int = 20
+):
+    """
+    반경 내 식당을 가까운 순으로 조회합니다.
+    메모리 공간 인덱스가 준비되어 있으면 후보 선택은 메모리에서 하고, DB는 ID로만 조회합니다.
+    반환값: (Restaurant객체, 거리, 평점, 리뷰수) 튜플의 리스트
+    """
+    if spatial_index is None or not spatial_index.ready:
+        return crud.get_nearby_restaurants_query(db, lat, lng, radius, limit=limit)
+
+    hits = spatial_index.query_radius(lat, lng, radius, limit=limit)
+    restaurants = crud.get_restaurants_by_ids(db, [hit[0] for hit in hits])
+    return [
+        (
+            restaurants[restaurant_id],
+            distance,
+            restaurants[restaurant_id].avg_rating,
+            restaurants[restaurant_id].review_count,
+        )
+        for restaurant_id, distance, _, _ in hits
+        if restaurant_id in restaurants
+    ]
+
+
+def refresh_spatial_index():
+    """
+    메모리 공간 인덱스에 마지막 갱신 이후 등록/수정된 식당을 반영합니다.
+    (처음에는 전체 적재, 동기 DB 조회이므로 스레드에서 실행)
+    """
+    since = spatial_index.watermark
+    if since is not None:
+        since -= timedelta(seconds=settings.NEARBY_INDEX_REFRESH_OVERLAP_SECONDS)
+
+    db = SessionLocal()
+    try:
+        rows = crud.get_restaurant_points_changed_since(db, since)
+    finally:
+        db.close()
+
+    watermark = max((row[5] for row in rows if row[5] is not None), default=None)
+    flushed = spatial_index.upsert((row[:5] for row in rows), watermark=watermark)
+    # 기다리던 새 식당이 이제 인덱스에 들어갔으므로, 그 사이 다시 채워진 주변 캐시를 비웁니다.
+    for lat, lng in flushed:
+        invalidate_nearby_cache(lat, lng)
+
+
+async def run_spatial_index_refresher():
+    """앱 시작 시 인덱스를 적재하고, 이후 주기적으로 변경분만 반영합니다."""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_spatial_index)
+        except Exception as e:
+            logger.warning(f"메모리 공간 인덱스 갱신 실패: {e}")
+        await asyncio.sleep(settings.NEARBY_INDEX_REFRESH_SECONDS)
+
+
+def _build_nearby_items(db: Session, rows) -> list[dict]:
+    """
+    (Restaurant, 거리, 평점, 리뷰수) 목록에 리뷰 사진/미리보기를 붙여 응답 형태로 조립합니다.
+    (북마크 여부는 유저마다 다르므로 여기서는 넣지 않습니다)
+    """
     if not rows:
         return []
 
-    # 2. 식당 ID 추출
+    # 1. 식당 ID 추출
     restaurant_ids = [row[0].id for row in rows]
 
-    # 🌟 [추가] 2-5. 북마크 여부 묶음 조회 (쿼리 1번 추가)
-    bookmarked_ids = set()
-    if user_id:
-        # 이전에 만들어둔 CRUD 함수 재사용!
-        bookmarked_ids = crud.get_bookmarked_restaurant_ids(db, user_id, restaurant_ids)
-
-    # 3. 리뷰 데이터 Bulk 조회 (쿼리 2번 - 이미지 + 텍스트)
+    # 2. 리뷰 데이터 Bulk 조회 (쿼리 1번 - 이미지 + 텍스트)
     # (주의: crud 파일 임포트 경로에 맞게 reviews_crud 사용)
     reviews_data = reviews_crud.get_latest_reviews_for_restaurants(db, restaurant_ids)
 
-    # 4. 데이터 매핑 (Dictionary 구조 잡기)
+    # 3. 데이터 매핑 (Dictionary 구조 잡기)
     extra_data = {rid: {"images": [], "preview": None} for rid in restaurant_ids}
 
     for r_id, r_imgs, r_content in reviews_data:
@@ -256,7 +954,7 @@ def get_nearby_restaurants(
                 text = text[:50] + "..."
             target["preview"] = text
 
-    # 5. 최종 응답 데이터 조립
+    # 4. 최종 응답 데이터 조립
     result_list = []
     for row in rows:
         restaurant, distance, avg_rating, count = row
@@ -283,14 +981,325 @@ def get_nearby_restaurants(
                 # [UX 데이터]
                 "images": extra["images"],
                 "review_preview": extra["preview"],
-                # 🌟 [추가] 북마크 여부 포함 (True / False)
-                "is_bookmarked": restaurant.id in bookmarked_ids,
             }
         )
 
     return result_list
 
 
+def _nearby_radius_bucket(radius: int) -> int | None:
+    for bucket in sorted(settings.NEARBY_CACHE_RADIUS_BUCKETS):
+        if radius <= bucket:
+            return bucket
+    return None
+
+
+def _load_nearby_tile(db: Session, tile: tuple[int, int], bucket: int):
+    """
+    타일 중심에서 (반경 버킷 + 타일 반대각선) 안의 식당을 후보로 조회합니다.
+    -> 타일 안 어느 위치에서 bucket 반경으로 찾아도 후보 안에 모두 들어있습니다.
+    반환값: (후보 목록, 후보가 빠짐없이 포함된 타일 중심 기준 반경)
+    """
+    tile_deg = settings.NEARBY_CACHE_TILE_DEG
+    center_lat, center_lng = geo.tile_center(tile, tile_deg)
+    search_radius = bucket + geo.tile_half_diagonal_m(tile, tile_deg)
+
+    limit = settings.NEARBY_CACHE_MAX_CANDIDATES
+    if spatial_index is None or not spatial_index.ready:
+        rows = crud.get_nearby_restaurants_with_previews(
+            db, center_lat, center_lng, search_radius, limit=limit
+        )
+        candidates = [_nearby_item_from_row(row) for row in rows]
+        distances = [row.distance for row in rows]
+    else:
+        rows = _query_nearby_rows(
+            db, center_lat, center_lng, search_radius, limit=limit
+        )
+        candidates = _build_nearby_items(db, rows)
+        distances = [row[1] for row in rows]
+
+    # 후보가 limit에서 잘렸다면, 가장 먼 후보까지만 빠짐없이 들어있다고 봅니다.
+    complete_radius = search_radius
+    if len(rows) >= limit:
+        complete_radius = distances[-1]
+    return candidates, complete_radius
+
+
+def _get_nearby_items_from_tile_cache(
+    db: Session, lat: float, lng: float, radius: int, limit: int = 20
+) -> list[dict] | None:
+    """
+    같은 타일 + 같은 반경 버킷의 요청은 캐시된 후보를 공유하고,
+    거리만 요청 좌표 기준으로 다시 계산해서 가까운 순으로 잘라 반환합니다.
+    캐시로 정확한 결과를 만들 수 없으면 None (호출한 쪽에서 DB 직접 조회)
+    """
+    bucket = _nearby_radius_bucket(radius)
+    if bucket is None:
+        return None
+
+    tile_deg = settings.NEARBY_CACHE_TILE_DEG
+    tile = geo.tile_of(lat, lng, tile_deg)
+    key = (tile, bucket)
+
+    cached = nearby_cache.get(key)
+    if cached is None:
+        cached = _load_nearby_tile(db, tile, bucket)
+        nearby_cache.set(key, cached)
+    candidates, complete_radius = cached
+
+    # 요청 좌표에서 이 반경 안의 식당은 후보 목록에 빠짐없이 들어있습니다.
+    center_lat, center_lng = geo.tile_center(tile, tile_deg)
+    safe_radius = complete_radius - geo.haversine_m(lat, lng, center_lat, center_lng)
+
+    matched = []
+    for candidate in candidates:
+        distance = geo.haversine_m(
+            lat, lng, candidate["latitude"], candidate["longitude"]
+        )
+        if distance <= radius:
+            matched.append((distance, candidate))
+    matched.sort(key=lambda pair: pair[0])
+    matched = matched[:limit]
+
+    # 후보가 잘려 있어 결과가 부족하거나 안전 반경 밖의 식당이 섞였으면 DB로 직접 조회
+    if safe_radius < radius and (len(matched) < limit or matched[-1][0] > safe_radius):
+        nearby_cache_counters["fallbacks"] += 1
+        return None
+    return [
+        {**candidate, "distance": round(distance, 1)} for distance, candidate in matched
+    ]
+
+
+def invalidate_nearby_cache(lat: float, lng: float):
+    """해당 좌표의 식당이 후보에 들어갈 수 있는 타일 캐시를 모두 지웁니다."""
+    tile_deg = settings.NEARBY_CACHE_TILE_DEG
+    for key in nearby_cache.keys():
+        tile, bucket = key
+        center_lat, center_lng = geo.tile_center(tile, tile_deg)
+        reach = bucket + geo.tile_half_diagonal_m(tile, tile_deg)
+        if geo.haversine_m(lat, lng, center_lat, center_lng) <= reach:
+            nearby_cache.delete(key)
+            nearby_cache_counters["invalidations"] += 1
+
+
+def on_restaurant_changed(restaurant):
+    """
+    식당이 새로 등록되거나 리뷰가 달려 평점/사진이 바뀌었을 때 호출합니다.
+    (이 식당을 담고 있을 수 있는 응답 캐시를 무효화)
+    """
+    invalidate_nearby_cache(restaurant.latitude, restaurant.longitude)
+    invalidate_viewport_cache(restaurant.latitude, restaurant.longitude)
+    invalidate_mvt_cache(restaurant.latitude, restaurant.longitude)
+    # 이 프로세스의 공간 인덱스에도 반영 (요청 중에는 재구성하지 않음)
+    # 평점/리뷰수 변경은 바로, 새 식당은 다음 갱신 주기에 반영됩니다.
+    if spatial_index is not None and spatial_index.ready:
+        spatial_index.update(
+            restaurant.id,
+            restaurant.latitude,
+            restaurant.longitude,
+            restaurant.avg_rating,
+            restaurant.review_count,
+        )
+
+
+def prewarm_nearby_cache():
+    """
+    앱 시작 시 자주 조회되는 좌표(NEARBY_CACHE_PREWARM_POINTS)의 타일 캐시를 채워둡니다.
+    동기 DB 조회이므로 lifespan에서 스레드로 실행합니다.
+    """
+    if not settings.NEARBY_CACHE_ENABLED:
+        return
+    db = SessionLocal()
+    try:
+        for lat, lng in settings.NEARBY_CACHE_PREWARM_POINTS:
+            try:
+                _get_nearby_items_from_tile_cache(
+                    db, lat, lng, settings.NEARBY_CACHE_PREWARM_RADIUS
+                )
+            except Exception as e:
+                logger.warning(f"주변 맛집 캐시 프리워밍 실패 ({lat}, {lng}): {e}")
+    finally:
+        db.close()
+
+
+def _build_viewport_tile(db: Session, zoom: int, x: int, y: int) -> dict:
+    """
+    타일 하나의 지도 표시 데이터를 만듭니다.
+    - 식당이 VIEWPORT_PIN_THRESHOLD개 이하이면 개별 핀
+    - 그보다 많으면 타일을 N x N 칸으로 나눈 클러스터 (개수, 무게중심, 평균 별점)
+    """
+    west, south, east, north = geo.tile_bounds(zoom, x, y)
+    grid = settings.VIEWPORT_CLUSTER_GRID
+    cells = crud.get_restaurant_grid_clusters(db, west, south, east, north, grid)
+    total = sum(cell[2] for cell in cells)
+
+    if total <= settings.VIEWPORT_PIN_THRESHOLD:
+        restaurants = crud.get_restaurants_in_bbox(
+            db, west, south, east, north, limit=settings.VIEWPORT_PIN_THRESHOLD
+        )
+        pins = [
+            {
+                "id": restaurant.id,
+                "name": restaurant.name,
+                "category": restaurant.category,
+                "latitude": restaurant.latitude,
+                "longitude": restaurant.longitude,
+                "rating": round(restaurant.avg_rating or 0.0, 1),
+                "review_count": restaurant.review_count or 0,
+                "image_url": restaurant.image_url,
+            }
+            for restaurant in restaurants
+        ]
+        return {"bounds": (west, south, east, north), "pins": pins, "clusters": []}
+
+    clusters = []
+    for cell_x, cell_y, count, lat, lng, rating_sum, review_count in cells:
+        clusters.append(
+            {
+                "id": f"{zoom}/{x}/{y}/{int(cell_x)}/{int(cell_y)}",
+                "count": count,
+                "latitude": lat,
+                "longitude": lng,
+                # 리뷰 수 가중 평균 별점 (리뷰가 하나도 없으면 0.0)
+                "rating": round(rating_sum / review_count, 1) if review_count else 0.0,
+            }
+        )
+    return {"bounds": (west, south, east, north), "pins": [], "clusters": clusters}
+
+
+def get_restaurants_in_viewport(
+    db: Session,
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    zoom: int,
+) -> dict:
+    """
+    지도 화면(경계 상자) 안의 식당을 핀 또는 클러스터로 반환합니다.
+    화면을 zoom 레벨의 타일로 나누어 타일별로 계산하고 캐시하므로,
+    밀집 지역이어도 응답 크기는 타일 수 x max(핀 기준, N x N)를 넘지 않습니다.
+    """
+    x_min, y_min = geo.lnglat_to_tile(min_lng, max_lat, zoom)
+    x_max, y_max = geo.lnglat_to_tile(max_lng, min_lat, zoom)
+    tile_count = (x_max - x_min + 1) * (y_max - y_min + 1)
+    if tile_count > settings.VIEWPORT_MAX_TILES:
+        raise HTTPException(
+            status_code=400,
+            detail="화면 영역이 줌 레벨에 비해 너무 넓습니다. 줌 레벨을 낮춰주세요.",
+        )
+
+    pins, clusters = [], []
+    for x in range(x_min, x_max + 1):
+        for y in range(y_min, y_max + 1):
+            key = (zoom, x, y)
+            tile = viewport_cache.get(key)
+            if tile is None:
+                tile = _build_viewport_tile(db, zoom, x, y)
+                viewport_cache.set(key, tile)
+
+            # 핀은 화면 밖 것을 빼고, 클러스터는 타일 단위 결과를 그대로 사용
+            pins.extend(
+                pin
+                for pin in tile["pins"]
+                if min_lat <= pin["latitude"] <= max_lat
+                and min_lng <= pin["longitude"] <= max_lng
+            )
+            clusters.extend(tile["clusters"])
+
+    total = len(pins) + sum(cluster["count"] for cluster in clusters)
+    return {"zoom": zoom, "total": total, "pins": pins, "clusters": clusters}
+
+
+def invalidate_viewport_cache(lat: float, lng: float):
+    """해당 좌표를 포함하는 모든 줌 레벨의 타일 캐시를 지웁니다."""
+    for key in viewport_cache.keys():
+        zoom, x, y = key
+        if geo.lnglat_to_tile(lng, lat, zoom) == (x, y):
+            viewport_cache.delete(key)
+
+
+def get_restaurant_tile(db: Session, z: int, x: int, y: int) -> bytes:
+    """식당 핀 벡터 타일(MVT)을 반환합니다. (메모리 -> 디스크 -> DB 순서로 조회)"""
+    key = (z, x, y)
+    tile = mvt_cache.get(key)
+    if tile is not None:
+        return tile
+
+    if mvt_disk_cache is not None:
+        tile = mvt_disk_cache.get(key)
+    if tile is None:
+        tile = crud.get_restaurant_mvt_tile(
+            db,
+            z,
+            x,
+            y,
+            extent=settings.MVT_EXTENT,
+            buffer=settings.MVT_BUFFER,
+            limit=settings.MVT_MAX_FEATURES,
+        )
+        if mvt_disk_cache is not None:
+            mvt_disk_cache.set(key, tile)
+
+    mvt_cache.set(key, tile)
+    return tile
+
+
+def invalidate_mvt_cache(lat: float, lng: float):
+    """
+    해당 좌표가 그려질 수 있는 모든 줌 레벨의 타일을 지웁니다.
+    (타일 경계 여백(buffer)에 걸칠 수 있으므로 주변 8개 타일까지 함께)
+    """
+    for z in range(settings.MVT_MIN_ZOOM, settings.MVT_MAX_ZOOM + 1):
+        center_x, center_y = geo.lnglat_to_tile(lng, lat, z)
+        for x in range(center_x - 1, center_x + 2):
+            for y in range(center_y - 1, center_y + 2):
+                mvt_cache.delete((z, x, y))
+                if mvt_disk_cache is not None:
+                    mvt_disk_cache.delete((z, x, y))
+
+
+def get_restaurant_detail_validators(db: Session, restaurant_id: int):
+    """
+    상세 응답의 (ETag, Last-Modified). 식당이 없으면 (None, None)
+    리뷰가 달리면 리뷰수와 updated_at이 바뀌므로 이미지/맛보기 리뷰 변경도 반영됩니다.
+    """
+    row = crud.get_restaurant_validators(db, restaurant_id)
+    if row is None:
+        return None, None
+    updated_at, created_at, review_count = row
+    etag = conditional.make_etag(
+        "restaurant", restaurant_id, updated_at, created_at, review_count
+    )
+    return etag, updated_at or created_at
+
+
+def get_list_validators(
+    db: Session,
+    kind: str,
+    versions: tuple[str, ...],
+    user_id: int = None,
+    as_of: datetime = None,
+):
+    """
+    목록 응답의 (ETag, Last-Modified)를 데이터 버전 카운터로 만듭니다.
+    로그인 유저는 찜 여부가 섞이므로 찜 목록(본문과 같은 캐시된 집합)도 ETag에 넣고,
+    Last-Modified는 쓰지 않습니다.
+    as_of: 데이터가 그대로여도 시간에 따라 본문이 바뀌는 목록(인기 점수 감쇠)의 기준 시각
+    """
+    data_versions = conditional.get_data_versions(db, versions)
+    parts = [kind] + [data_versions[name][0] for name in versions]
+    updated = [updated_at for _, updated_at in data_versions.values() if updated_at]
+    if as_of:
+        parts.append(int(as_of.timestamp()))
+        updated.append(as_of)
+    last_modified = max(updated, default=None)
+    if user_id:
+        parts += [user_id, bookmark_service.get_bookmark_fingerprint(db, user_id)]
+        last_modified = None
+    return conditional.make_etag(*parts), last_modified
+
+
 def get_restaurant_detail(
     db: Session, restaurant_id: int
 ) -> schemas.RestaurantDetailResponse:
@@ -326,28 +1335,23 @@ def get_restaurants_latest(
     """
     # 1. 최신 등록순으로 식당 조회 (평점, 리뷰수 포함)
     rows = crud.get_restaurants_by_latest(db, skip, limit, category)
+    return _build_latest_items(db, rows, user_id)
+
 
+def _build_latest_items(db: Session, rows, user_id: int = None) -> list[dict]:
+    """(식당, 평점, 리뷰수) 목록에 썸네일과 북마크 여부를 붙여 응답 형태로 만듭니다."""
     if not rows:
         return []
     # 식당 ID 목록 추출
     restaurant_ids = [row[0].id for row in rows]
     # 🌟 1. [북마크 최적화] 이 유저가 찜한 식당 ID만 한 번에 가져오기
-    bookmarked_ids = set()
-    if user_id:
-        bookmarked_ids = crud.get_bookmarked_restaurant_ids(db, user_id, restaurant_ids)
+    bookmarked_ids = bookmark_service.get_bookmarked_ids(db, user_id, restaurant_ids)
 
-    # 2. [이미지 최적화] 사진 없는 식당들 썸네일 가져오기 (이전과 동일)
+    # 2. [이미지 최적화] 사진 없는 식당들만 리뷰 사진에서 썸네일 1장씩 가져오기
     missing_image_ids = [
         r_id for r_id, row in zip(restaurant_ids, rows) if not row[0].image_url
     ]
-    thumbnail_map = {}
-    if missing_image_ids:
-        thumbnail_data = crud.get_latest_images_for_restaurants(
-            db, missing_image_ids, 1
-        )
-        for r_id, images in thumbnail_data:
-            if images and len(images) > 0:
-                thumbnail_map[r_id] = images[0]
+    thumbnail_map = crud.get_thumbnails_for_restaurants(db, missing_image_ids)
 
     # 3. 응답 데이터 조립
     result_list = []
@@ -385,13 +1389,126 @@ def get_restaurants_latest(
     return result_list
 
 
-def get_available_categories(db: Session) -> list[str]:
+def _encode_latest_cursor(created_at, restaurant_id: int) -> str:
+    return encode_cursor({"c": created_at.isoformat(), "id": restaurant_id})
+
+
+def _decode_latest_cursor(cursor: str):
+    payload = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(payload["c"]), int(payload["id"])
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def get_restaurants_latest_page(
+    db: Session,
+    limit: int = 20,
+    cursor: str = None,
+    category: str = None,
+    user_id: int = None,
+) -> dict:
+    """
+    최신 등록순 목록을 커서 방식으로 한 페이지씩 조회합니다. (무한 스크롤용)
+    - next_cursor(마지막 식당의 등록일 + id)를 그대로 다시 보내면 다음 페이지를 받습니다.
+    - 중간에 새 식당이 등록돼도 이미 본 식당이 다시 나오거나 건너뛰지 않습니다.
+    """
+    after_created_at = after_id = None
+    if cursor:
+        after_created_at, after_id = _decode_latest_cursor(cursor)
+
+    # 다음 페이지가 있는지 알기 위해 1개 더 조회
+    rows = crud.get_restaurants_by_latest_after(
+        db,
+        limit + 1,
+        category,
+        after_created_at=after_created_at,
+        after_id=after_id,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last_restaurant = rows[-1][0]
+        next_cursor = _encode_latest_cursor(
+            last_restaurant.created_at, last_restaurant.id
+        )
+
+    return {
+        "items": _build_latest_items(db, rows, user_id),
+        "next_cursor": next_cursor,
+    }
+
+
+def get_available_categories(db: Session) -> dict:
+    """
+    DB에 등록된 식당들의 카테고리 목록과 카테고리별 식당 수를 조회합니다.
+    """
+    rows = crud.get_available_categories(db)
+    return {
+        "categories": [name for name, _ in rows],
+        "counts": {name: count for name, count in rows},
+    }
+
+
+def get_trending_as_of() -> datetime:
+    """
+    인기 점수를 감쇠시킬 기준 시각 (TRENDING_REFRESH_SECONDS 단위로 내림)
+    같은 구간 안에서는 본문이 같으므로 ETag에 넣어도 구간마다 한 번만 바뀝니다.
+    """
+    bucket = max(1.0, settings.TRENDING_REFRESH_SECONDS)
+    now = datetime.now(timezone.utc).timestamp()
+    return datetime.fromtimestamp(now // bucket * bucket, timezone.utc)
+
+
+def get_trending_restaurants(db: Session, limit: int = 10, as_of: datetime = None):
     """
-    DB에 등록된 식당들의 카테고리 목록을 조회합니다.
+    요즘 뜨는 식당 (최근 북마크/리뷰일수록 점수가 큼, 미리 계산된 점수에서 상위 limit개)
     """
-    return crud.get_available_categories(db)
+    rows = crud.get_trending_restaurants(db=db, limit=limit)
+    bookmark_counts = crud.get_bookmark_counts(db, [row[0].id for row in rows])
+
+    # 저장된 점수는 기준 시각 값이므로 as_of 시점으로 감쇠시켜 보여줍니다.
+    half_life_seconds = settings.TRENDING_HALF_LIFE_HOURS * 3600
+    as_of = as_of or get_trending_as_of()
+    elapsed = as_of.timestamp() - crud.TRENDING_EPOCH
+    decay = 2 ** (-elapsed / half_life_seconds)
+
+    trending_list = []
+    for restaurant, score in rows:
+        # SQLAlchemy 모델 객체에 동적으로 속성을 추가해서 넘겨줍니다.
+        restaurant.bookmark_count = bookmark_counts.get(restaurant.id, 0)
+        restaurant.trending_score = round(score * decay, 3)
+        trending_list.append(restaurant)
+    return trending_list
 
 
-def get_trending_restaurants(db: Session, limit: int = 10):
-    # 나중에 여기에 "최근 7일 내의 북마크만 카운트" 같은 복잡한 비즈니스 로직을 추가할 수 있습니다.
-    return crud.get_trending_restaurants(db=db, limit=limit)
+def refresh_trending_scores(full: bool = False) -> int:
+    """
+    새 북마크/리뷰(찜 취소 포함)를 인기 점수에 반영합니다. (동기 DB 작업이므로 스레드에서 실행)
+    full=True면 현재 북마크/리뷰 전체로 다시 계산합니다.
+    """
+    refresh = crud.rebuild_trending_scores if full else crud.refresh_trending_scores
+    db = SessionLocal()
+    try:
+        return refresh(
+            db,
+            half_life_seconds=settings.TRENDING_HALF_LIFE_HOURS * 3600,
+            bookmark_weight=settings.TRENDING_BOOKMARK_WEIGHT,
+            review_weight=settings.TRENDING_REVIEW_WEIGHT,
+        )
+    finally:
+        db.close()
+
+
+async def run_trending_refresher():
+    """앱 시작 시 한 번, 이후 주기적으로 인기 점수를 갱신합니다."""
+    while True:
+        try:
+            updated = await asyncio.to_thread(refresh_trending_scores)
+            if updated:
+                logger.info(f"인기 점수 갱신: {updated}개 식당")
+        except Exception as e:
+            logger.warning(f"인기 점수 갱신 실패: {e}")
+        await asyncio.sleep(settings.TRENDING_REFRESH_SECONDS)
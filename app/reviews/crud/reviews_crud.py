@@ -1,6 +1,7 @@
-from sqlalchemy import desc, func
+from sqlalchemy import Float, and_, cast, desc, func, or_, update
 from sqlalchemy.orm import Session
-from app.models.models import Review
+from app.models.models import Restaurant, Review, ReviewImage, TrendingEvent
+from app.core import conditional
 
 
 def create_review(
@@ -19,7 +20,46 @@ def create_review(
         images=images,
     )
     db.add(db_obj)
+
+    # 사진은 한 장씩 review_images에도 저장 (갤러리/썸네일 조회용)
+    if images:
+        db.flush()  # review id 발급
+        db.add_all(
+            ReviewImage(
+                review_id=db_obj.id,
+                restaurant_id=restaurant_id,
+                url=url,
+                position=position,
+                # 같은 트랜잭션의 now()이므로 리뷰 작성일과 같은 값이 들어갑니다.
+                created_at=func.now(),
+            )
+            for position, url in enumerate(images)
+        )
+
+    # 식당의 리뷰 집계 컬럼을 같은 트랜잭션에서 갱신합니다.
+    # (SET 절의 컬럼은 갱신 전 값이고, UPDATE가 행 잠금을 잡으므로 동시 작성에도 안전)
+    new_sum = Restaurant.rating_sum + rating
+    new_count = Restaurant.review_count + 1
+    db.execute(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .values(
+            rating_sum=new_sum,
+            review_count=new_count,
+            avg_rating=cast(new_sum, Float) / cast(new_count, Float),
+        )
+    )
+    # 인기 점수용 활동 기록 (같은 트랜잭션이라 리뷰가 커밋될 때 함께 보입니다)
+    db.add(
+        TrendingEvent(
+            restaurant_id=restaurant_id,
+            kind=TrendingEvent.REVIEW,
+            occurred_at=func.now(),
+        )
+    )
     db.commit()
+    # 식당 목록(평점/리뷰수/썸네일)이 바뀌었으므로 ETag용 데이터 버전도 올립니다. (커밋 뒤에)
+    conditional.bump_data_version(db, conditional.RESTAURANTS_VERSION)
     db.refresh(db_obj)
     return db_obj
 
@@ -61,14 +101,67 @@ def get_latest_reviews_for_restaurants(
     return results
 
 
+# 식당별 리뷰 최신순 (ix_reviews_restaurant_created_id 인덱스와 같은 순서)
+# 작성일이 같으면 id로 순서를 고정해야 페이지 사이에서 빠지거나 겹치는 리뷰가 없습니다.
+REVIEW_ORDER = (Review.created_at.desc(), Review.id)
+
+
 def get_reviews_by_restaurant(
     db: Session, restaurant_id: int, skip: int = 0, limit: int = 10
 ):
     return (
         db.query(Review)
         .filter(Review.restaurant_id == restaurant_id)
-        .order_by(desc(Review.created_at))
+        .order_by(*REVIEW_ORDER)
         .offset(skip)
         .limit(limit)
         .all()
     )
+
+
+def reviews_after_query(
+    db: Session,
+    restaurant_id: int,
+    limit: int = 10,
+    after_created_at=None,
+    after_id: int = None,
+):
+    """
+    식당 리뷰 최신순 목록에서 (after_created_at, after_id) 다음 리뷰부터 limit개를 고르는 쿼리
+    (쿼리 플랜 확인 스크립트에서도 같은 쿼리를 쓰도록 실행 전 Query로 반환합니다)
+    """
+    query = db.query(Review).filter(Review.restaurant_id == restaurant_id)
+
+    if after_id is not None:
+        if after_created_at is None:
+            # 작성일이 없는 리뷰는 (DESC 정렬에서) 맨 앞에 id 순으로 모여 있습니다.
+            query = query.filter(
+                or_(
+                    and_(Review.created_at.is_(None), Review.id > after_id),
+                    Review.created_at.isnot(None),
+                )
+            )
+        else:
+            # 앞의 조건은 결과를 바꾸지 않지만, 인덱스 범위의 시작점을 잡아줍니다.
+            query = query.filter(
+                Review.created_at <= after_created_at,
+                or_(
+                    Review.created_at < after_created_at,
+                    and_(Review.created_at == after_created_at, Review.id > after_id),
+                ),
+            )
+
+    return query.order_by(*REVIEW_ORDER).limit(limit)
+
+
+def get_reviews_by_restaurant_after(
+    db: Session,
+    restaurant_id: int,
+    limit: int = 10,
+    after_created_at=None,
+    after_id: int = None,
+):
+    """OFFSET 없이 인덱스에서 이어 읽으므로 리뷰가 수천 개여도 뒤 페이지가 느려지지 않습니다."""
+    return reviews_after_query(
+        db, restaurant_id, limit, after_created_at, after_id
+    ).all()
@@ -1,9 +1,9 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi import APIRouter, Depends, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.core.storage import delete_image_from_supabase, upload_image_to_supabase
+from app.core.storage import delete_images_from_supabase, upload_images_to_supabase
 from app.reviews.schemas import reviews_schemas as schemas
 from app.reviews.service import reviews_service as service
 from app.reviews.dependencies import parse_review_form, parse_review_only_form
@@ -41,9 +41,8 @@ async def create_review_and_restaurant(
                 and f.content_type.startswith("image/")
             ]
 
-            for file in valid_files:
-                url = await upload_image_to_supabase(file)
-                uploaded_urls.append(url)
+            # 이미지는 동시에 업로드 (일부 실패 시 업로드된 것은 함수 안에서 롤백)
+            uploaded_urls = await upload_images_to_supabase(valid_files)
 
         # 서비스 호출 (리뷰 유무 상관없이 호출)
         result = await service.create_review_with_restaurant(
@@ -59,8 +58,7 @@ async def create_review_and_restaurant(
     except Exception as e:
         if uploaded_urls:
             print(f"🔥 에러 발생으로 인한 이미지 롤백 시작 ({len(uploaded_urls)}개)")
-            for url in uploaded_urls:
-                await delete_image_from_supabase(url)
+            await delete_images_from_supabase(uploaded_urls)
         raise e
 
 
@@ -89,9 +87,8 @@ async def create_review(
             and f.content_type.startswith("image/")
         ]
 
-        for file in valid_files:
-            url = await upload_image_to_supabase(file)
-            uploaded_urls.append(url)
+        # 이미지는 동시에 업로드 (일부 실패 시 업로드된 것은 함수 안에서 롤백)
+        uploaded_urls = await upload_images_to_supabase(valid_files)
 
         # 리뷰 생성
         return await service.create_review_only(
@@ -107,8 +104,7 @@ async def create_review(
         # 에러 발생 시 업로드된 이미지 삭제
         if uploaded_urls:
             print(f"🔥 에러 발생으로 인한 이미지 롤백 시작 ({len(uploaded_urls)}개)")
-            for url in uploaded_urls:
-                await delete_image_from_supabase(url)
+            await delete_images_from_supabase(uploaded_urls)
         raise e
 
 
@@ -123,3 +119,17 @@ def get_reviews(
     특정 식당의 리뷰를 페이지네이션하여 가져옵니다.
     """
     return service.get_reviews_by_restaurant(db, restaurant_id, skip=skip, limit=limit)
+
+
+@router.get("/page", response_model=schemas.ReviewPageResponse)
+def get_reviews_page(
+    restaurant_id: int,
+    limit: int = Query(10, ge=1, le=50, description="페이지 크기 (최대 50개)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    db: Session = Depends(get_db),
+):
+    """
+    특정 식당의 리뷰를 최신순으로 페이지 단위 조회 (무한 스크롤용)
+    - 첫 요청은 cursor 없이, 이후에는 응답의 next_cursor를 그대로 넘겨주세요.
+    """
+    return service.get_reviews_page(db, restaurant_id, limit=limit, cursor=cursor)
@@ -35,6 +35,12 @@ class ReviewResponse(BaseModel):
         from_attributes = True
 
 
+# [응답] 리뷰 목록 커서 페이지
+class ReviewPageResponse(BaseModel):
+    items: List[ReviewResponse] = []
+    next_cursor: Optional[str] = None  # 없으면 마지막 페이지
+
+
 class RegisterResponse(BaseModel):
     message: str
     restaurant: (
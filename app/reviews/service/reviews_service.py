@@ -1,4 +1,8 @@
+from datetime import datetime
+
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from app.core.cursor import decode_cursor, encode_cursor
 from app.reviews.schemas import reviews_schemas as schemas
 from app.reviews.crud import reviews_crud as crud
 from app.restaurants.service import (
@@ -41,6 +45,8 @@ async def create_review_with_restaurant(
             content=content or "",  # 내용이 없으면 빈 문자열 처리
             images=images,
         )
+        # 평점/사진이 바뀌었으므로 이 식당이 담긴 응답 캐시 무효화
+        restaurant_service.on_restaurant_changed(restaurant)
 
     # -------------------------------------------------------
     # Step 3. 결과 반환 (식당 정보 + 작성된 리뷰 정보)
@@ -58,6 +64,49 @@ def get_reviews_by_restaurant(
     return crud.get_reviews_by_restaurant(db, restaurant_id, skip, limit)
 
 
+def get_reviews_page(
+    db: Session, restaurant_id: int, limit: int = 10, cursor: str = None
+) -> dict:
+    """
+    식당 리뷰를 최신순으로 한 페이지씩 조회합니다. (커서 방식)
+    - next_cursor(마지막 리뷰의 작성일 + id)를 그대로 다시 보내면 다음 페이지를 받습니다.
+    """
+    after_created_at = after_id = None
+    if cursor:
+        payload = decode_cursor(cursor)
+        try:
+            after_created_at = payload["c"]
+            if after_created_at is not None:
+                after_created_at = datetime.fromisoformat(after_created_at)
+            after_id = int(payload["id"])
+        except (ValueError, TypeError, KeyError):
+            raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+        # 다른 식당에서 발급된 커서로 이어 받으면 순서가 맞지 않으므로 거절
+        if payload.get("r") != restaurant_id:
+            raise HTTPException(
+                status_code=400, detail="다른 식당의 리뷰 목록에서 발급된 커서입니다."
+            )
+
+    # 다음 페이지가 있는지 알기 위해 1개 더 조회
+    reviews = crud.get_reviews_by_restaurant_after(
+        db, restaurant_id, limit + 1, after_created_at, after_id
+    )
+    has_more = len(reviews) > limit
+    reviews = reviews[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = reviews[-1]
+        next_cursor = encode_cursor(
+            {
+                "r": restaurant_id,
+                "c": last.created_at.isoformat() if last.created_at else None,
+                "id": last.id,
+            }
+        )
+    return {"items": reviews, "next_cursor": next_cursor}
+
+
 async def create_review_only(
     db: Session,
     user_id: int,
@@ -69,7 +118,7 @@ async def create_review_only(
     """
     기존 식당에 리뷰만 작성
     """
-    return crud.create_review(
+    review = crud.create_review(
         db=db,
         user_id=user_id,
         restaurant_id=restaurant_id,
@@ -77,3 +126,7 @@ async def create_review_only(
         content=content,
         images=images,
     )
+    # 평점/사진이 바뀌었으므로 이 식당이 담긴 응답 캐시 무효화
+    if review.restaurant is not None:
+        restaurant_service.on_restaurant_changed(review.restaurant)
+    return review
@@ -0,0 +1,202 @@
+"""
+카카오 키워드 검색 / 네이버 이미지 검색 API를 흉내 내는 로컬 스텁 서버
+
+실제 API 쿼터를 쓰지 않고 검색 파이프라인을 부하 테스트할 때 사용합니다.
+지연 시간 분포(로그정규), 에러 비율, 초당 호출 제한(429)을 옵션으로 조절할 수 있습니다.
+
+실행 예시:
+    python -m benchmarks.fake_upstreams --port 9000 \\
+        --kakao-latency-ms 80 --naver-latency-ms 150 --naver-error-rate 0.02
+
+API 서버는 아래 환경변수로 스텁을 바라보게 합니다:
+    KAKAO_SEARCH_URL=http://127.0.0.1:9000/v2/local/search/keyword.json
+    NAVER_IMAGE_SEARCH_URL=http://127.0.0.1:9000/v1/search/image
+
+호출 수 확인/초기화: GET /__stats, POST /__reset
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from dataclasses import dataclass, field
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+# 검색어 하나당 만들어낼 가짜 장소 수 (카카오는 최대 45페이지 x 15개)
+PLACES_PER_QUERY = 60
+CATEGORY_GROUPS = ["FD6", "FD6", "CE7", "AT4", "FD6", "CS2"]
+
+
+@dataclass
+class UpstreamProfile:
+    latency_ms: float  # 지연 시간 중앙값
+    latency_sigma: float  # 로그정규 분포 sigma (클수록 꼬리가 길어짐)
+    error_rate: float  # 500 에러 비율
+    rate_limit: float  # 초당 허용 호출 수 (0이면 제한 없음)
+    calls: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    _tokens: float = 0.0
+    _updated_at: float = field(default_factory=time.monotonic)
+
+    async def simulate(self) -> int | None:
+        """지연을 흉내 내고, 에러로 응답해야 하면 상태 코드를 반환합니다."""
+        self.calls += 1
+
+        if self.rate_limit > 0:
+            now = time.monotonic()
+            self._tokens = min(
+                self.rate_limit,
+                self._tokens + (now - self._updated_at) * self.rate_limit,
+            )
+            self._updated_at = now
+            if self._tokens < 1:
+                self.rate_limited += 1
+                return 429
+            self._tokens -= 1
+
+        await asyncio.sleep(
+            random.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000
+        )
+
+        if random.random() < self.error_rate:
+            self.errors += 1
+            return 500
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+        }
+
+    def reset(self):
+        self.calls = self.errors = self.rate_limited = 0
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+
+
+def _fake_place(query: str, index: int) -> dict:
+    rnd = random.Random(_seed(f"{query}:{index}"))
+    place_id = str(10_000_000 + _seed(f"{query}:{index}") % 90_000_000)
+    return {
+        "id": place_id,
+        "place_name": f"{query} 가게 {index + 1}",
+        "category_name": "음식점 > 한식 > 육류,고기",
+        "category_group_code": CATEGORY_GROUPS[index % len(CATEGORY_GROUPS)],
+        "phone": "02-000-0000",
+        "place_url": f"http://place.map.kakao.com/{place_id}",
+        "road_address_name": f"서울 강남구 테헤란로 {index + 1}",
+        "address_name": f"서울 강남구 역삼동 {100 + index}",
+        "x": str(127.02 + rnd.uniform(-0.02, 0.02)),
+        "y": str(37.50 + rnd.uniform(-0.02, 0.02)),
+    }
+
+
+def create_app(kakao: UpstreamProfile, naver: UpstreamProfile, naver_miss_rate: float):
+    app = FastAPI(title="fake kakao/naver upstreams")
+
+    @app.get("/v2/local/search/keyword.json")
+    async def kakao_keyword_search(
+        query: str, size: int = 15, page: int = 1, sort: str = "accuracy"
+    ):
+        status = await kakao.simulate()
+        if status == 429:
+            return JSONResponse(
+                {
+                    "errorType": "RateLimitExceeded",
+                    "message": "API limit has been exceeded.",
+                },
+                status_code=429,
+            )
+        if status:
+            return JSONResponse(
+                {"errorType": "InternalError", "message": "fake error"},
+                status_code=status,
+            )
+
+        size = max(1, min(size, 15))
+        start = (page - 1) * size
+        end = min(start + size, PLACES_PER_QUERY)
+        documents = [_fake_place(query, i) for i in range(start, end)]
+        return {
+            "documents": documents,
+            "meta": {
+                "total_count": PLACES_PER_QUERY,
+                "pageable_count": PLACES_PER_QUERY,
+                "is_end": end >= PLACES_PER_QUERY,
+            },
+        }
+
+    @app.get("/v1/search/image")
+    async def naver_image_search(query: str, display: int = 1, sort: str = "sim"):
+        status = await naver.simulate()
+        if status == 429:
+            return JSONResponse(
+                {"errorMessage": "Rate limit exceeded.", "errorCode": "012"},
+                status_code=429,
+            )
+        if status:
+            return JSONResponse(
+                {"errorMessage": "fake error", "errorCode": "SE99"},
+                status_code=status,
+            )
+
+        if random.Random(_seed(query)).random() < naver_miss_rate:
+            return {"total": 0, "items": []}
+        return {
+            "total": 1,
+            "items": [{"link": f"https://img.example.com/{_seed(query)}.jpg"}],
+        }
+
+    @app.get("/__stats")
+    async def get_stats():
+        return {"kakao": kakao.stats(), "naver": naver.stats()}
+
+    @app.post("/__reset")
+    async def reset_stats():
+        kakao.reset()
+        naver.reset()
+        return {"status": "ok"}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    for name, latency in (("kakao", 80.0), ("naver", 120.0)):
+        parser.add_argument(f"--{name}-latency-ms", type=float, default=latency)
+        parser.add_argument(f"--{name}-latency-sigma", type=float, default=0.5)
+        parser.add_argument(f"--{name}-error-rate", type=float, default=0.0)
+        parser.add_argument(f"--{name}-rate-limit", type=float, default=0.0)
+    parser.add_argument(
+        "--naver-miss-rate",
+        type=float,
+        default=0.2,
+        help="이미지 검색 결과가 없는 비율",
+    )
+    args = parser.parse_args()
+
+    def profile(name: str) -> UpstreamProfile:
+        return UpstreamProfile(
+            latency_ms=getattr(args, f"{name}_latency_ms"),
+            latency_sigma=getattr(args, f"{name}_latency_sigma"),
+            error_rate=getattr(args, f"{name}_error_rate"),
+            rate_limit=getattr(args, f"{name}_rate_limit"),
+        )
+
+    app = create_app(profile("kakao"), profile("naver"), args.naver_miss_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
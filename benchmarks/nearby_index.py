@@ -0,0 +1,135 @@
+"""
+/nearby 후보 선택: 메모리 공간 인덱스(NumPy) vs PostGIS 비교 벤치마크
+
+- 기본: 서울 근처 가짜 좌표 N개로 인덱스 적재 시간과 조회 지연(p50/p95/p99)을 잽니다.
+- --knn K: 반경 조회 대신 가장 가까운 K개 조회(query_knn)를 잽니다.
+- --db: 설정된 DB의 실제 식당으로 인덱스를 만들고, 같은 좌표로 PostGIS 조회와
+  지연 시간 및 결과(가까운 순 ID 목록) 일치 여부를 비교합니다.
+  (--knn이면 인덱스가 찾은 K번째 거리를 반경으로 PostGIS에서 K개를 조회해 비교)
+
+실행 예시:
+    python -m benchmarks.nearby_index --points 50000 --queries 2000 --radius 1000
+    python -m benchmarks.nearby_index --db --queries 500
+    python -m benchmarks.nearby_index --knn 20 --db
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from app.core.spatial_index import SpatialIndex
+
+# 서울 대략적인 범위 (위도, 경도)
+SEOUL_BOUNDS = ((37.45, 37.65), (126.85, 127.15))
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summary(name: str, latencies_ms: list[float]):
+    print(
+        f"{name:<10}: p50={percentile(latencies_ms, 50):.3f}ms "
+        f"p95={percentile(latencies_ms, 95):.3f}ms "
+        f"p99={percentile(latencies_ms, 99):.3f}ms "
+        f"mean={statistics.mean(latencies_ms):.3f}ms"
+    )
+
+
+def random_point(rnd: random.Random) -> tuple[float, float]:
+    (lat_min, lat_max), (lng_min, lng_max) = SEOUL_BOUNDS
+    return rnd.uniform(lat_min, lat_max), rnd.uniform(lng_min, lng_max)
+
+
+def synthetic_rows(count: int, rnd: random.Random):
+    # 번화가에 몰려 있는 분포를 흉내 내기 위해 절반은 몇 개 중심 근처에 모읍니다.
+    hotspots = [random_point(rnd) for _ in range(20)]
+    rows = []
+    for restaurant_id in range(1, count + 1):
+        if restaurant_id % 2:
+            lat, lng = random_point(rnd)
+        else:
+            center_lat, center_lng = rnd.choice(hotspots)
+            lat = rnd.gauss(center_lat, 0.004)
+            lng = rnd.gauss(center_lng, 0.005)
+        rows.append((restaurant_id, lat, lng, rnd.uniform(0, 5), rnd.randint(0, 50)))
+    return rows
+
+
+def run(args):
+    rnd = random.Random(args.seed)
+
+    db = None
+    if args.db:
+        from app.core.database import SessionLocal
+        from app.restaurants.crud import restaurants_crud
+
+        db = SessionLocal()
+        rows = [
+            row[:5] for row in restaurants_crud.get_restaurant_points_changed_since(db)
+        ]
+    else:
+        rows = synthetic_rows(args.points, rnd)
+
+    index = SpatialIndex(cell_deg=args.cell_deg)
+    started = time.perf_counter()
+    index.upsert(rows)
+    print(f"적재      : {len(index)}개, {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    points = [random_point(rnd) for _ in range(args.queries)]
+
+    index_ms = []
+    index_results = []
+    radii = []  # PostGIS 비교에 쓸 반경 (knn이면 K번째 거리)
+    for lat, lng in points:
+        started = time.perf_counter()
+        if args.knn:
+            hits = index.query_knn(lat, lng, args.knn)
+        else:
+            hits = index.query_radius(lat, lng, args.radius, limit=args.limit)
+        index_ms.append((time.perf_counter() - started) * 1000)
+        index_results.append([hit[0] for hit in hits])
+        # 구/회전타원체 거리 차이를 감안해 1m 여유를 둡니다.
+        radii.append(hits[-1][1] + 1 if args.knn and hits else args.radius)
+    summary("index knn" if args.knn else "index", index_ms)
+
+    if db is None:
+        return
+
+    postgis_ms = []
+    mismatches = 0
+    try:
+        limit = args.knn or args.limit
+        for (lat, lng), expected, radius in zip(points, index_results, radii):
+            started = time.perf_counter()
+            result = restaurants_crud.get_nearby_restaurants_query(
+                db, lat, lng, radius, limit=limit
+            )
+            postgis_ms.append((time.perf_counter() - started) * 1000)
+            # 구(haversine)와 회전타원체(PostGIS) 거리 차이로 경계/동률 순서는 다를 수 있음
+            if set(row[0].id for row in result) != set(expected):
+                mismatches += 1
+    finally:
+        db.close()
+    summary("postgis", postgis_ms)
+    print(f"결과 불일치: {mismatches}/{len(points)}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--radius", type=float, default=1000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--knn", type=int, default=0, help="가장 가까운 K개 조회")
+    parser.add_argument("--cell-deg", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", action="store_true", help="실제 DB 데이터로 비교")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
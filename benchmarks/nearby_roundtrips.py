@@ -0,0 +1,117 @@
+"""
+/nearby 조회: 기존 3번 왕복(주변 식당 + 북마크 + 리뷰) vs LATERAL 1번 왕복 비교 벤치마크
+
+설정된 DB(.env의 DB_*)에 직접 붙어서 같은 좌표로 두 방식을 번갈아 실행하고
+지연 시간(p50/p95/p99)과 결과 일치 여부를 출력합니다.
+원격 DB(Supabase 등)일수록 왕복 1번당 수 ms가 들어 차이가 커집니다.
+
+실행 예시:
+    python -m benchmarks.nearby_roundtrips --lat 37.4979 --lng 127.0276 \\
+        --radius 1000 --iterations 200 --user-id 1
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from app.bookmark.crud import bookmark_crud
+from app.core.database import SessionLocal
+from app.restaurants.crud import restaurants_crud
+from app.restaurants.service import restaurants_service
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summary(name: str, latencies_ms: list[float]):
+    print(
+        f"{name:<12}: p50={percentile(latencies_ms, 50):.2f}ms "
+        f"p95={percentile(latencies_ms, 95):.2f}ms "
+        f"p99={percentile(latencies_ms, 99):.2f}ms "
+        f"mean={statistics.mean(latencies_ms):.2f}ms"
+    )
+
+
+def legacy_nearby(db, lat, lng, radius, user_id):
+    """변경 전 흐름: 주변 식당 -> 리뷰 묶음 조회 -> 북마크 묶음 조회 (왕복 3번)"""
+    rows = restaurants_crud.get_nearby_restaurants_query(db, lat, lng, radius)
+    items = restaurants_service._build_nearby_items(db, rows)
+    bookmarked_ids = bookmark_crud.get_bookmarked_restaurant_ids(
+        db, user_id, [item["id"] for item in items]
+    )
+    return [{**item, "is_bookmarked": item["id"] in bookmarked_ids} for item in items]
+
+
+def combined_nearby(db, lat, lng, radius, user_id):
+    """LATERAL 조회: 같은 결과를 왕복 1번으로"""
+    rows = restaurants_crud.get_nearby_restaurants_with_previews(
+        db, lat, lng, radius, user_id=user_id
+    )
+    return [restaurants_service._nearby_item_from_row(row) for row in rows]
+
+
+def comparable(items: list[dict]):
+    return [
+        (
+            item["id"],
+            item["images"],
+            item["review_preview"],
+            item["is_bookmarked"],
+            item["review_count"],
+        )
+        for item in items
+    ]
+
+
+def run(args):
+    rnd = random.Random(args.seed)
+    db = SessionLocal()
+    legacy_ms, combined_ms = [], []
+    mismatches = 0
+    try:
+        # 커넥션 풀 예열 (첫 연결의 TLS 핸드셰이크는 측정에서 제외)
+        combined_nearby(db, args.lat, args.lng, args.radius, args.user_id)
+
+        for i in range(args.iterations):
+            lat = args.lat + rnd.uniform(-args.jitter, args.jitter)
+            lng = args.lng + rnd.uniform(-args.jitter, args.jitter)
+
+            # 순서에 따른 캐시 효과를 줄이기 위해 번갈아 먼저 실행
+            runners = [("legacy", legacy_nearby), ("combined", combined_nearby)]
+            if i % 2:
+                runners.reverse()
+            results = {}
+            for name, runner in runners:
+                started = time.perf_counter()
+                results[name] = runner(db, lat, lng, args.radius, args.user_id)
+                elapsed = (time.perf_counter() - started) * 1000
+                (legacy_ms if name == "legacy" else combined_ms).append(elapsed)
+
+            if comparable(results["legacy"]) != comparable(results["combined"]):
+                mismatches += 1
+    finally:
+        db.close()
+
+    summary("legacy (3)", legacy_ms)
+    summary("combined (1)", combined_ms)
+    print(f"결과 불일치: {mismatches}/{args.iterations}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lat", type=float, default=37.4979)
+    parser.add_argument("--lng", type=float, default=127.0276)
+    parser.add_argument("--radius", type=int, default=1000)
+    parser.add_argument("--jitter", type=float, default=0.005, help="좌표 흔들기(도)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
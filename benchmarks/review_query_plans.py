@@ -0,0 +1,131 @@
+"""
+GET /reviews 쿼리 플랜 확인: 식당별 리뷰 목록이 ix_reviews_restaurant_created_id 인덱스를 쓰는지 검사
+
+설정된 DB(.env의 DB_*)에 붙어서 아래 쿼리의 EXPLAIN 결과를 출력하고,
+인덱스를 쓰지 않거나 정렬(Sort) 단계가 남아 있으면 종료 코드 1로 끝납니다.
+  - offset: 기존 skip/limit 방식 (첫 페이지)
+  - first : 커서 방식 첫 페이지
+  - cursor: 커서 방식 다음 페이지 (리뷰 목록 중간 지점부터)
+
+리뷰가 적은 개발 DB에서는 플래너가 순차 스캔을 고를 수 있습니다.
+그때는 --no-seqscan으로 순차 스캔을 꺼서 인덱스를 "쓸 수 있는지"만 확인하세요.
+
+실행 예시:
+    python -m benchmarks.review_query_plans
+    python -m benchmarks.review_query_plans --restaurant-id 42 --analyze --no-seqscan
+"""
+
+import argparse
+import json
+import sys
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import SessionLocal
+from app.models.models import Review
+from app.reviews.crud import reviews_crud
+
+INDEX_NAME = "ix_reviews_restaurant_created_id"
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(db, query, analyze: bool) -> dict:
+    compiled = query.statement.compile(dialect=postgresql.dialect())
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    sql = f"EXPLAIN ({options}) {compiled}"
+    result = db.connection().exec_driver_sql(sql, compiled.params).scalar()
+    # psycopg2는 json 결과를 이미 파싱해서 돌려줍니다.
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]
+
+
+def check(name: str, plan: dict) -> bool:
+    nodes = list(plan_nodes(plan["Plan"]))
+    uses_index = any(node.get("Index Name") == INDEX_NAME for node in nodes)
+    has_sort = any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes)
+
+    summary = " -> ".join(
+        node["Node Type"]
+        + (f" ({node['Index Name']})" if node.get("Index Name") else "")
+        for node in nodes
+    )
+    timing = ""
+    if "Execution Time" in plan:
+        timing = f", {plan['Execution Time']:.2f}ms"
+    ok = uses_index and not has_sort
+    print(f"[{'OK' if ok else 'FAIL'}] {name:<6}: {summary}{timing}")
+    return ok
+
+
+def run(args) -> bool:
+    db = SessionLocal()
+    try:
+        if args.no_seqscan:
+            db.connection().exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+        restaurant_id = args.restaurant_id
+        if restaurant_id is None:
+            # 리뷰가 가장 많은 식당 (실제로 느린 경우)
+            restaurant_id = (
+                db.query(Review.restaurant_id)
+                .filter(Review.restaurant_id.isnot(None))
+                .group_by(Review.restaurant_id)
+                .order_by(func.count(Review.id).desc())
+                .limit(1)
+                .scalar()
+            )
+            if restaurant_id is None:
+                print("리뷰가 없습니다.")
+                return False
+
+        # 목록 중간 지점의 리뷰를 커서 위치로 사용
+        middle = reviews_crud.reviews_after_query(db, restaurant_id, limit=1)
+        middle = middle.offset(args.limit * 10).first() or middle.first()
+        if middle is None:
+            print(f"restaurant_id={restaurant_id} 식당에 리뷰가 없습니다.")
+            return False
+        print(f"restaurant_id={restaurant_id}, limit={args.limit}")
+
+        queries = {
+            "offset": db.query(Review)
+            .filter(Review.restaurant_id == restaurant_id)
+            .order_by(*reviews_crud.REVIEW_ORDER)
+            .limit(args.limit),
+            "first": reviews_crud.reviews_after_query(db, restaurant_id, args.limit),
+            "cursor": reviews_crud.reviews_after_query(
+                db, restaurant_id, args.limit, middle.created_at, middle.id
+            ),
+        }
+        results = [
+            check(name, explain(db, query, args.analyze))
+            for name, query in queries.items()
+        ]
+        return all(results)
+    finally:
+        db.rollback()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--restaurant-id", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE 실행")
+    parser.add_argument(
+        "--no-seqscan",
+        action="store_true",
+        help="순차 스캔을 끄고 인덱스 사용 가능 여부만 확인",
+    )
+    ok = run(parser.parse_args())
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
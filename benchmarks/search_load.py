@@ -0,0 +1,145 @@
+"""
+/api/v1/restaurants/search 부하 테스트 도구
+
+목표 RPS로 요청을 일정 간격으로 보내고(open-loop), 응답 지연 p50/p95/p99와
+업스트림(카카오/네이버) 호출 수를 출력합니다. 캐시·fan-out 변경 효과를 오프라인에서 비교할 때 사용합니다.
+
+실행 순서:
+    1) python -m benchmarks.fake_upstreams --port 9000
+    2) KAKAO_SEARCH_URL=http://127.0.0.1:9000/v2/local/search/keyword.json \\
+       NAVER_IMAGE_SEARCH_URL=http://127.0.0.1:9000/v1/search/image \\
+       uvicorn app.main:app --port 8000
+    3) python -m benchmarks.search_load --rps 50 --duration 30 \\
+       --fake-upstream-url http://127.0.0.1:9000
+
+검색어는 인기 검색어가 자주 반복되도록 Zipf 분포로 고릅니다. (--zipf-s 0이면 균등 분포)
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+DEFAULT_QUERIES = [
+    "강남 맛집",
+    "홍대 카페",
+    "성수 베이커리",
+    "을지로 술집",
+    "여의도 한식",
+    "판교 일식",
+    "잠실 양식",
+    "신촌 분식",
+    "이태원 피자",
+    "건대 치킨",
+    "종로 중식",
+    "합정 디저트",
+]
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def pick_queries(queries: list[str], count: int, zipf_s: float) -> list[str]:
+    weights = [1 / (rank**zipf_s) for rank in range(1, len(queries) + 1)]
+    return random.choices(queries, weights=weights, k=count)
+
+
+async def run(args):
+    queries = DEFAULT_QUERIES
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    total = int(args.rps * args.duration)
+    plan = pick_queries(queries, total, args.zipf_s)
+    interval = 1 / args.rps
+
+    latencies: list[float] = []
+    statuses: dict[int | str, int] = {}
+
+    limits = httpx.Limits(max_connections=args.max_connections)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        if args.fake_upstream_url:
+            await client.post(f"{args.fake_upstream_url}/__reset")
+
+        async def one(query: str):
+            started = time.perf_counter()
+            try:
+                response = await client.get(
+                    "/api/v1/restaurants/search",
+                    params={"query": query, "display": args.display},
+                )
+                key = response.status_code
+            except httpx.HTTPError as e:
+                key = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[key] = statuses.get(key, 0) + 1
+
+        # 응답을 기다리지 않고 정해진 간격마다 요청을 보냅니다. (실제 트래픽처럼 몰릴 수 있게)
+        tasks = []
+        started_at = time.perf_counter()
+        for i, query in enumerate(plan):
+            delay = started_at + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(query)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started_at
+
+        upstream = None
+        if args.fake_upstream_url:
+            upstream = (await client.get(f"{args.fake_upstream_url}/__stats")).json()
+        app_metrics = None
+        try:
+            app_metrics = (await client.get("/metrics")).json()
+        except httpx.HTTPError:
+            pass
+
+    print(
+        f"요청 수        : {total} ({total / elapsed:.1f} req/s 달성, 목표 {args.rps})"
+    )
+    print(f"상태 코드      : {statuses}")
+    print(
+        "지연(ms)       : "
+        f"p50={percentile(latencies, 50):.1f} "
+        f"p95={percentile(latencies, 95):.1f} "
+        f"p99={percentile(latencies, 99):.1f} "
+        f"max={max(latencies):.1f} mean={statistics.mean(latencies):.1f}"
+    )
+    if upstream:
+        for name, stats in upstream.items():
+            print(
+                f"{name:<15}: 호출 {stats['calls']}회 "
+                f"(요청당 {stats['calls'] / total:.2f}회, "
+                f"에러 {stats['errors']}, 429 {stats['rate_limited']})"
+            )
+    if app_metrics and "search_cache" in app_metrics:
+        print(f"search_cache   : {app_metrics['search_cache']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=20)
+    parser.add_argument("--duration", type=float, default=30, help="초")
+    parser.add_argument("--display", type=int, default=5)
+    parser.add_argument("--zipf-s", type=float, default=1.1)
+    parser.add_argument("--queries-file", help="한 줄에 검색어 하나")
+    parser.add_argument("--fake-upstream-url", help="예: http://127.0.0.1:9000")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--max-connections", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""make restaurant created_at not null
+
+Revision ID: 019e10ef1950
+Revises: 59c96c695f16
+Create Date: 2026-10-17 22:41:07.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '019e10ef1950'
+down_revision: Union[str, Sequence[str], None] = '59c96c695f16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 등록일이 없는 식당은 지금까지처럼 최신순 목록의 맨 뒤에 오도록 가장 이른 시각으로 채웁니다.
+    op.execute("UPDATE restaurants SET created_at = to_timestamp(0) WHERE created_at IS NULL")
+    op.alter_column('restaurants', 'created_at',
+               existing_type=sa.DateTime(timezone=True),
+               nullable=False,
+               existing_server_default=sa.text('now()'))
+    # NULL이 없으므로 (created_at, id) 행 비교를 인덱스 범위 조건으로 쓸 수 있는 순서로 다시 만듭니다.
+    op.drop_index('ix_restaurants_created_at_id', table_name='restaurants')
+    op.create_index('ix_restaurants_created_at_id', 'restaurants', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_restaurants_created_at_id', table_name='restaurants')
+    op.create_index('ix_restaurants_created_at_id', 'restaurants', [sa.text('created_at DESC NULLS LAST'), sa.text('id DESC')], unique=False)
+    op.alter_column('restaurants', 'created_at',
+               existing_type=sa.DateTime(timezone=True),
+               nullable=True,
+               existing_server_default=sa.text('now()'))
@@ -0,0 +1,64 @@
+"""add restaurant categories
+
+Revision ID: 5255e35c6c20
+Revises: ad5f65047aae
+Create Date: 2026-10-17 19:32:08.614205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5255e35c6c20'
+down_revision: Union[str, Sequence[str], None] = 'ad5f65047aae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('restaurants', sa.Column('categories', postgresql.ARRAY(sa.String(length=100)), server_default='{}', nullable=False))
+    op.create_index('ix_restaurants_categories', 'restaurants', ['categories'], unique=False, postgresql_using='gin')
+    op.create_table('category_counts',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('restaurant_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # 기존 category 문자열을 단계별로 나눠 채우기 (backfill, restaurants_crud.split_category와 같은 규칙)
+    op.execute(
+        """
+        UPDATE restaurants AS r
+        SET categories = ARRAY(
+            SELECT p.part
+            FROM (
+                SELECT btrim(t.part) AS part, MIN(t.ord) AS ord
+                FROM unnest(string_to_array(r.category, '>')) WITH ORDINALITY AS t(part, ord)
+                WHERE btrim(t.part) NOT IN ('', '음식점', '식당')
+                GROUP BY btrim(t.part)
+            ) AS p
+            ORDER BY p.ord
+        )
+        WHERE r.category IS NOT NULL
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO category_counts (name, restaurant_count)
+        SELECT c.name, COUNT(*)
+        FROM restaurants AS r, unnest(r.categories) AS c(name)
+        GROUP BY c.name
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('category_counts')
+    op.drop_index('ix_restaurants_categories', table_name='restaurants', postgresql_using='gin')
+    op.drop_column('restaurants', 'categories')
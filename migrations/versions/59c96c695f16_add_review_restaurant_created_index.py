@@ -0,0 +1,28 @@
+"""add review restaurant created index
+
+Revision ID: 59c96c695f16
+Revises: d2a0a5cc7ba5
+Create Date: 2026-10-17 21:38:14.502963
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '59c96c695f16'
+down_revision: Union[str, Sequence[str], None] = 'd2a0a5cc7ba5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_reviews_restaurant_created_id', 'reviews', ['restaurant_id', sa.text('created_at DESC'), 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reviews_restaurant_created_id', table_name='reviews')
@@ -0,0 +1,49 @@
+"""add trending events
+
+Revision ID: 6d522b8591c8
+Revises: 019e10ef1950
+Create Date: 2026-10-17 22:58:43.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d522b8591c8'
+down_revision: Union[str, Sequence[str], None] = '019e10ef1950'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('trending_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('sign', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.drop_table('trending_state')
+    # id 기준으로 쌓던 점수에는 늦게 커밋돼 빠진 활동과 찜 취소가 반영되지 않았으므로 비웁니다.
+    # 점수가 비어 있으면 다음 갱신이 현재 북마크/리뷰 전체로 다시 계산합니다.
+    op.execute('DELETE FROM restaurant_trending_scores')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('trending_state',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('last_bookmark_id', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_review_id', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.drop_table('trending_events')
+    # 기록이 없으므로 다음 갱신이 전체 북마크/리뷰로 점수를 다시 쌓도록 비웁니다.
+    op.execute('DELETE FROM restaurant_trending_scores')
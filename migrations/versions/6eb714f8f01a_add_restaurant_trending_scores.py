@@ -0,0 +1,46 @@
+"""add restaurant trending scores
+
+Revision ID: 6eb714f8f01a
+Revises: 5255e35c6c20
+Create Date: 2026-10-17 20:03:27.390514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6eb714f8f01a'
+down_revision: Union[str, Sequence[str], None] = '5255e35c6c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('restaurant_trending_scores',
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('restaurant_id')
+    )
+    op.create_index('ix_restaurant_trending_scores_score', 'restaurant_trending_scores', [sa.text('score DESC')], unique=False)
+    op.create_table('trending_state',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('last_bookmark_id', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_review_id', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # 점수는 비워둡니다. 첫 갱신(앱 시작 또는 `python -m app.cli refresh-trending`)이
+    # 기록이 없으므로 전체 북마크/리뷰를 읽어 채웁니다.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('trending_state')
+    op.drop_index('ix_restaurant_trending_scores_score', table_name='restaurant_trending_scores')
+    op.drop_table('restaurant_trending_scores')
@@ -0,0 +1,28 @@
+"""add restaurant created_at id index
+
+Revision ID: ad5f65047aae
+Revises: c0886ff78775
+Create Date: 2026-10-17 19:05:41.228730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ad5f65047aae'
+down_revision: Union[str, Sequence[str], None] = 'c0886ff78775'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_restaurants_created_at_id', 'restaurants', [sa.text('created_at DESC NULLS LAST'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_restaurants_created_at_id', table_name='restaurants')
@@ -0,0 +1,51 @@
+"""add restaurant rating aggregates
+
+Revision ID: c0886ff78775
+Revises: fab69350b7c1
+Create Date: 2026-10-17 18:40:12.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0886ff78775'
+down_revision: Union[str, Sequence[str], None] = 'fab69350b7c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('restaurants', sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('restaurants', sa.Column('review_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('restaurants', sa.Column('avg_rating', sa.Float(), server_default='0', nullable=False))
+
+    # 기존 리뷰로 집계 컬럼 채우기 (backfill)
+    op.execute(
+        """
+        UPDATE restaurants AS r
+        SET rating_sum = s.rating_sum,
+            review_count = s.review_count,
+            avg_rating = s.avg_rating
+        FROM (
+            SELECT restaurant_id,
+                   COALESCE(SUM(rating), 0) AS rating_sum,
+                   COUNT(id) AS review_count,
+                   COALESCE(AVG(rating), 0) AS avg_rating
+            FROM reviews
+            GROUP BY restaurant_id
+        ) AS s
+        WHERE r.id = s.restaurant_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('restaurants', 'avg_rating')
+    op.drop_column('restaurants', 'review_count')
+    op.drop_column('restaurants', 'rating_sum')
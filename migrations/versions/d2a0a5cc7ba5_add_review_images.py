@@ -0,0 +1,59 @@
+"""add review images
+
+Revision ID: d2a0a5cc7ba5
+Revises: 37f005d30aeb
+Create Date: 2026-10-17 21:12:36.940187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a0a5cc7ba5'
+down_revision: Union[str, Sequence[str], None] = '37f005d30aeb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('review_images',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('review_id', sa.Integer(), nullable=False),
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.Text(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('width', sa.Integer(), nullable=True),
+    sa.Column('height', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_review_images_review_id'), 'review_images', ['review_id'], unique=False)
+
+    # 기존 리뷰의 images(JSON 배열)를 한 장씩 펼쳐서 채우기 (backfill)
+    op.execute(
+        """
+        INSERT INTO review_images (review_id, restaurant_id, url, position, created_at)
+        SELECT r.id, r.restaurant_id, e.url, e.ord - 1, r.created_at
+        FROM reviews AS r
+        CROSS JOIN LATERAL json_array_elements_text(
+            CASE WHEN json_typeof(r.images) = 'array' THEN r.images ELSE '[]'::json END
+        ) WITH ORDINALITY AS e(url, ord)
+        WHERE r.restaurant_id IS NOT NULL AND e.url <> ''
+        ORDER BY r.id, e.ord
+        """
+    )
+    # 인덱스는 채운 뒤에 만들어야 빠릅니다.
+    op.create_index('ix_review_images_restaurant_created', 'review_images', ['restaurant_id', sa.text('created_at DESC'), sa.text('review_id DESC'), 'position'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_review_images_restaurant_created', table_name='review_images')
+    op.drop_index(op.f('ix_review_images_review_id'), table_name='review_images')
+    op.drop_table('review_images')
@@ -0,0 +1,34 @@
+"""add restaurant trigram indexes
+
+Revision ID: fab69350b7c1
+Revises: b2a7ce0155a3
+Create Date: 2026-10-17 18:21:40.918220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fab69350b7c1'
+down_revision: Union[str, Sequence[str], None] = 'b2a7ce0155a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 로컬 검색용 trigram 인덱스 (pg_trgm 확장 필요)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_restaurants_name_trgm', 'restaurants', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_restaurants_address_trgm', 'restaurants', ['address'], unique=False, postgresql_using='gin', postgresql_ops={'address': 'gin_trgm_ops'})
+    op.create_index('ix_restaurants_road_address_trgm', 'restaurants', ['road_address'], unique=False, postgresql_using='gin', postgresql_ops={'road_address': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_restaurants_road_address_trgm', table_name='restaurants', postgresql_using='gin')
+    op.drop_index('ix_restaurants_address_trgm', table_name='restaurants', postgresql_using='gin')
+    op.drop_index('ix_restaurants_name_trgm', table_name='restaurants', postgresql_using='gin')